@@ -0,0 +1,287 @@
+"""
+Local mock of the GitHub Actions API for workflow-polling benchmarks
+Implements the endpoints the dashboard uses (dispatch, list runs, get run,
+list jobs) with ETag/304 support and runs whose jobs and steps progress over
+time. A decoy run of another workflow starts right after each dispatch, which
+is what the old "latest run in the repo" polling latched onto.
+
+Compares the legacy poller (fixed interval, new connection per call,
+per_page=1 over all runs) with github_actions.ActionsClient: requests,
+304s, connections, bytes, detection latency and whether the right run was
+tracked.
+
+Usage:
+    python -m benchmarks.actions_mock_server                     # benchmark both pollers
+    python -m benchmarks.actions_mock_server --run-seconds 20 --legacy-interval 10
+    python -m benchmarks.actions_mock_server --serve --port 8766 # serve for manual runs
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from github_actions import DOWNLOAD_WORKFLOW, GITHUB_REPO, ActionsClient
+
+STEP_NAMES = [
+    'Set up job', 'Checkout repository', 'Set up Python', 'Install dependencies',
+    'Install Playwright browsers', 'Create data directory', 'Download RMS2 data files',
+    'Verify downloaded files', 'Configure Git', 'Commit and push data files',
+    'Generate Client Growth Report', 'Upload Client Growth Report', 'Complete job',
+]
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class MockActions:
+    """In-memory runs whose status is derived from the clock"""
+
+    def __init__(self, run_seconds=8.0, queue_seconds=1.0, create_delay=1.0, decoy=True):
+        self.run_seconds = run_seconds
+        self.queue_seconds = queue_seconds
+        self.create_delay = create_delay
+        self.decoy = decoy
+        self.runs = []
+        self.next_id = 1000
+        self.lock = threading.Lock()
+        self.traffic = {}  # token -> {'requests', 'not_modified', 'bytes', 'connections'}
+
+    def dispatch(self, workflow, inputs):
+        now = time.time()
+        with self.lock:
+            run = self._add_run(workflow, 'workflow_dispatch', now + self.create_delay, self.run_seconds,
+                                f"Download RMS2 Data {inputs.get('request_id', '')}".strip(), 'success')
+            if self.decoy:
+                # Unrelated, short CI run created just after ours - newest in the repo
+                self._add_run('ci.yml', 'push', now + self.create_delay + 0.5, 2.0, 'CI', 'failure')
+        return run
+
+    def _add_run(self, workflow, event, created, duration, title, conclusion):
+        self.next_id += 1
+        run = {
+            'id': self.next_id, 'workflow': workflow, 'event': event, 'display_title': title,
+            'created': created, 'started': created + self.queue_seconds,
+            'completed': created + self.queue_seconds + duration, 'conclusion': conclusion,
+        }
+        self.runs.append(run)
+        return run
+
+    def run_json(self, run, now):
+        status = ('queued' if now < run['started'] else
+                  'in_progress' if now < run['completed'] else 'completed')
+        return {
+            'id': run['id'], 'name': run['display_title'], 'display_title': run['display_title'],
+            'event': run['event'], 'path': f".github/workflows/{run['workflow']}",
+            'status': status, 'conclusion': run['conclusion'] if status == 'completed' else None,
+            'created_at': _iso(run['created']),
+            'html_url': f"https://github.com/{GITHUB_REPO}/actions/runs/{run['id']}",
+        }
+
+    def jobs_json(self, run, now):
+        steps = []
+        step_seconds = (run['completed'] - run['started']) / len(STEP_NAMES)
+        for number, name in enumerate(STEP_NAMES, start=1):
+            step_start = run['started'] + (number - 1) * step_seconds
+            step_end = step_start + step_seconds
+            status = 'queued' if now < step_start else 'in_progress' if now < step_end else 'completed'
+            steps.append({'name': name, 'number': number, 'status': status,
+                          'conclusion': 'success' if status == 'completed' else None})
+        run_status = self.run_json(run, now)
+        return {'total_count': 1, 'jobs': [{
+            'id': run['id'] * 10, 'name': 'download-data', 'status': run_status['status'],
+            'conclusion': run_status['conclusion'], 'steps': steps,
+        }]}
+
+    def visible_runs(self, now, workflow=None, event=None):
+        runs = [run for run in self.runs if run['created'] <= now]
+        if workflow:
+            runs = [run for run in runs if run['workflow'] == workflow]
+        if event:
+            runs = [run for run in runs if run['event'] == event]
+        return sorted(runs, key=lambda run: run['created'], reverse=True)
+
+    def find(self, run_id):
+        return next((run for run in self.runs if run['id'] == run_id), None)
+
+    def record(self, token, new_connection, size, not_modified):
+        with self.lock:
+            traffic = self.traffic.setdefault(token, {'requests': 0, 'not_modified': 0, 'bytes': 0, 'connections': 0})
+            traffic['requests'] += 1
+            traffic['not_modified'] += not_modified
+            traffic['bytes'] += size
+            traffic['connections'] += new_connection
+
+
+def make_handler(mock):
+    prefix = f"/repos/{GITHUB_REPO}/actions"
+
+    class ActionsHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, so pooled clients reuse connections
+
+        def setup(self):
+            super().setup()
+            self.counted_connection = False
+
+        def log_message(self, format, *args):
+            pass
+
+        def _token(self):
+            return self.headers.get('Authorization', '').replace('Bearer ', '') or 'anonymous'
+
+        def _send(self, status, body=None):
+            payload = json.dumps(body).encode() if body is not None else b''
+            etag = f'"{hashlib.md5(payload).hexdigest()}"' if body is not None else None
+            not_modified = etag is not None and self.headers.get('If-None-Match') == etag
+            if not_modified:
+                status, payload = 304, b''
+            self.send_response(status)
+            if etag:
+                self.send_header('ETag', etag)
+            if payload:
+                self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            mock.record(self._token(), not self.counted_connection, len(payload), not_modified)
+            self.counted_connection = True
+
+        def do_POST(self):
+            match = re.fullmatch(rf"{prefix}/workflows/([^/]+)/dispatches", urlparse(self.path).path)
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not match:
+                self._send(404, {'message': 'Not Found'})
+                return
+            mock.dispatch(match.group(1), body.get('inputs', {}))
+            self._send(204)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            per_page = int(query.get('per_page', 30))
+            now = time.time()
+
+            if url.path == f"{prefix}/runs":
+                runs = mock.visible_runs(now)[:per_page]
+                self._send(200, {'total_count': len(runs), 'workflow_runs': [mock.run_json(r, now) for r in runs]})
+                return
+            match = re.fullmatch(rf"{prefix}/workflows/([^/]+)/runs", url.path)
+            if match:
+                runs = mock.visible_runs(now, match.group(1), query.get('event'))[:per_page]
+                self._send(200, {'total_count': len(runs), 'workflow_runs': [mock.run_json(r, now) for r in runs]})
+                return
+            match = re.fullmatch(rf"{prefix}/runs/(\d+)(/jobs)?", url.path)
+            run = mock.find(int(match.group(1))) if match else None
+            if run is None:
+                self._send(404, {'message': 'Not Found'})
+            elif match.group(2):
+                self._send(200, mock.jobs_json(run, now))
+            else:
+                self._send(200, mock.run_json(run, now))
+
+    return ActionsHandler
+
+
+def start_server(mock, port=0):
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(mock))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def legacy_poll(api_url, token, interval, max_wait):
+    """The dashboard's previous flow: dispatch, then per_page=1 over all repo runs"""
+    import requests
+
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "Authorization": f"Bearer {token}",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    requests.post(f"{api_url}/repos/{GITHUB_REPO}/actions/workflows/{DOWNLOAD_WORKFLOW}/dispatches",
+                  headers=headers, json={"ref": "main"})
+    waited = 0
+    while waited < max_wait:
+        response = requests.get(f"{api_url}/repos/{GITHUB_REPO}/actions/runs",
+                                headers=headers, params={"per_page": 1})
+        runs = response.json().get("workflow_runs", [])
+        if runs and runs[0].get("status") == "completed":
+            return runs[0], time.time()
+        time.sleep(interval)
+        waited += interval
+    return None, time.time()
+
+
+def pooled_poll(api_url, token, min_interval, max_interval):
+    client = ActionsClient(token, api_url=api_url)
+    correlation_id, dispatched_at = client.dispatch()
+    run = client.find_run(correlation_id, dispatched_at, interval=min_interval)
+    for run, jobs, changed in client.poll_run(run['id'], min_interval=min_interval, max_interval=max_interval):
+        pass
+    return run, time.time()
+
+
+def benchmark(args):
+    results = {}
+    for name, poll in (
+        ('legacy', lambda url: legacy_poll(url, 'legacy', args.legacy_interval, args.max_wait)),
+        ('pooled', lambda url: pooled_poll(url, 'pooled', args.min_interval, args.max_interval)),
+    ):
+        mock = MockActions(run_seconds=args.run_seconds, decoy=not args.no_decoy)
+        server, url = start_server(mock)
+        try:
+            started = time.time()
+            run, detected = poll(url)
+        finally:
+            server.shutdown()
+        ours = next(r for r in mock.runs if r['workflow'] == DOWNLOAD_WORKFLOW)
+        traffic = mock.traffic.get(name, {})
+        results[name] = {
+            'tracked_correct_run': bool(run) and run['id'] == ours['id'],
+            'reported': f"{run['status']}/{run['conclusion']}" if run else 'timeout',
+            'detect_lag_s': round(detected - ours['completed'], 2),
+            'wall_s': round(detected - started, 2),
+            **traffic,
+        }
+
+    columns = ['tracked_correct_run', 'reported', 'detect_lag_s', 'wall_s',
+               'requests', 'not_modified', 'connections', 'bytes']
+    print(f"{'':>8} " + ' '.join(f"{c:>20}" for c in columns))
+    for name, row in results.items():
+        print(f"{name:>8} " + ' '.join(f"{str(row.get(c, '-')):>20}" for c in columns))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock GitHub Actions API and polling benchmark")
+    parser.add_argument('--serve', action='store_true', help="Only run the mock server")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--run-seconds', type=float, default=8.0, help="Duration of the mocked download run")
+    parser.add_argument('--legacy-interval', type=float, default=10.0)
+    parser.add_argument('--max-wait', type=float, default=180.0)
+    parser.add_argument('--min-interval', type=float, default=1.0)
+    parser.add_argument('--max-interval', type=float, default=10.0)
+    parser.add_argument('--no-decoy', action='store_true', help="Do not start an unrelated run after dispatch")
+    args = parser.parse_args()
+
+    if args.serve:
+        server, url = start_server(MockActions(run_seconds=args.run_seconds, decoy=not args.no_decoy), args.port)
+        print(f"Mock Actions API at {url} - set GITHUB_API_URL={url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    benchmark(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Dashboard first-paint and rerun latency budget
+Runs streamlit_app.py headless with Streamlit's AppTest: each cold start is
+a fresh interpreter (import Streamlit, execute the script once, as a new
+server process does for its first session), then reruns are timed in the
+same process the way widget clicks rerun the script. Also lists the heavy
+modules the first paint pulled in, since those are the usual regressions.
+Exits 1 when a median exceeds its budget.
+
+Usage:
+    python -m benchmarks.bench_app_startup
+    python -m benchmarks.bench_app_startup --cold-runs 5 --reruns 20 --cold-budget 1.5 --rerun-budget 0.1
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the first paint should not need (imported on first report / email / download)
+HEAVY_MODULES = [
+    'pandas', 'pyarrow', 'openpyxl', 'xlsxwriter', 'requests', 'smtplib', 'playwright',
+    'process_report', 'rcb_loader', 'metrics_store', 'sqlite3', 'altair',
+]
+
+PROBE = r"""
+import json, sys, time
+started = float(sys.argv[1])
+from streamlit.testing.v1 import AppTest
+
+app = AppTest.from_file('streamlit_app.py', default_timeout=60)
+app.secrets['REPORT_RECIPIENTS'] = ''
+if sys.argv[2] == 'dashboard':
+    app.session_state['authenticated'] = True
+app.run()
+first_paint = time.time() - started
+assert not app.exception, app.exception
+heavy = [name for name in json.loads(sys.argv[3]) if name in sys.modules]
+
+reruns = []
+for _ in range(int(sys.argv[4])):
+    start = time.perf_counter()
+    app.run()
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({'first_paint': first_paint, 'reruns': reruns, 'heavy_modules': heavy}))
+"""
+
+
+def measure(page, reruns):
+    """One cold start in a fresh interpreter; returns the probe's measurements"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, repr(time.time()), page, json.dumps(HEAVY_MODULES), str(reruns)],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"App probe failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard cold start and rerun latency")
+    parser.add_argument('--cold-runs', type=int, default=3, help="Fresh interpreters per page")
+    parser.add_argument('--reruns', type=int, default=10, help="Reruns timed after each cold start")
+    parser.add_argument('--cold-budget', type=float, default=1.5, help="Median first paint budget (s)")
+    parser.add_argument('--rerun-budget', type=float, default=0.15, help="Median rerun budget (s)")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'page':<10} {'first paint (s)':>16} {'rerun p50 (s)':>14} {'rerun p95 (s)':>14}  heavy modules at first paint")
+    for page in ('login', 'dashboard'):
+        runs = [measure(page, args.reruns) for _ in range(args.cold_runs)]
+        first_paint = statistics.median(run['first_paint'] for run in runs)
+        reruns = sorted(seconds for run in runs for seconds in run['reruns'])
+        rerun_p50 = statistics.median(reruns) if reruns else 0.0
+        rerun_p95 = reruns[int(len(reruns) * 0.95) - 1] if reruns else 0.0
+        heavy = sorted({name for run in runs for name in run['heavy_modules']})
+        print(f"{page:<10} {first_paint:>16.3f} {rerun_p50:>14.3f} {rerun_p95:>14.3f}  {', '.join(heavy) or '-'}")
+
+        if first_paint > args.cold_budget:
+            over_budget.append(f"{page} first paint {first_paint:.3f}s > {args.cold_budget:.3f}s")
+        if rerun_p50 > args.rerun_budget:
+            over_budget.append(f"{page} rerun {rerun_p50:.3f}s > {args.rerun_budget:.3f}s")
+
+    if over_budget:
+        print("\nOVER BUDGET:")
+        for line in over_budget:
+            print(f"  - {line}")
+        return 1
+    print(f"\nWithin budget (first paint {args.cold_budget:.2f}s, rerun {args.rerun_budget:.2f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
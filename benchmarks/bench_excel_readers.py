@@ -0,0 +1,31 @@
+"""
+Benchmark the RCB Excel reader engines on this host
+
+Usage:
+    python -m benchmarks.bench_excel_readers data/RCB_24months.xlsx data/RCB_12months.xlsx
+"""
+
+import argparse
+
+from rcb_loader import available_engines, benchmark_readers, select_engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each installed Excel reader engine")
+    parser.add_argument('files', nargs='+', help="RCB workbooks to read")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Installed engines: {', '.join(available_engines())} (auto selects: {select_engine('auto')})")
+    for path in args.files:
+        print(f"\n{path}")
+        print(f"  {'engine':<16} {'seconds':>9} {'rows':>9}")
+        for entry in benchmark_readers(path, repeat=args.repeat):
+            if 'error' in entry:
+                print(f"  {entry['engine']:<16} failed: {entry['error']}")
+            else:
+                print(f"  {entry['engine']:<16} {entry['seconds']:>9.3f} {entry['rows']:>9,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for the growth computation core
+Compares the vectorized compute_growth_metrics against the legacy row-wise
+apply implementation on synthetic RCB data at 10k / 100k / 1M clients
+
+Usage:
+    python -m benchmarks.bench_growth_compute
+    python -m benchmarks.bench_growth_compute --sizes 10000 100000 --legacy-max 100000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_rcb import generate_rcb_frames
+from process_report import compute_growth_metrics
+
+
+def legacy_growth_metrics(df_24m, df_12m, inr_to_usd=84):
+    """
+    Row-wise apply implementation kept only as the benchmark baseline
+    """
+    prev = df_24m[['CorporateID', 'CorporateName', 'UserName', 'TotalNR1']].copy()
+    prev.columns = ['CorporateID', 'CorporateName_prev', 'UserName_prev', '24_Month_Revenue']
+    curr = df_12m[['CorporateID', 'CorporateName', 'UserName', 'TotalNR1', 'URL']].copy()
+    curr.columns = ['CorporateID', 'CorporateName_curr', 'UserName_curr', '12_Month_Revenue', 'URL_curr']
+
+    merged = pd.merge(prev, curr, on='CorporateID', how='outer')
+    merged['24_Month_Revenue'] = merged['24_Month_Revenue'].fillna(0)
+    merged['12_Month_Revenue'] = merged['12_Month_Revenue'].fillna(0)
+    merged['Previous_12M_USD'] = (merged['24_Month_Revenue'] - merged['12_Month_Revenue']) / inr_to_usd
+    merged['Current_12M_USD'] = merged['12_Month_Revenue'] / inr_to_usd
+
+    exceptions = merged[(merged['Previous_12M_USD'] < 0) | (merged['Current_12M_USD'] < 0)].copy()
+    merged_clean = merged[(merged['Previous_12M_USD'] >= 0) & (merged['Current_12M_USD'] >= 0)].copy()
+
+    merged_clean['Growth_USD'] = merged_clean['Current_12M_USD'] - merged_clean['Previous_12M_USD']
+    merged_clean['Growth_%'] = merged_clean.apply(
+        lambda row: (row['Growth_USD'] / row['Previous_12M_USD'] * 100)
+        if row['Previous_12M_USD'] != 0 else 0,
+        axis=1
+    )
+    merged_clean['UserName'] = merged_clean['UserName_curr'].fillna(merged_clean['UserName_prev'])
+    for col in ['Previous_12M_USD', 'Current_12M_USD', 'Growth_USD']:
+        merged_clean[col] = merged_clean[col].round(0).astype(int)
+    merged_clean['URL_curr'] = merged_clean.apply(
+        lambda row: row['URL_curr'] if pd.notna(row['URL_curr']) and str(row['URL_curr']).strip() != ''
+        else f"https://rms2.koenig-solutions.com/corporate/{row['CorporateID']}" if pd.notna(row['CorporateID']) and str(row['CorporateID']).strip() != ''
+        else '',
+        axis=1
+    )
+    return merged_clean, exceptions
+
+
+def _time_call(func, *args, repeat=3):
+    """Return the best wall time (seconds) and the last result of func(*args)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the growth computation core")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help="Largest size at which the slow row-wise baseline is also timed")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'clients':>10} {'vectorized (s)':>15} {'legacy (s)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        df_24m, df_12m = generate_rcb_frames(size)
+        fast_time, (fast_clean, fast_exc) = _time_call(compute_growth_metrics, df_24m, df_12m, repeat=args.repeat)
+
+        if size <= args.legacy_max:
+            slow_time, (slow_clean, slow_exc) = _time_call(legacy_growth_metrics, df_24m, df_12m, repeat=1)
+            columns = ['CorporateID', 'Previous_12M_USD', 'Current_12M_USD', 'Growth_USD', 'Growth_%', 'UserName', 'URL_curr']
+            pd.testing.assert_frame_equal(fast_clean[columns], slow_clean[columns])
+            assert len(fast_exc) == len(slow_exc)
+            print(f"{size:>10,} {fast_time:>15.3f} {slow_time:>12.3f} {slow_time / fast_time:>8.1f}x")
+        else:
+            print(f"{size:>10,} {fast_time:>15.3f} {'-':>12} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
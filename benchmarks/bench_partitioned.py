@@ -0,0 +1,106 @@
+"""
+In-memory vs partitioned (out-of-core) report engine
+Writes synthetic RCB exports as Parquet, then computes the report in a fresh
+process per engine and records wall time and peak RSS. The partitioned run
+streams the Parquet files in row batches; the in-memory run loads both
+frames first, as the dashboard does. Also checks that both engines produce
+the same sheets.
+
+Usage:
+    python -m benchmarks.bench_partitioned
+    python -m benchmarks.bench_partitioned --sizes 100000 1000000 --memory-mb 128 --workers 2
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic_rcb import generate_rcb_frames
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INPUT_COLUMNS = ['CorporateID', 'CorporateName', 'UserName', 'TotalNR1', 'URL']
+
+PROBE = r"""
+import contextlib, io, json, resource, sys, time
+import pandas as pd
+engine, path_24m, path_12m, memory_mb, workers, output = sys.argv[1:7]
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    if engine == 'memory':
+        from process_report import compute_growth_report
+        report = compute_growth_report(pd.read_parquet(path_24m), pd.read_parquet(path_12m))
+    else:
+        from partitioned_report import compute_growth_report_partitioned
+        report = compute_growth_report_partitioned(path_24m, path_12m, memory_mb=float(memory_mb), workers=int(workers))
+seconds = time.perf_counter() - start
+# Before pickling the sheets. VmHWM, not ru_maxrss: on Linux ru_maxrss carries
+# over the parent's peak across fork/exec, and the parent built the inputs
+try:
+    peak_rss_mb = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmHWM')) / 1024
+except OSError:
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+pd.to_pickle(report.sheets(), output)
+print(json.dumps({
+    'seconds': seconds,
+    'peak_rss_mb': peak_rss_mb,
+    'clients': report.stats['total_clients'],
+    'tasks': report.stats.get('partitioned', {}).get('tasks'),
+}))
+"""
+
+
+def run_engine(engine, path_24m, path_12m, memory_mb, workers, output):
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, engine, str(path_24m), str(path_12m), str(memory_mb), str(workers), str(output)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def same_sheets(path_a, path_b):
+    import pandas as pd
+
+    sheets_a, sheets_b = pd.read_pickle(path_a), pd.read_pickle(path_b)
+    for name, frame in sheets_a.items():
+        other = sheets_b[name]
+        if name == 'Summary':
+            # Report Generated timestamp
+            frame, other = frame.iloc[:-1], other.iloc[:-1]
+        try:
+            pd.testing.assert_frame_equal(frame, other)
+        except AssertionError:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the partitioned report engine")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--memory-mb', type=float, default=256)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'clients':>10} {'in-memory (s)':>14} {'peak MB':>8} {'partitioned (s)':>16} {'peak MB':>8} {'tasks':>6} {'same':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for size in args.sizes:
+            df_24m, df_12m = generate_rcb_frames(size)
+            path_24m, path_12m = tmp / f'{size}_24m.parquet', tmp / f'{size}_12m.parquet'
+            df_24m[INPUT_COLUMNS[:4]].to_parquet(path_24m, row_group_size=100_000)
+            df_12m[INPUT_COLUMNS].to_parquet(path_12m, row_group_size=100_000)
+            del df_24m, df_12m
+
+            memory = run_engine('memory', path_24m, path_12m, args.memory_mb, args.workers, tmp / 'memory.pkl')
+            partitioned = run_engine('partitioned', path_24m, path_12m, args.memory_mb, args.workers,
+                                     tmp / 'partitioned.pkl')
+            same = same_sheets(tmp / 'memory.pkl', tmp / 'partitioned.pkl')
+            print(f"{size:>10,} {memory['seconds']:>14.2f} {memory['peak_rss_mb']:>8.0f} "
+                  f"{partitioned['seconds']:>16.2f} {partitioned['peak_rss_mb']:>8.0f} "
+                  f"{partitioned['tasks']:>6} {'yes' if same else 'NO':>5}")
+
+
+if __name__ == '__main__':
+    main()
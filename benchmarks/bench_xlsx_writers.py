@@ -0,0 +1,77 @@
+"""
+Benchmark the report Excel writers (openpyxl vs streaming xlsxwriter)
+Reports wall time and peak Python memory for process_growth_report with each
+backend, and checks that both workbooks hold the same cell values and
+Summary highlight colours.
+
+Usage:
+    python -m benchmarks.bench_xlsx_writers
+    python -m benchmarks.bench_xlsx_writers --sizes 10000 100000
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from benchmarks.synthetic_rcb import generate_rcb_frames
+from process_report import process_growth_report
+from report_writers import SUMMARY_SHEET, XLSX_WRITERS
+
+
+def _sheet_contents(path):
+    """Cell values per sheet plus Summary fill colours, for equivalence checks"""
+    workbook = load_workbook(path, read_only=False)
+    contents = {}
+    for ws in workbook.worksheets:
+        values = [tuple(None if v == '' else v for v in row) for row in ws.iter_rows(values_only=True)]
+        if ws.title == SUMMARY_SHEET:
+            values = values[:-1]  # 'Report Generated' timestamp differs per run
+            fills = [ws.cell(r, 1).fill.fgColor.rgb[-6:] if ws.cell(r, 1).fill.fill_type else None
+                     for r in range(1, ws.max_row + 1)]
+            contents['Summary fills'] = fills
+        contents[ws.title] = values
+    workbook.close()
+    return contents
+
+
+def _run(writer, df_24m, df_12m, output_file):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_growth_report(df_24m, df_12m, output_file, writer=writer)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report Excel writers")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--no-verify', action='store_true', help="Skip the cell-by-cell comparison")
+    args = parser.parse_args()
+
+    print(f"{'clients':>10} {'writer':<11} {'seconds':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            df_24m, df_12m = generate_rcb_frames(size)
+            outputs = {}
+            for writer in XLSX_WRITERS:
+                outputs[writer] = Path(tmp) / f"report_{size}_{writer}.xlsx"
+                elapsed, peak_mb = _run(writer, df_24m, df_12m, outputs[writer])
+                print(f"{size:>10,} {writer:<11} {elapsed:>9.2f} {peak_mb:>9.1f}")
+
+            if not args.no_verify:
+                reference, streamed = (_sheet_contents(path) for path in outputs.values())
+                assert reference == streamed, "Writers produced different sheet content"
+                print(f"{'':>10} sheet content identical")
+
+
+if __name__ == '__main__':
+    main()
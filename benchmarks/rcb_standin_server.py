@@ -0,0 +1,140 @@
+"""
+Local stand-in for the RMS2 RCB export endpoint
+Serves synthetic RCB workbooks at /RCB/Export?months=N to requests carrying
+the session cookie (anything else gets the HTML login page, like an expired
+RMS2 session). Use it to exercise and time the direct HTTP export path of
+download_rms2_data.py without touching production.
+
+Usage:
+    python -m benchmarks.rcb_standin_server --port 8765             # serve until Ctrl+C
+    python -m benchmarks.rcb_standin_server --check --clients 20000  # self-test + timing
+"""
+
+import argparse
+import io
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic_rcb import generate_rcb_frames
+
+SESSION_COOKIE = 'ASP.NET_SessionId'
+SESSION_VALUE = 'standin-session'
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def build_workbooks(clients):
+    """Synthetic export bytes per month period"""
+    df_24m, df_12m = generate_rcb_frames(clients)
+    workbooks = {}
+    for months, frame in ((24, df_24m), (12, df_12m)):
+        buffer = io.BytesIO()
+        frame.to_excel(buffer, index=False)
+        workbooks[months] = buffer.getvalue()
+    return workbooks
+
+
+def make_handler(workbooks, chunk_size=64 * 1024):
+    class RCBExportHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass  # keep benchmark output clean
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/RCB/Export':
+                self.send_error(404)
+                return
+
+            if f"{SESSION_COOKIE}={SESSION_VALUE}" not in self.headers.get('Cookie', ''):
+                body = b"<html><body>Login</body></html>"
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            months = int(parse_qs(url.query).get('months', ['12'])[0])
+            payload = workbooks.get(months)
+            if payload is None:
+                self.send_error(400, "Unsupported month period")
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', XLSX_MIME)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            for start in range(0, len(payload), chunk_size):
+                self.wfile.write(payload[start:start + chunk_size])
+
+    return RCBExportHandler
+
+
+def start_server(workbooks, port=0):
+    """Start the stand-in in a background thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(workbooks))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_check(clients):
+    """Download both exports through the direct path and verify the fallback signal"""
+    import pandas as pd
+
+    from download_rms2_data import http_session_from_cookies, stream_to_file
+
+    workbooks = build_workbooks(clients)
+    server, base_url = start_server(workbooks)
+    cookies = [{'name': SESSION_COOKIE, 'value': SESSION_VALUE, 'domain': '127.0.0.1', 'path': '/'}]
+    try:
+        session = http_session_from_cookies(cookies)
+        with tempfile.TemporaryDirectory() as tmp:
+            for months in (24, 12):
+                output_file = Path(tmp) / f"RCB_{months}months.xlsx"
+                start = time.perf_counter()
+                size = stream_to_file(session, f"{base_url}/RCB/Export?months={months}", output_file)
+                elapsed = time.perf_counter() - start
+                rows = len(pd.read_excel(output_file, usecols=['CorporateID']))
+                assert output_file.read_bytes() == workbooks[months]
+                print(f"{months}M: {size / 1024 / 1024:.1f} MB, {rows:,} rows in {elapsed:.2f}s")
+
+            # Expired session must raise so the downloader falls back to the browser
+            try:
+                stream_to_file(http_session_from_cookies([]), f"{base_url}/RCB/Export?months=12",
+                               Path(tmp) / 'expired.xlsx')
+            except ValueError as e:
+                print(f"Expired session rejected as expected: {e}")
+            else:
+                raise AssertionError("Expired session was not detected")
+            assert not (Path(tmp) / 'expired.xlsx').exists()
+    finally:
+        server.shutdown()
+    print("Direct export path OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the RCB export endpoint")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--check', action='store_true', help="Run the direct-export self-test and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        run_check(args.clients)
+        return
+
+    server, base_url = start_server(build_workbooks(args.clients), args.port)
+    print(f"Serving {base_url}/RCB/Export?months={{24|12}} (cookie {SESSION_COOKIE}={SESSION_VALUE})")
+    print(f"Point the downloader at it with RCB_EXPORT_URL='{base_url}/RCB/Export?months={{months}}'")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
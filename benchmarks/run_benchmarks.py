@@ -0,0 +1,160 @@
+"""
+Stage-by-stage benchmark of the report pipeline on synthetic RCB workbooks
+Times Excel read, merge, metric computation, filtering (sheet building) and
+Excel write, records peak Python memory per stage, and compares against
+stored baselines so regressions are flagged (exit code 1). A missing
+baseline also exits 1; benchmarks/baselines.json holds the default sizes.
+
+Usage:
+    python -m benchmarks.run_benchmarks                         # compare with baselines
+    python -m benchmarks.run_benchmarks --sizes 10000 50000 --save-baseline
+    python -m benchmarks.run_benchmarks --writer xlsxwriter --tolerance 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.synthetic_rcb import generate_rcb_frames, write_rcb_workbooks
+from process_report import build_growth_result, derive_growth_metrics, merge_rcb_frames
+from rcb_loader import read_rcb_excel
+from report_writers import DEFAULT_XLSX_WRITER
+
+DEFAULT_BASELINE_FILE = Path(__file__).parent / 'baselines.json'
+STAGES = ['excel_read', 'merge', 'metrics', 'filter', 'excel_write']
+
+# Ignore timing differences smaller than this (scheduler noise on tiny stages)
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def run_pipeline(path_24m, path_12m, output_file, writer, measure=None):
+    """
+    Run every stage once, calling measure(stage, func) to time/trace each
+
+    Returns:
+        dict: stage -> measurement returned by measure
+    """
+    results = {}
+    state = {}
+
+    def stage(name, func):
+        value, results[name] = measure(func)
+        return value
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        state['frames'] = stage('excel_read', lambda: (read_rcb_excel(path_24m), read_rcb_excel(path_12m)))
+        state['merged'] = stage('merge', lambda: merge_rcb_frames(*state['frames']))
+        state['metrics'] = stage('metrics', lambda: derive_growth_metrics(state['merged']))
+        state['result'] = stage('filter', lambda: build_growth_result(*state['metrics']))
+        stage('excel_write', lambda: state['result'].to_xlsx(output_file, writer=writer))
+    return results
+
+
+def _timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, round(time.perf_counter() - start, 4)
+
+
+def _traced(func):
+    tracemalloc.start()
+    value = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, round(peak / 1024 / 1024, 2)
+
+
+def benchmark_size(clients, workdir, writer, memory=True, seed=42):
+    """Generate workbooks for one size and measure every stage"""
+    df_24m, df_12m = generate_rcb_frames(clients, seed=seed)
+    path_24m, path_12m = write_rcb_workbooks(df_24m, df_12m, Path(workdir) / str(clients))
+    output_file = Path(workdir) / f"report_{clients}.xlsx"
+
+    seconds = run_pipeline(path_24m, path_12m, output_file, writer, _timed)
+    # Memory is traced in a separate pass so tracing overhead does not skew timings
+    peaks = run_pipeline(path_24m, path_12m, output_file, writer, _traced) if memory else {}
+    return {name: {'seconds': seconds[name], 'peak_mb': peaks.get(name)} for name in STAGES}
+
+
+def find_regressions(current, baseline, tolerance):
+    """List human-readable regressions of current vs baseline measurements"""
+    regressions = []
+    for size, stages in current.items():
+        for stage_name, measured in stages.items():
+            base = baseline.get(size, {}).get(stage_name)
+            if not base:
+                continue
+            if (measured['seconds'] > base['seconds'] * (1 + tolerance)
+                    and measured['seconds'] - base['seconds'] > MIN_REGRESSION_SECONDS):
+                regressions.append(f"{size} clients / {stage_name}: {measured['seconds']:.3f}s vs baseline {base['seconds']:.3f}s")
+            if (measured['peak_mb'] is not None and base.get('peak_mb')
+                    and measured['peak_mb'] > base['peak_mb'] * (1 + tolerance)):
+                regressions.append(f"{size} clients / {stage_name}: {measured['peak_mb']:.1f} MB vs baseline {base['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the report pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--writer', default=DEFAULT_XLSX_WRITER, help="Excel writer backend to benchmark")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the peak-memory pass")
+    args = parser.parse_args()
+
+    current = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for clients in args.sizes:
+            current[str(clients)] = benchmark_size(clients, workdir, args.writer, memory=not args.no_memory)
+
+    print(f"{'clients':>10} {'stage':<12} {'seconds':>9} {'peak MB':>9}")
+    for size, stages in current.items():
+        for stage_name, measured in stages.items():
+            peak = f"{measured['peak_mb']:.1f}" if measured['peak_mb'] is not None else '-'
+            print(f"{int(size):>10,} {stage_name:<12} {measured['seconds']:>9.3f} {peak:>9}")
+        print(f"{int(size):>10,} {'total':<12} {sum(m['seconds'] for m in stages.values()):>9.3f}")
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        stored.setdefault('results', {}).update(current)
+        stored['meta'] = {
+            'saved': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'writer': args.writer,
+        }
+        args.baseline.write_text(json.dumps(stored, indent=2))
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    # Nothing to compare against is a failure, not a silent pass
+    if not stored.get('results'):
+        print(f"\n[ERROR] No baseline at {args.baseline}. Record one on this machine with:\n"
+              f"  python -m benchmarks.run_benchmarks --sizes {' '.join(map(str, args.sizes))} --save-baseline")
+        return 1
+    missing = [size for size in current if size not in stored['results']]
+    if missing:
+        print(f"\n[WARNING] No baseline for {', '.join(missing)} clients (baseline sizes: "
+              f"{', '.join(stored['results'])}) - not compared; add them with --save-baseline")
+
+    regressions = find_regressions(current, stored['results'], args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\nNo regressions against baseline ({args.tolerance:.0%} tolerance)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Local SMTP stand-in for email delivery benchmarks (requires aiosmtpd)
+Accepts and counts messages, can add a handshake delay per connection (TLS +
+login on Office365 typically costs ~0.5-1s) and can reject the first delivery
+attempt with a 421 to exercise retries.
+
+Compares the previous per-message connection (as send_email_report used to
+do) with email_outbox.EmailOutbox, and prints attachment sizes for the full
+workbook, the zipped workbook and a High Growth + Summary only workbook.
+
+Usage:
+    python -m benchmarks.smtp_standin --messages 10 --connect-delay 0.5
+"""
+
+import argparse
+import asyncio
+import smtplib
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_rcb import generate_rcb_frames
+from email_outbox import EmailOutbox, SmtpSettings, build_message, workbook_attachment
+
+
+class CountingHandler:
+    def __init__(self, connect_delay=0.0, fail_first=0):
+        self.connect_delay = connect_delay
+        self.fail_first = fail_first
+        self.connections = 0
+        self.messages = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        with self.lock:
+            self.connections += 1
+        await asyncio.sleep(self.connect_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return '421 Service not available, try again later'
+            self.messages += 1
+            self.bytes += len(envelope.content)
+        return '250 OK'
+
+
+def start_standin(handler, port=0):
+    from aiosmtpd.controller import Controller
+
+    controller = Controller(handler, hostname='127.0.0.1', port=port or 8025)
+    controller.start()
+    return controller
+
+
+def legacy_send(host, port, message, recipients):
+    """Old pattern: one connection per message"""
+    server = smtplib.SMTP(host, port)
+    server.sendmail(message['From'], recipients, message.as_string())
+    server.quit()
+
+
+def build_report(workdir, clients):
+    import contextlib
+    import io
+
+    from process_report import compute_growth_report
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = compute_growth_report(*generate_rcb_frames(clients))
+        report_path = Path(workdir) / 'Client_Growth_Report.xlsx'
+        result.to_xlsx(report_path)
+    return report_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP stand-in and email delivery benchmark")
+    parser.add_argument('--messages', type=int, default=10)
+    parser.add_argument('--clients', type=int, default=5000, help="Synthetic report size for attachments")
+    parser.add_argument('--connect-delay', type=float, default=0.3, help="Seconds added to each SMTP handshake")
+    parser.add_argument('--port', type=int, default=8025)
+    args = parser.parse_args()
+
+    recipients = ['team@example.com']
+    with tempfile.TemporaryDirectory() as workdir:
+        report_path = build_report(workdir, args.clients)
+        print("Attachment sizes:")
+        for label, fmt, sheets in (
+            ('xlsx (all sheets)', 'xlsx', None),
+            ('zip (all sheets)', 'zip', None),
+            ('xlsx (High Growth + Summary)', 'xlsx', ['High Growth 5K-50K USD', 'Summary']),
+        ):
+            name, data, _ = workbook_attachment(report_path, fmt, sheets)
+            print(f"  {label:<30} {len(data) / 1024:>8.1f} KB  ({name})")
+        attachment = workbook_attachment(report_path)
+
+        def message():
+            return build_message('reports@example.com', recipients, 'Client Growth Report', 'Report attached', attachment)
+
+        print(f"\nSending {args.messages} messages, {args.connect_delay:.2f}s handshake delay:")
+
+        handler = CountingHandler(args.connect_delay)
+        controller = start_standin(handler, args.port)
+        try:
+            start = time.perf_counter()
+            for _ in range(args.messages):
+                legacy_send(controller.hostname, controller.port, message(), recipients)
+            legacy_seconds = time.perf_counter() - start
+        finally:
+            controller.stop()
+        print(f"  legacy (connection per message) {legacy_seconds:>7.2f}s, {handler.connections} connections")
+
+        # One transient 421 shows the retry path
+        handler = CountingHandler(args.connect_delay, fail_first=1)
+        controller = start_standin(handler, args.port)
+        outbox = EmailOutbox(SmtpSettings(controller.hostname, controller.port, '', '', starttls=False),
+                             backoff_seconds=0.1)
+        try:
+            start = time.perf_counter()
+            ids = [outbox.send(None, build=message) for _ in range(args.messages)]
+            enqueue_seconds = time.perf_counter() - start
+            statuses = [outbox.wait(delivery_id, timeout=60) for delivery_id in ids]
+            outbox_seconds = time.perf_counter() - start
+        finally:
+            outbox.close()
+            controller.stop()
+        latencies = [s['latency_seconds'] for s in statuses if s]
+        print(f"  outbox (reused connection)      {outbox_seconds:>7.2f}s, {handler.connections} connections, "
+              f"{outbox.stats['retries']} retries, caller blocked {enqueue_seconds * 1000:.1f} ms")
+        print(f"  delivered {handler.messages}/{args.messages}; latency first {latencies[0]:.2f}s, last {latencies[-1]:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Synthetic RCB export generator for benchmarks
+Produces 24-month / 12-month frames (and optionally .xlsx workbooks) shaped
+like real RMS2 exports: heavy-tailed revenue, account managers with skewed
+client counts, extra columns the report never reads, duplicate rows, missing
+URLs and UserNames, churned and new clients, and negative-revenue exceptions.
+
+Usage:
+    python -m benchmarks.synthetic_rcb --clients 50000 --out data/synthetic
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+URL_PREFIX = 'https://rms2.koenig-solutions.com/corporate/'
+
+REGIONS = ['India', 'USA', 'UK', 'UAE', 'Singapore', 'Australia', 'Canada', 'Germany']
+SEGMENTS = ['Enterprise', 'Mid-Market', 'SMB', 'Government', 'Education']
+SUFFIXES = ['Pvt Ltd', 'Ltd', 'Inc', 'LLC', 'GmbH', 'Technologies', 'Solutions', 'Group']
+
+# Excel's sheet limit minus the header row
+MAX_EXCEL_ROWS = 1_048_575
+
+
+def _extra_columns(rng, n):
+    """Columns present in real exports but never read by the report"""
+    return {
+        'Region': rng.choice(REGIONS, n),
+        'Segment': rng.choice(SEGMENTS, n),
+        'Invoices': rng.poisson(6, n),
+        'LastInvoiceDate': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+        'Currency': 'INR',
+        'Remarks': np.where(rng.random(n) < 0.1, 'Follow up with finance', ''),
+    }
+
+
+def generate_rcb_frames(n_clients, seed=42, duplicate_rate=0.01, missing_url_rate=0.2,
+                        exception_rate=0.03, churn_rate=0.08, new_client_rate=0.05,
+                        include_url=True):
+    """
+    Build synthetic 24-month and 12-month RCB frames
+
+    Args:
+        n_clients: CorporateIDs in the 24-month export
+        seed: Random seed (same seed -> identical frames)
+        duplicate_rate: Share of rows repeated in each export
+        missing_url_rate: Share of 12-month URLs left blank/None
+        exception_rate: Share of clients whose numbers produce negative revenue
+        churn_rate: Share of clients with no revenue in the last 12 months
+        new_client_rate: Extra clients that only appear in the 12-month export
+        include_url: Add the optional URL column to the 12-month export
+
+    Returns:
+        tuple: (df_24m, df_12m) DataFrames
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(100000, 100000 + n_clients)
+    names = pd.Series(ids).map(lambda i: f"Company {i} {SUFFIXES[i % len(SUFFIXES)]}")
+
+    # Account managers: Zipf-like, a few own most of the book
+    manager_weights = 1 / np.arange(1, 151)
+    managers = np.array([f"manager{i:03d}" for i in range(150)], dtype=object)
+    owner = rng.choice(managers, n_clients, p=manager_weights / manager_weights.sum())
+
+    # Heavy-tailed INR revenue: most clients small, a few very large
+    previous = np.round(rng.lognormal(12.5, 2.2, n_clients), 2)
+    previous[rng.random(n_clients) < 0.05] = 0  # no revenue in the earlier year
+    growth_factor = rng.lognormal(0, 0.8, n_clients)
+    current = np.round(previous * growth_factor, 2)
+    zero_previous = previous == 0
+    current[zero_previous] = np.round(rng.lognormal(13, 1.8, zero_previous.sum()), 2)
+    current[rng.random(n_clients) < churn_rate] = 0
+
+    # Exceptions: credit notes (negative 12M) or 12M larger than the 24M total
+    exception = rng.random(n_clients) < exception_rate
+    credit_note = exception & (rng.random(n_clients) < 0.5)
+    current[credit_note] = -np.abs(current[credit_note]) - 1000
+    revenue_24m = previous + current
+    revenue_24m[exception & ~credit_note] = np.round(current[exception & ~credit_note] * 0.5, 2)
+
+    df_24m = pd.DataFrame({
+        'CorporateID': ids,
+        'CorporateName': names,
+        'UserName': owner,
+        'TotalNR1': revenue_24m,
+        **_extra_columns(rng, n_clients),
+    })
+
+    n_new = int(n_clients * new_client_rate)
+    new_ids = np.arange(100000 + n_clients, 100000 + n_clients + n_new)
+    ids_12m = np.concatenate([ids, new_ids])
+    names_12m = pd.concat([names, pd.Series(new_ids).map(lambda i: f"Company {i} New")], ignore_index=True)
+    owner_12m = np.concatenate([owner, rng.choice(managers, n_new)])
+    owner_12m = np.where(rng.random(len(ids_12m)) < 0.05, None, owner_12m)  # unassigned
+    current_12m = np.concatenate([current, np.round(rng.lognormal(13, 1.5, n_new), 2)])
+
+    df_12m = pd.DataFrame({
+        'CorporateID': ids_12m,
+        'CorporateName': names_12m,
+        'UserName': owner_12m,
+        'TotalNR1': current_12m,
+        **_extra_columns(rng, len(ids_12m)),
+    })
+    if include_url:
+        urls = (URL_PREFIX + pd.Series(ids_12m).astype(str)).astype(object)
+        missing = rng.random(len(ids_12m))
+        urls[missing < missing_url_rate * 0.7] = None
+        urls[(missing >= missing_url_rate * 0.7) & (missing < missing_url_rate)] = ' '
+        df_12m['URL'] = urls
+
+    def with_duplicates(df):
+        dupes = df.sample(frac=duplicate_rate, random_state=seed)
+        return pd.concat([df, dupes]).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    return with_duplicates(df_24m), with_duplicates(df_12m)
+
+
+def write_rcb_workbooks(df_24m, df_12m, output_dir):
+    """
+    Save frames as RCB_24months.xlsx / RCB_12months.xlsx
+
+    Returns:
+        tuple: (path_24m, path_12m)
+    """
+    for df in (df_24m, df_12m):
+        if len(df) > MAX_EXCEL_ROWS:
+            raise ValueError(f"{len(df):,} rows exceeds the Excel sheet limit of {MAX_EXCEL_ROWS:,}")
+
+    try:
+        import xlsxwriter  # noqa: F401
+        engine = 'xlsxwriter'  # much faster for large synthetic files
+    except ImportError:
+        engine = 'openpyxl'
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path_24m = output_dir / 'RCB_24months.xlsx'
+    path_12m = output_dir / 'RCB_12months.xlsx'
+    df_24m.to_excel(path_24m, index=False, engine=engine)
+    df_12m.to_excel(path_12m, index=False, engine=engine)
+    return path_24m, path_12m
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic RCB workbooks")
+    parser.add_argument('--clients', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='data/synthetic')
+    parser.add_argument('--no-url', action='store_true', help="Omit the URL column")
+    args = parser.parse_args()
+
+    df_24m, df_12m = generate_rcb_frames(args.clients, seed=args.seed, include_url=not args.no_url)
+    path_24m, path_12m = write_rcb_workbooks(df_24m, df_12m, args.out)
+    print(f"Wrote {path_24m} ({len(df_24m):,} rows) and {path_12m} ({len(df_12m):,} rows)")
+
+
+if __name__ == '__main__':
+    main()
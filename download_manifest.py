@@ -0,0 +1,214 @@
+"""
+Manifest of downloaded RCB exports (data/manifest.json)
+Records hash, size, row count, month period and download time per file so the
+downloader can resume only missing/failed exports, skip exports that are
+still current, and leave identical workbooks untouched on disk (no git diff,
+no Streamlit redeploy). When a re-download only confirms the existing content,
+the time of that check goes to an untracked sidecar (data/manifest.local.json)
+so the committed manifest stays byte-identical.
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_MANIFEST_PATH = Path('data') / 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def workbook_content_sha256(path):
+    """
+    Hash of the workbook's sheets, ignoring docProps metadata
+
+    Every export embeds its creation time, so two downloads of the same data
+    never match byte-for-byte; this hash does.
+    """
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(path) as workbook:
+        for name in sorted(workbook.namelist()):
+            if name.startswith('docProps/'):
+                continue
+            digest.update(name.encode())
+            digest.update(workbook.read(name))
+    return digest.hexdigest()
+
+
+def count_data_rows(path):
+    """Data rows in the first sheet (header excluded), or None if openpyxl is unavailable"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        return None
+    workbook = load_workbook(path, read_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # The dimension tag is free; count rows only when the export omits it
+        rows = sheet.max_row if sheet.max_row else sum(1 for _ in sheet.iter_rows(values_only=True))
+        return max(rows - 1, 0)
+    finally:
+        workbook.close()
+
+
+def local_state_path(path=DEFAULT_MANIFEST_PATH):
+    """Untracked sidecar of a manifest: data/manifest.json -> data/manifest.local.json"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.local{path.suffix}")
+
+
+def _read_json(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Ignoring unreadable {path}: {e}")
+    return None
+
+
+def _write_json_if_changed(data, path):
+    text = json.dumps(data, indent=2, sort_keys=True) + '\n'
+    if path.exists() and path.read_text() == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text)
+    os.replace(tmp, path)
+    return True
+
+
+def load_manifest(path=DEFAULT_MANIFEST_PATH):
+    """
+    Manifest dict ({'version', 'files': {name: entry}, 'checked_at': {name: time}})
+
+    files comes from the manifest (empty if missing or unreadable), checked_at
+    from its local sidecar.
+    """
+    path = Path(path)
+    manifest = _read_json(path)
+    if not manifest or manifest.get('version') != MANIFEST_VERSION:
+        manifest = {'version': MANIFEST_VERSION, 'files': {}}
+    state = _read_json(local_state_path(path)) or {}
+    manifest['checked_at'] = state.get('checked_at', {})
+    # Manifests written before the sidecar kept checked_at in the entries
+    for name, entry in manifest['files'].items():
+        if 'checked_at' in entry:
+            manifest['checked_at'].setdefault(name, entry.pop('checked_at'))
+    return manifest
+
+
+def save_manifest(manifest, path=DEFAULT_MANIFEST_PATH):
+    """
+    Write the manifest only if its content changed, so unchanged runs leave no diff
+
+    checked_at goes to the local sidecar, which is not committed.
+
+    Returns:
+        bool: True if the manifest itself was rewritten
+    """
+    path = Path(path)
+    tracked = {key: value for key, value in manifest.items() if key != 'checked_at'}
+    _write_json_if_changed({'checked_at': manifest.get('checked_at', {})}, local_state_path(path))
+    return _write_json_if_changed(tracked, path)
+
+
+def validate_export(path):
+    """
+    Raise ValueError unless path is an RCB export workbook
+
+    Checked before a download replaces the real file, so a truncated
+    download or an HTML error page saved as .xlsx never overwrites good data.
+    Needs openpyxl for the header check; without it only the zip is checked.
+    """
+    from rcb_loader import REQUIRED_COLUMNS
+
+    path = Path(path)
+    if not zipfile.is_zipfile(path):
+        raise ValueError(f"{path.name} is not an xlsx workbook (truncated download or error page?)")
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        return
+    try:
+        workbook = load_workbook(path, read_only=True)
+        try:
+            header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+    except Exception as e:
+        raise ValueError(f"{path.name} cannot be opened as a workbook: {e}") from e
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"{path.name} is missing export column(s): {', '.join(missing)}")
+
+
+def describe_file(path, months):
+    """Manifest entry for a downloaded export"""
+    path = Path(path)
+    return {
+        'file': path.name,
+        'months': months,
+        'sha256': file_sha256(path),
+        'content_sha256': workbook_content_sha256(path),
+        'size': path.stat().st_size,
+        'rows': count_data_rows(path),
+        'downloaded_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def is_current(manifest, path, max_age_hours):
+    """
+    True when path matches its manifest entry and was confirmed recently enough
+
+    Freshness counts from checked_at, the last download that returned this
+    content (downloaded_at when the local sidecar has no check).
+    The file's bytes are re-hashed, so a manually replaced or truncated
+    workbook is never mistaken for a current one.
+    """
+    path = Path(path)
+    entry = manifest['files'].get(path.name)
+    if not entry or not path.exists() or path.stat().st_size != entry.get('size'):
+        return False
+    checked_at = datetime.fromisoformat(manifest.get('checked_at', {}).get(path.name) or entry['downloaded_at'])
+    if datetime.now() - checked_at > timedelta(hours=max_age_hours):
+        return False
+    return file_sha256(path) == entry.get('sha256')
+
+
+def commit_download(manifest, staged_path, output_path, months):
+    """
+    Move a freshly downloaded export into place and record it in the manifest
+
+    The download is validated first (ValueError, and the existing file is
+    left alone, if it is not an export). If its content matches the existing
+    file, the existing file and its entry are kept, the download is discarded
+    and only checked_at is refreshed, so the export counts as current again
+    for the next run without changing the committed manifest.
+
+    Returns:
+        tuple: (manifest entry, True if output_path was replaced)
+    """
+    staged_path, output_path = Path(staged_path), Path(output_path)
+    validate_export(staged_path)
+    entry = manifest['files'].get(output_path.name)
+    if entry and output_path.exists() and output_path.stat().st_size == entry.get('size'):
+        if workbook_content_sha256(staged_path) == entry.get('content_sha256'):
+            staged_path.unlink()
+            manifest.setdefault('checked_at', {})[output_path.name] = datetime.now().isoformat(timespec='seconds')
+            return entry, False
+
+    os.replace(staged_path, output_path)
+    entry = describe_file(output_path, months)
+    manifest['files'][output_path.name] = entry
+    manifest.setdefault('checked_at', {})[output_path.name] = entry['downloaded_at']
+    return entry, True
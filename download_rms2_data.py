@@ -3,19 +3,233 @@ RMS2 Data Downloader - FIXED SELECTORS
 Downloads 24-month and 12-month data from RMS2 RCB page
 """
 
+import json
 import os
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlparse
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 import time
 
+from download_manifest import DEFAULT_MANIFEST_PATH, commit_download, is_current, load_manifest, save_manifest
+
+MONTH_PERIODS = (24, 12)
+
+LOGIN_EMAIL_SELECTOR = "input[placeholder='Your Email']"
+LOGIN_PASSWORD_SELECTOR = "input[placeholder='Password']"
+MONTH_INPUT_SELECTOR = "input[placeholder='12']"
+
+DISPLAY_SELECTORS = [
+    "button:has-text('Display')",
+    "button.ui.mini.button:has-text('Display')",
+    "button:has(i.filter.icon)",
+    "//button[contains(text(), 'Display')]"
+]
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Resource types the RCB flow never needs; override with RMS_BLOCKED_RESOURCE_TYPES
+DEFAULT_BLOCKED_RESOURCE_TYPES = 'image,font,media'
+
+# Chromium extras the headless download run does not need
+LIGHTWEIGHT_BROWSER_ARGS = [
+    '--disable-extensions',
+    '--disable-gpu',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--mute-audio',
+    '--no-first-run',
+]
+
+
+def load_session_state(path, max_age_hours):
+    """
+    Saved Playwright storage_state, or None if missing, too old or expired
+    
+    Args:
+        path: Session file written by save_session_state
+        max_age_hours: Ignore files older than this (the server may expire sessions first;
+            that case is caught when the session is checked against the RCB page)
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    age_hours = (time.time() - path.stat().st_mtime) / 3600
+    if age_hours > max_age_hours:
+        print(f"[INFO] Saved session is {age_hours:.1f}h old - logging in again")
+        return None
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Ignoring unreadable session file {path}: {e}")
+        return None
+    cookies = state.get('cookies', [])
+    # expires is -1 for session cookies, else a Unix timestamp
+    if not cookies or any(0 < c.get('expires', -1) < time.time() for c in cookies):
+        print("[INFO] Saved session cookies have expired - logging in again")
+        return None
+    return state
+
+
+def save_session_state(path, state):
+    """Write storage_state readable by the current user only (it holds live session cookies)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f)
+    os.chmod(tmp, 0o600)  # in case the file already existed with wider permissions
+    os.replace(tmp, path)
+
+
+def _env_list(name, default=''):
+    return [item.strip() for item in os.getenv(name, default).split(',') if item.strip()]
+
+
+def should_block_request(url, resource_type, first_party_hosts, blocked_types,
+                         block_third_party=False, allow_patterns=()):
+    """
+    Routing policy for the downloader's browser
+    
+    Args:
+        url: Request URL
+        resource_type: Playwright resource type ('image', 'xhr', 'document', ...)
+        first_party_hosts: RMS2 hosts (plus any extra allowed hosts)
+        blocked_types: Resource types to abort wherever they come from
+        block_third_party: Also abort every request to a host outside first_party_hosts
+        allow_patterns: URL fragments that are never blocked (RMS2 API, export)
+    
+    Returns:
+        str or None: Reason the request is blocked, None to let it through
+    """
+    if any(pattern in url for pattern in allow_patterns):
+        return None
+    if resource_type in blocked_types:
+        return resource_type
+    host = urlparse(url).hostname or ''
+    if block_third_party and host and host not in first_party_hosts:
+        return 'third-party'
+    return None
+
+
+def http_session_from_cookies(cookies, pool_size=4):
+    """
+    Pooled requests.Session carrying the Playwright session cookies
+    
+    Args:
+        cookies: Playwright cookie dicts (context.cookies() or storage_state['cookies'])
+        pool_size: Max keep-alive connections per host
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    for cookie in cookies:
+        domain = cookie.get('domain', '')
+        # cookielib only matches dotted domains; host-only cookies (e.g. localhost) go without one
+        session.cookies.set(
+            cookie['name'], cookie['value'],
+            domain=domain if '.' in domain else None,
+            path=cookie.get('path', '/')
+        )
+    return session
+
+
+def stream_to_file(session, url, output_file, chunk_size=DOWNLOAD_CHUNK_SIZE, timeout=(10, 300)):
+    """
+    Stream an xlsx export to disk in chunks, replacing output_file atomically
+    
+    Raises:
+        ValueError: If the server answered with a page instead of a workbook
+            (typically the login page after the session expired)
+    
+    Returns:
+        int: Bytes written
+    """
+    output_file = Path(output_file)
+    part_file = output_file.with_name(output_file.name + '.part')
+    written = 0
+    try:
+        with session.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            if 'text/html' in response.headers.get('Content-Type', ''):
+                raise ValueError("Export returned an HTML page instead of a workbook (session expired?)")
+            with open(part_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size):
+                    if written == 0 and not chunk.startswith(b'PK'):
+                        raise ValueError("Export response is not an xlsx file")
+                    f.write(chunk)
+                    written += len(chunk)
+        if written == 0:
+            raise ValueError("Export response was empty")
+        os.replace(part_file, output_file)
+        return written
+    finally:
+        part_file.unlink(missing_ok=True)
+
+
+EXPORT_SELECTORS = [
+    "button:has-text('Export to excel')",
+    "button.ui.mini.button:has-text('Export')",
+    "//button[contains(text(), 'Export')]"
+]
+
 class RMS2Downloader:
     def __init__(self):
         self.username = os.getenv('RMS_USERNAME')
         self.password = os.getenv('RMS_PASSWORD')
         self.login_url = os.getenv('RMS_LOGIN_URL', 'https://rms2.koenig-solutions.com')
         self.rcb_url = os.getenv('RCB_BASE_URL', 'https://rms2.koenig-solutions.com/RCB')
+        # Download the 24M and 12M exports in parallel after a single login
+        self.concurrent = os.getenv('RMS_CONCURRENT', '0').lower() in ('1', 'true', 'yes')
+        # Grid rows rendered after Display, and (optionally) the URL fragment of
+        # the XHR that returns the grid data; any XHR/fetch counts when unset
+        self.row_selector = os.getenv('RCB_ROW_SELECTOR', 'table tbody tr')
+        self.data_url_pattern = os.getenv('RCB_DATA_URL_PATTERN', '')
+        self.wait_timeout_ms = int(os.getenv('RMS_WAIT_TIMEOUT_MS', '60000'))
+        # Direct export endpoint, e.g. https://rms2.koenig-solutions.com/RCB/Export?months={months}
+        # When set, exports are fetched over HTTP with the browser's session
+        # cookies and the UI flow is only used as a fallback
+        self.export_url_template = os.getenv('RCB_EXPORT_URL', '')
+        self.step_timings = []
+        # Authenticated storage_state reused across runs; RMS_SESSION_FILE='' disables it
+        self.session_file = os.getenv('RMS_SESSION_FILE', '.cache/rms2_session.json')
+        self.session_max_age_hours = float(os.getenv('RMS_SESSION_MAX_AGE_HOURS', '12'))
+        # data/manifest.json: exports downloaded within RMS_MANIFEST_MAX_AGE_HOURS and
+        # unchanged on disk are skipped, so a rerun only resumes what failed
+        self.manifest_path = Path(os.getenv('RMS_MANIFEST_FILE', str(DEFAULT_MANIFEST_PATH)))
+        self.manifest_max_age_hours = float(os.getenv('RMS_MANIFEST_MAX_AGE_HOURS', '12'))
+        self.force_download = os.getenv('RMS_FORCE_DOWNLOAD', '0').lower() in ('1', 'true', 'yes')
+        self.manifest = load_manifest(self.manifest_path)
+        self._manifest_lock = threading.Lock()
+        
+        # Lightweight browser profile: abort heavy/irrelevant requests, smaller
+        # viewport, no service workers or Chromium extras. Set
+        # RMS_BLOCK_RESOURCES=0 to load pages normally and compare timings.
+        self.block_resources = os.getenv('RMS_BLOCK_RESOURCES', '1').lower() in ('1', 'true', 'yes')
+        self.blocked_types = set(_env_list('RMS_BLOCKED_RESOURCE_TYPES', DEFAULT_BLOCKED_RESOURCE_TYPES))
+        self.block_third_party = os.getenv('RMS_BLOCK_THIRD_PARTY', '0').lower() in ('1', 'true', 'yes')
+        self.first_party_hosts = {
+            urlparse(url).hostname for url in (self.login_url, self.rcb_url)
+        } | set(_env_list('RMS_ALLOWED_HOSTS'))
+        self.allow_patterns = _env_list('RMS_ALLOW_URL_PATTERNS') + [
+            pattern for pattern in (self.data_url_pattern,) if pattern
+        ]
+        width, height = os.getenv('RMS_VIEWPORT', '1280x720').lower().split('x')
+        self.viewport = {'width': int(width), 'height': int(height)}
+        self.blocked_counts = Counter()
+        self._blocked_lock = threading.Lock()
         
         if not self.username or not self.password:
             raise ValueError("RMS_USERNAME and RMS_PASSWORD must be set")
@@ -23,160 +237,439 @@ class RMS2Downloader:
         print("=" * 60)
         print("RMS2 Data Downloader")
         print("=" * 60)
+        print(f"Browser profile: {self.profile_label()}")
         
     def log(self, message):
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print(f"[{timestamp}] {message}")
     
+    @contextmanager
+    def _timed_step(self, name):
+        """Log how long a step took; collected in step_timings for the run summary"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.step_timings.append((name, elapsed))
+            self.log(f"⏱ {name}: {elapsed:.2f}s")
+    
+    def log_step_summary(self):
+        if not self.step_timings:
+            return
+        self.log(f"Step timings ({self.profile_label()}):")
+        for name, elapsed in self.step_timings:
+            self.log(f"  {name:<32} {elapsed:>7.2f}s")
+        self.log(f"  {'total (sum of steps)':<32} {sum(e for _, e in self.step_timings):>7.2f}s")
+        if self.blocked_counts:
+            blocked = ', '.join(f"{reason} {count}" for reason, count in self.blocked_counts.most_common())
+            self.log(f"  Blocked requests: {blocked}")
+    
+    def profile_label(self):
+        size = f"{self.viewport['width']}x{self.viewport['height']}"
+        if not self.block_resources:
+            return f"full page loads, viewport {size}"
+        blocked = ','.join(sorted(self.blocked_types)) or 'nothing'
+        third_party = ' + third-party hosts' if self.block_third_party else ''
+        return f"blocking {blocked}{third_party}, viewport {size}"
+    
+    def _launch_browser(self, p):
+        return p.chromium.launch(
+            headless=True,
+            args=LIGHTWEIGHT_BROWSER_ARGS if self.block_resources else None
+        )
+    
+    def _route_request(self, route):
+        request = route.request
+        reason = should_block_request(
+            request.url, request.resource_type, self.first_party_hosts,
+            self.blocked_types, self.block_third_party, self.allow_patterns
+        )
+        if reason is None:
+            route.continue_()
+            return
+        with self._blocked_lock:
+            self.blocked_counts[reason] += 1
+        route.abort()
+    
+    def _new_context(self, browser, storage_state=None):
+        context = browser.new_context(
+            viewport=self.viewport,
+            accept_downloads=True,
+            storage_state=storage_state,
+            service_workers='block' if self.block_resources else 'allow'
+        )
+        if self.block_resources:
+            context.route("**/*", self._route_request)
+        return context
+    
+    def _log_navigation_timing(self, page, label):
+        """Log the browser's own navigation timings so profiles can be compared run to run"""
+        try:
+            timing = page.evaluate(
+                """() => {
+                    const nav = performance.getEntriesByType('navigation')[0];
+                    return nav ? {dcl: nav.domContentLoadedEventEnd, load: nav.loadEventEnd,
+                                  resources: performance.getEntriesByType('resource').length} : null;
+                }"""
+            )
+        except Exception:
+            return
+        if timing:
+            self.log(f"{label}: DOMContentLoaded {timing['dcl'] / 1000:.2f}s, "
+                     f"load {timing['load'] / 1000:.2f}s, {timing['resources']} resources fetched")
+    
+    def _login(self, page):
+        """Log in through the RMS2 form"""
+        self.log("Logging in to RMS2...")
+        with self._timed_step("login page load"):
+            page.goto(self.login_url, wait_until='networkidle')
+            page.wait_for_selector(LOGIN_EMAIL_SELECTOR, state='visible', timeout=self.wait_timeout_ms)
+        self._log_navigation_timing(page, "Login page")
+        
+        # Fill login form - UPDATED SELECTORS
+        with self._timed_step("login submit"):
+            page.fill(LOGIN_EMAIL_SELECTOR, self.username)
+            page.fill(LOGIN_PASSWORD_SELECTOR, self.password)
+            page.click("button:has-text('Login')")
+            # Logged in once the login form is gone
+            page.wait_for_selector(LOGIN_PASSWORD_SELECTOR, state='detached', timeout=self.wait_timeout_ms)
+        
+        self.log("Login successful")
+    
+    def _session_is_valid(self, page):
+        """Open the RCB page with the restored session; False if RMS2 shows the login form"""
+        with self._timed_step("saved session check"):
+            page.goto(self.rcb_url, wait_until='domcontentloaded')
+            try:
+                page.locator(
+                    f"{LOGIN_EMAIL_SELECTOR}, {MONTH_INPUT_SELECTOR}, {', '.join(DISPLAY_SELECTORS[:3])}"
+                ).first.wait_for(state='visible', timeout=self.wait_timeout_ms)
+            except PlaywrightTimeout:
+                return False
+            return page.locator(LOGIN_EMAIL_SELECTOR).count() == 0
+    
+    def _authenticate(self, browser):
+        """
+        Reuse the saved session when it is still valid, otherwise log in and save it
+        
+        Returns:
+            tuple: (context, page) for an authenticated browser context
+        """
+        state = None
+        if self.session_file:
+            state = load_session_state(self.session_file, self.session_max_age_hours)
+        
+        if state is not None:
+            context = self._new_context(browser, state)
+            page = context.new_page()
+            if self._session_is_valid(page):
+                self.log("Reusing saved RMS2 session - login skipped")
+                return context, page
+            self.log("Saved session was rejected by RMS2 - logging in again")
+            context.close()
+            Path(self.session_file).unlink(missing_ok=True)
+        
+        context = self._new_context(browser)
+        page = context.new_page()
+        self._login(page)
+        if self.session_file:
+            save_session_state(self.session_file, context.storage_state())
+            self.log(f"Session saved to {self.session_file}")
+        return context, page
+    
+    def _output_file(self, months):
+        return Path('data') / f'RCB_{months}months.xlsx'
+    
+    def _staging_file(self, months):
+        """Downloads land here first so an identical export never rewrites the real file"""
+        return Path('data') / f'.RCB_{months}months.download.xlsx'
+    
+    def pending_periods(self):
+        """Month periods whose export is missing, stale or changed since the manifest entry"""
+        if self.force_download:
+            return list(MONTH_PERIODS)
+        pending = []
+        for months in MONTH_PERIODS:
+            if is_current(self.manifest, self._output_file(months), self.manifest_max_age_hours):
+                self.log(f"✓ {months}-month export is current (manifest) - skipping")
+            else:
+                pending.append(months)
+        return pending
+    
+    def _store_download(self, months, staged_file):
+        """Move a finished download into place and record it in the manifest"""
+        output_file = self._output_file(months)
+        with self._manifest_lock:
+            entry, replaced = commit_download(self.manifest, staged_file, output_file, months)
+            save_manifest(self.manifest, self.manifest_path)
+        rows = f", {entry['rows']:,} rows" if entry.get('rows') is not None else ''
+        if replaced:
+            self.log(f"✓ Saved: {output_file.name} ({entry['size'] / 1024 / 1024:.1f} MB{rows})")
+        else:
+            self.log(f"✓ {output_file.name} unchanged since {entry['downloaded_at']} - kept existing file")
+        return True
+    
     def download_data(self):
-        """Download both 24M and 12M data files"""
+        """Download the 24M and 12M data files that are not already current"""
+        pending = self.pending_periods()
+        if not pending:
+            self.log("✓ All exports are current - nothing to download")
+            return True
+        
+        if self.concurrent:
+            return self.download_data_concurrent(pending)
+        
         with sync_playwright() as p:
             self.log("Setting up browser...")
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                accept_downloads=True
-            )
-            page = context.new_page()
+            browser = self._launch_browser(p)
+            page = None
             
             try:
                 self.log("Browser ready")
                 
-                # Login
-                self.log("Logging in to RMS2...")
-                page.goto(self.login_url, wait_until='networkidle')
-                page.wait_for_timeout(2000)
+                # Login (or reuse the saved session)
+                context, page = self._authenticate(browser)
                 
-                # Fill login form - UPDATED SELECTORS
-                page.fill("input[placeholder='Your Email']", self.username)
-                page.fill("input[placeholder='Password']", self.password)
-                page.click("button:has-text('Login')")
-                page.wait_for_timeout(3000)
+                session = None
+                if self.export_url_template:
+                    session = http_session_from_cookies(context.cookies())
                 
-                self.log("Login successful")
+                # Keep going after a failure: finished exports are already in the
+                # manifest, so the next run only retries what failed
+                results = {months: self._download_period(page, months, session) for months in pending}
+                for months, success in results.items():
+                    if not success:
+                        self.log(f"✗ Failed to download {months}-month data")
                 
-                # Download 24-month data
-                success_24m = self._download_file(page, 24)
-                if not success_24m:
-                    self.log("✗ Failed to download 24-month data")
-                    return False
-                
-                page.wait_for_timeout(2000)
-                
-                # Download 12-month data
-                success_12m = self._download_file(page, 12)
-                if not success_12m:
-                    self.log("✗ Failed to download 12-month data")
-                    return False
-                
-                self.log("✓ Both files downloaded successfully")
-                return True
+                if all(results.values()):
+                    self.log("✓ Both files downloaded successfully")
+                    return True
+                return False
                 
             except Exception as e:
                 self.log(f"✗ Error: {str(e)}")
-                screenshot_path = Path('data') / 'error_screenshot.png'
-                page.screenshot(path=str(screenshot_path))
-                self.log(f"Error screenshot saved: {screenshot_path}")
+                if page is not None:
+                    screenshot_path = Path('data') / 'error_screenshot.png'
+                    page.screenshot(path=str(screenshot_path))
+                    self.log(f"Error screenshot saved: {screenshot_path}")
                 return False
                 
             finally:
                 self.log("Browser cleanup complete")
                 browser.close()
     
+    def download_data_concurrent(self, pending=MONTH_PERIODS):
+        """
+        Log in once, then run the pending 24M/12M downloads in parallel
+        
+        Playwright's sync API is bound to the thread that created it, so the
+        authenticated session (cookies + local storage) is exported after login
+        and each download thread opens its own browser with that state.
+        """
+        started = time.perf_counter()
+        
+        with sync_playwright() as p:
+            self.log("Setting up browser for login...")
+            browser = self._launch_browser(p)
+            try:
+                context, page = self._authenticate(browser)
+                storage_state = context.storage_state()
+            except Exception as e:
+                self.log(f"✗ Login error: {str(e)}")
+                pages = [pg for ctx in browser.contexts for pg in ctx.pages]
+                if pages:
+                    screenshot_path = Path('data') / 'login_error.png'
+                    pages[-1].screenshot(path=str(screenshot_path))
+                    self.log(f"Error screenshot saved: {screenshot_path}")
+                return False
+            finally:
+                browser.close()
+        
+        self.log(f"Starting parallel downloads: {', '.join(f'{m}M' for m in pending)}")
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            futures = {
+                months: pool.submit(self._download_in_own_browser, months, storage_state)
+                for months in pending
+            }
+            results = {months: future.result() for months, future in futures.items()}
+        
+        for months, success in results.items():
+            if not success:
+                self.log(f"✗ Failed to download {months}-month data")
+        
+        self.log(f"Concurrent download finished in {time.perf_counter() - started:.1f}s")
+        if all(results.values()):
+            self.log("✓ Both files downloaded successfully")
+            return True
+        return False
+    
+    def _download_in_own_browser(self, months, storage_state):
+        """Worker thread: direct HTTP export if configured, else a fresh browser authenticated via storage_state"""
+        if self.export_url_template:
+            session = http_session_from_cookies(storage_state.get('cookies', []))
+            if self._download_file_http(session, months):
+                return True
+        
+        with sync_playwright() as p:
+            browser = self._launch_browser(p)
+            try:
+                context = self._new_context(browser, storage_state)
+                page = context.new_page()
+                return self._download_file(page, months)
+            except Exception as e:
+                self.log(f"✗ {months}-month worker error: {str(e)}")
+                return False
+            finally:
+                browser.close()
+    
+    def _download_period(self, page, months, session=None):
+        """Direct HTTP export when available, falling back to the browser flow"""
+        if session is not None and self._download_file_http(session, months):
+            return True
+        return self._download_file(page, months)
+    
+    def _download_file_http(self, session, months):
+        """Fetch the export straight from the RCB endpoint; False means use the browser flow"""
+        url = self.export_url_template.format(months=months)
+        staged_file = self._staging_file(months)
+        self.log(f"Downloading {months}-month data via direct export...")
+        try:
+            with self._timed_step(f"{months}M direct HTTP export"):
+                stream_to_file(session, url, staged_file)
+            return self._store_download(months, staged_file)
+        except Exception as e:
+            self.log(f"Direct export failed ({str(e)}) - falling back to browser flow")
+            return False
+    
+    def _wait_for_stable_rows(self, page, settle_ms=500, poll_ms=100):
+        """
+        Wait until the grid has rows and the row count stops changing
+        
+        Returns:
+            int: Final row count (0 if no rows appeared before the timeout)
+        """
+        deadline = time.perf_counter() + self.wait_timeout_ms / 1000
+        last_count = -1
+        stable_since = time.perf_counter()
+        while time.perf_counter() < deadline:
+            count = page.locator(self.row_selector).count()
+            if count != last_count:
+                last_count = count
+                stable_since = time.perf_counter()
+            elif count > 0 and (time.perf_counter() - stable_since) * 1000 >= settle_ms:
+                return count
+            page.wait_for_timeout(poll_ms)  # polling interval, not a fixed delay
+        return max(last_count, 0)
+    
+    def _is_data_response(self, response):
+        if response.request.resource_type not in ('xhr', 'fetch'):
+            return False
+        return not self.data_url_pattern or self.data_url_pattern in response.url
+    
+    def _click_first(self, page, selectors, timeout=5000):
+        """Click the first selector that matches; return it, or None"""
+        for selector in selectors:
+            try:
+                page.click(selector, timeout=timeout)
+                return selector
+            except Exception:
+                continue
+        return None
+    
     def _download_file(self, page, months):
         """Download file for specific month period"""
         self.log(f"Downloading {months}-month data...")
         
         try:
             # Navigate to RCB page
-            page.goto(self.rcb_url, wait_until='networkidle')
-            page.wait_for_timeout(3000)
+            with self._timed_step(f"{months}M RCB page load"):
+                page.goto(self.rcb_url, wait_until='networkidle')
+                try:
+                    # Page is usable once the period input or Display button is rendered
+                    page.locator(f"{MONTH_INPUT_SELECTOR}, {', '.join(DISPLAY_SELECTORS[:3])}").first.wait_for(
+                        state='visible', timeout=self.wait_timeout_ms
+                    )
+                except PlaywrightTimeout:
+                    self.log("Warning: RCB controls not visible yet - continuing")
+            self._log_navigation_timing(page, f"{months}M RCB page")
             
             # METHOD 1: Try to find and fill input field directly
             self.log(f"Trying to set {months} months period...")
             
             try:
-                # Look for input field with placeholder="12" or any number input
-                month_input = page.locator("input[placeholder='12']").first
-                if not month_input.is_visible():
-                    # Try alternative selectors
-                    month_input = page.locator("input[type='text']").filter(has_text="12").first
-                
-                if month_input.is_visible():
-                    month_input.click()
-                    page.wait_for_timeout(500)
-                    month_input.fill("")  # Clear
-                    page.wait_for_timeout(500)
-                    month_input.type(str(months))
-                    page.wait_for_timeout(1000)
-                    self.log(f"✓ Set to {months} months")
-                else:
-                    raise Exception("Month input field not found")
+                with self._timed_step(f"{months}M set period"):
+                    # Look for input field with placeholder="12" or any number input
+                    month_input = page.locator(MONTH_INPUT_SELECTOR).first
+                    if not month_input.is_visible():
+                        # Try alternative selectors
+                        month_input = page.locator("input[type='text']").filter(has_text="12").first
+                    
+                    if month_input.is_visible():
+                        # Playwright auto-waits for each input to be actionable
+                        month_input.click()
+                        month_input.fill("")  # Clear
+                        month_input.type(str(months))
+                        page.wait_for_function(
+                            "([el, value]) => el.value === value",
+                            arg=[month_input.element_handle(), str(months)],
+                            timeout=5000
+                        )
+                        self.log(f"✓ Set to {months} months")
+                    else:
+                        raise Exception("Month input field not found")
                     
             except Exception as e:
                 self.log(f"Warning: Could not set month period - {str(e)}")
                 self.log("Continuing with default value...")
             
-            # Click Display button - UPDATED SELECTOR
+            # Click Display button and wait for the grid data request
             self.log("Clicking 'Display' button...")
-            try:
-                # Try multiple possible selectors for Display button
-                display_selectors = [
-                    "button:has-text('Display')",
-                    "button.ui.mini.button:has-text('Display')",
-                    "button:has(i.filter.icon)",
-                    "//button[contains(text(), 'Display')]"
-                ]
-                
-                button_found = False
-                for selector in display_selectors:
-                    try:
-                        page.click(selector, timeout=5000)
-                        button_found = True
-                        self.log("✓ Display button clicked")
-                        break
-                    except:
-                        continue
+            with self._timed_step(f"{months}M display + data load"):
+                try:
+                    with page.expect_response(self._is_data_response, timeout=self.wait_timeout_ms):
+                        if self._click_first(page, DISPLAY_SELECTORS) is None:
+                            raise Exception("Display button not found")
+                    self.log("✓ Display button clicked, data received")
+                except PlaywrightTimeout:
+                    self.log("Warning: No data response seen after Display - checking grid instead")
+                except Exception as e:
+                    self.log(f"Warning: Could not click Display button - {str(e)}")
                 
-                if not button_found:
-                    raise Exception("Display button not found")
-                    
-            except Exception as e:
-                self.log(f"Warning: Could not click Display button - {str(e)}")
-            
-            page.wait_for_timeout(5000)  # Wait for data to load
+                rows = self._wait_for_stable_rows(page)
+                self.log(f"✓ Grid rendered with {rows} rows")
             
             # Click Export button and handle download
             self.log("Clicking 'Export to excel' button...")
             
-            export_selectors = [
-                "button:has-text('Export to excel')",
-                "button.ui.mini.button:has-text('Export')",
-                "//button[contains(text(), 'Export')]"
-            ]
-            
             download_started = False
-            for selector in export_selectors:
-                try:
-                    with page.expect_download(timeout=60000) as download_info:
-                        page.click(selector, timeout=10000)
-                    
-                    download = download_info.value
-                    download_started = True
-                    self.log("✓ Download started")
-                    
-                    # Save file
-                    output_file = Path('data') / f'RCB_{months}months.xlsx'
-                    download.save_as(output_file)
-                    
-                    if output_file.exists():
-                        size_mb = output_file.stat().st_size / 1024 / 1024
-                        self.log(f"✓ Saved: {output_file.name} ({size_mb:.1f} MB)")
-                        return True
-                    break
-                    
-                except Exception as e:
-                    continue
+            with self._timed_step(f"{months}M export + download"):
+                for selector in EXPORT_SELECTORS:
+                    try:
+                        export_button = page.locator(selector).first
+                        export_button.wait_for(state='visible', timeout=10000)
+                        page.wait_for_function(
+                            "el => !el.disabled && !el.classList.contains('disabled')",
+                            arg=export_button.element_handle(),
+                            timeout=10000
+                        )
+                        with page.expect_download(timeout=60000) as download_info:
+                            export_button.click(timeout=10000)
+                        
+                        download = download_info.value
+                        download_started = True
+                        self.log("✓ Download started")
+                        
+                        # Save file
+                        staged_file = self._staging_file(months)
+                        download.save_as(staged_file)
+                        
+                        if staged_file.exists():
+                            return self._store_download(months, staged_file)
+                        break
+                        
+                    except Exception as e:
+                        continue
             
             if not download_started:
                 raise Exception("Export button not found or download failed")
@@ -198,10 +691,11 @@ def main():
         
         downloader = RMS2Downloader()
         success = downloader.download_data()
+        downloader.log_step_summary()
         
         if success:
             print("\n" + "=" * 60)
-            print("SUCCESS: Both files downloaded")
+            print("SUCCESS: Both files are up to date")
             print("=" * 60)
             return 0
         else:
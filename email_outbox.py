@@ -0,0 +1,265 @@
+"""
+Background email outbox with SMTP connection reuse
+Messages are queued and sent by one worker thread that keeps its SMTP
+connection open between messages (re-checked with NOOP, reopened when the
+server dropped it or after it sat idle), retries transient failures with
+exponential backoff and records delivery latency per message. Report
+attachments can be zipped or cut down to selected sheets before sending.
+"""
+
+import io
+import queue
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass
+from email.message import EmailMessage
+from pathlib import Path
+
+XLSX_MIME = ('application', 'vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+ATTACHMENT_FORMATS = ('xlsx', 'zip')
+
+DELIVERY_QUEUED = 'queued'
+DELIVERY_SENDING = 'sending'
+DELIVERY_SENT = 'sent'
+DELIVERY_FAILED = 'failed'
+
+# Errors worth retrying besides 4xx "try again later" replies: dropped or refused
+# connections and timeouts. Other SMTP errors (auth, refused recipients, missing
+# extensions) are OSError subclasses too, but retrying them cannot help
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+# Finished deliveries nobody waited for are forgotten after this long
+DELIVERY_KEEP_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    host: str
+    port: int
+    username: str
+    password: str
+    starttls: bool = True
+    timeout: float = 30
+
+
+def _is_transient(error):
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def workbook_attachment(report_path, attachment_format='xlsx', sheets=None):
+    """
+    Attachment bytes for a report workbook
+
+    Args:
+        report_path: Generated .xlsx report
+        attachment_format: 'xlsx' or 'zip' (workbook inside a deflated zip)
+        sheets: Sheet names to keep (SHEET_HIGH_GROWTH keeps the High Growth
+            sheet at any cut-offs); None sends the workbook as written
+
+    Returns:
+        tuple: (filename, bytes, (maintype, subtype))
+    """
+    report_path = Path(report_path)
+    if sheets:
+        from openpyxl import load_workbook
+
+        from report_config import SHEET_HIGH_GROWTH, is_high_growth_sheet
+
+        workbook = load_workbook(report_path)
+        for sheet_name in list(workbook.sheetnames):
+            if sheet_name in sheets or (SHEET_HIGH_GROWTH in sheets and is_high_growth_sheet(sheet_name)):
+                continue
+            del workbook[sheet_name]
+        if not workbook.sheetnames:
+            raise ValueError(f"None of the selected sheets exist in {report_path.name}")
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        data = buffer.getvalue()
+    else:
+        data = report_path.read_bytes()
+
+    if attachment_format == 'zip':
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+            archive.writestr(report_path.name, data)
+        return f"{report_path.stem}.zip", buffer.getvalue(), ('application', 'zip')
+    if attachment_format != 'xlsx':
+        raise ValueError(f"Unknown attachment format {attachment_format!r}; choose from {ATTACHMENT_FORMATS}")
+    return report_path.name, data, XLSX_MIME
+
+
+def build_message(sender, recipients, subject, body, attachment=None):
+    """EmailMessage with an optional (filename, bytes, (maintype, subtype)) attachment"""
+    message = EmailMessage()
+    message['From'] = sender
+    message['To'] = ', '.join(recipients)
+    message['Subject'] = subject
+    message.set_content(body)
+    if attachment is not None:
+        filename, data, (maintype, subtype) = attachment
+        message.add_attachment(data, maintype=maintype, subtype=subtype, filename=filename)
+    return message
+
+
+class EmailOutbox:
+    """
+    Queue of outgoing messages sent over one reused SMTP connection
+
+    Args:
+        settings: SmtpSettings for the relay
+        max_attempts: Tries per message for transient failures
+        backoff_seconds: First retry delay; doubles on every further retry
+        idle_seconds: Close the connection after this long without messages
+        keep_seconds: Forget finished deliveries after this long; wait()
+            forgets a delivery as soon as it returns its final status
+    """
+
+    def __init__(self, settings, max_attempts=3, backoff_seconds=2.0, idle_seconds=60,
+                 keep_seconds=DELIVERY_KEEP_SECONDS):
+        self.settings = settings
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.idle_seconds = idle_seconds
+        self.keep_seconds = keep_seconds
+        self.stats = {'connections': 0, 'sent': 0, 'failed': 0, 'retries': 0}
+        self._queue = queue.Queue()
+        self._deliveries = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._worker = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+        self._worker.start()
+
+    def send(self, message, build=None):
+        """
+        Queue a message and return its delivery ID
+
+        Args:
+            message: EmailMessage, or None when build is given
+            build: Optional callable returning the EmailMessage, run on the
+                worker thread so attachment work stays off the caller's thread
+        """
+        delivery_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._deliveries[delivery_id] = {
+                'status': DELIVERY_QUEUED, 'attempts': 0, 'queued_at': time.time(),
+                'latency_seconds': None, 'error': None, 'done': threading.Event(),
+            }
+        self._queue.put((delivery_id, message, build))
+        return delivery_id
+
+    def status(self, delivery_id):
+        with self._lock:
+            delivery = self._deliveries.get(delivery_id)
+            return {k: v for k, v in delivery.items() if k != 'done'} if delivery else None
+
+    def wait(self, delivery_id, timeout=None):
+        """
+        Block until the message is sent or failed; returns status() (None on
+        timeout or for a delivery that is already forgotten)
+
+        The outbox lives as long as the server process, so a delivery is
+        forgotten once its final status has been returned here.
+        """
+        with self._lock:
+            delivery = self._deliveries.get(delivery_id)
+        if delivery is None or not delivery['done'].wait(timeout):
+            return None
+        with self._lock:
+            self._deliveries.pop(delivery_id, None)
+        return {k: v for k, v in delivery.items() if k != 'done'}
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join(timeout=10)
+
+    def _update(self, delivery_id, **changes):
+        with self._lock:
+            self._deliveries[delivery_id].update(changes)
+
+    def _connect(self):
+        settings = self.settings
+        server = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+        if settings.starttls:
+            server.starttls(context=ssl.create_default_context())
+        # Local relays/stand-ins may not offer AUTH; a relay that needs it rejects the send
+        if settings.username and server.has_extn('auth'):
+            server.login(settings.username, settings.password)
+        self.stats['connections'] += 1
+        return server
+
+    def _connection(self):
+        """The open connection if the server still answers NOOP, else a new one"""
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except smtplib.SMTPException:
+                pass
+            self._disconnect()
+        self._server = self._connect()
+        return self._server
+
+    def _disconnect(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    def _deliver(self, delivery_id, message, build):
+        self._update(delivery_id, status=DELIVERY_SENDING)
+        try:
+            message = message if build is None else build()
+        except Exception as e:
+            self._finish(delivery_id, DELIVERY_FAILED, error=f"Could not build message: {e}")
+            return
+
+        for attempt in range(1, self.max_attempts + 1):
+            self._update(delivery_id, attempts=attempt)
+            try:
+                self._connection().send_message(message)
+                self._finish(delivery_id, DELIVERY_SENT)
+                return
+            except Exception as e:
+                self._disconnect()
+                if not _is_transient(e) or attempt == self.max_attempts:
+                    self._finish(delivery_id, DELIVERY_FAILED, error=str(e))
+                    return
+                self.stats['retries'] += 1
+                time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+
+    def _finish(self, delivery_id, status, error=None):
+        now = time.time()
+        with self._lock:
+            delivery = self._deliveries[delivery_id]
+            delivery.update(status=status, error=error, finished_at=now,
+                            latency_seconds=round(now - delivery['queued_at'], 3))
+            self.stats['sent' if status == DELIVERY_SENT else 'failed'] += 1
+            delivery['done'].set()
+            # Deliveries whose sender timed out waiting are never popped by wait()
+            expired = [other for other, entry in self._deliveries.items()
+                       if now - entry.get('finished_at', now) > self.keep_seconds]
+            for other in expired:
+                del self._deliveries[other]
+        latency = delivery['latency_seconds']
+        print(f"[INFO] Email {delivery_id} {status} after {delivery['attempts']} attempt(s), {latency:.2f}s"
+              + (f": {error}" if error else ''))
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                self._disconnect()  # idle - do not hold the relay connection open
+                continue
+            if item is None:
+                self._disconnect()
+                return
+            self._deliver(*item)
@@ -0,0 +1,168 @@
+"""
+GitHub Actions client for the dashboard's Full Automation flow
+Dispatches the download workflow with a correlation ID (shown in the run name),
+finds exactly that run, and polls it and its jobs/steps over one pooled
+session using conditional requests (ETag -> 304, which GitHub does not count
+against the rate limit) with adaptive backoff.
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+GITHUB_REPO = "KoenigSalary/client_growth_report"
+DOWNLOAD_WORKFLOW = "download-rms2-data.yml"
+
+# Runs created this long before our dispatch still count (clock skew)
+CLOCK_SKEW = timedelta(seconds=10)
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class ActionsClient:
+    """
+    Pooled, ETag-aware client for the few Actions endpoints the dashboard uses
+
+    Args:
+        token: GitHub token with actions:write on the repository
+        repo: owner/name
+        api_url: API root; defaults to $GITHUB_API_URL or api.github.com
+            (point it at a local mock for benchmarks)
+    """
+
+    def __init__(self, token, repo=GITHUB_REPO, api_url=None, pool_size=4):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.repo = repo
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL", DEFAULT_GITHUB_API_URL)).rstrip("/")
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        })
+        # url -> (etag, parsed body) for conditional GETs
+        self._etags = {}
+        self.stats = {"requests": 0, "not_modified": 0}
+
+    def _url(self, path):
+        return f"{self.api_url}/repos/{self.repo}/{path}"
+
+    def get_json(self, path, params=None):
+        """GET with If-None-Match; a 304 returns the cached body without re-downloading it"""
+        url = self._url(path)
+        cache_key = (url, tuple(sorted((params or {}).items())))
+        headers = {}
+        cached = self._etags.get(cache_key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = self.session.get(url, params=params, headers=headers, timeout=15)
+        self.stats["requests"] += 1
+        if response.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            return cached[1]
+        response.raise_for_status()
+        body = response.json()
+        if response.headers.get("ETag"):
+            self._etags[cache_key] = (response.headers["ETag"], body)
+        return body
+
+    def dispatch(self, workflow=DOWNLOAD_WORKFLOW, ref="main", inputs=None):
+        """
+        Trigger a workflow_dispatch run tagged with a fresh correlation ID
+
+        Returns:
+            tuple: (correlation_id, dispatched_at UTC datetime)
+
+        Raises:
+            RuntimeError: If GitHub did not accept the dispatch
+        """
+        correlation_id = uuid.uuid4().hex[:12]
+        dispatched_at = datetime.now(timezone.utc)
+        response = self.session.post(
+            self._url(f"actions/workflows/{workflow}/dispatches"),
+            json={"ref": ref, "inputs": {**(inputs or {}), "request_id": correlation_id}},
+            timeout=15,
+        )
+        self.stats["requests"] += 1
+        if response.status_code != 204:
+            raise RuntimeError(f"API returned status {response.status_code}")
+        return correlation_id, dispatched_at
+
+    def find_run(self, correlation_id, dispatched_at, workflow=DOWNLOAD_WORKFLOW,
+                 timeout=60, interval=2, fallback_after=20):
+        """
+        Locate the run created by dispatch()
+
+        The workflow puts the correlation ID in its run name; if no run carries
+        it within fallback_after seconds (e.g. an older workflow file), the
+        earliest workflow_dispatch run created after the dispatch is used.
+
+        Returns:
+            dict or None: The workflow run, None if it did not appear in time
+        """
+        started = time.monotonic()
+        while True:
+            runs = self.get_json(
+                f"actions/workflows/{workflow}/runs",
+                {"event": "workflow_dispatch", "per_page": 20},
+            ).get("workflow_runs", [])
+            for run in runs:
+                if correlation_id in (run.get("display_title") or run.get("name") or ""):
+                    return run
+            recent = [
+                run for run in runs
+                if _parse_time(run["created_at"]) >= dispatched_at - CLOCK_SKEW
+            ]
+            waited = time.monotonic() - started
+            if recent and waited >= fallback_after:
+                return min(recent, key=lambda run: run["created_at"])
+            if waited >= timeout:
+                return None
+            time.sleep(interval)
+
+    def poll_run(self, run_id, timeout=600, min_interval=2, max_interval=20, backoff=1.5):
+        """
+        Poll a run and its jobs until it completes or the timeout passes
+
+        The interval starts at min_interval, grows by `backoff` while nothing
+        changes (304s or identical status) and resets when a job or step moves.
+
+        Yields:
+            tuple: (run dict, list of job dicts with their steps, changed flag)
+        """
+        deadline = time.monotonic() + timeout
+        interval = min_interval
+        last_state = None
+        while True:
+            run = self.get_json(f"actions/runs/{run_id}")
+            jobs = self.get_json(f"actions/runs/{run_id}/jobs").get("jobs", [])
+            state = (
+                run.get("status"),
+                tuple(
+                    (job.get("status"), tuple(step.get("status") for step in job.get("steps", [])))
+                    for job in jobs
+                ),
+            )
+            changed = state != last_state
+            last_state = state
+            yield run, jobs, changed
+
+            if run.get("status") == "completed" or time.monotonic() >= deadline:
+                return
+            interval = min_interval if changed else min(interval * backoff, max_interval)
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+
+
+def step_progress(jobs):
+    """(completed steps, total steps) across all jobs"""
+    steps = [step for job in jobs for step in job.get("steps", [])]
+    return sum(step.get("status") == "completed" for step in steps), len(steps)
@@ -0,0 +1,182 @@
+"""
+Incremental month-over-month growth computation keyed by CorporateID
+Each run persists a snapshot of its per-client results together with a hashed
+fingerprint of every client's input rows. The next run only recomputes the
+CorporateIDs whose 24M/12M rows changed (or are new), reuses the stored rows
+for everything else and drops removed clients.
+"""
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from process_report import compute_growth_metrics
+from report_config import INR_TO_USD
+
+INPUT_COLUMNS = ['CorporateID', 'CorporateName', 'UserName', 'TotalNR1']
+
+# Bump when compute_growth_metrics output changes so old snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+
+def _side_fingerprints(df, columns):
+    """uint64 fingerprint per CorporateID over all of that client's input rows"""
+    frame = df[columns]
+    frame = frame[frame['CorporateID'].notna()]
+    row_hashes = pd.util.hash_pandas_object(frame, index=False)
+    # Sum wraps around in uint64, so duplicate rows still combine deterministically
+    return row_hashes.groupby(frame['CorporateID'].to_numpy()).sum()
+
+
+def _columns_12m(df_12m):
+    return INPUT_COLUMNS + (['URL'] if 'URL' in df_12m.columns else [])
+
+
+def input_fingerprints(df_24m, df_12m):
+    """
+    Fingerprint each CorporateID's 24-month and 12-month input rows
+
+    Returns:
+        DataFrame indexed by CorporateID with uint64 columns fp_24m / fp_12m
+        (0 when the client is absent from that export)
+    """
+    fp_24m = _side_fingerprints(df_24m, INPUT_COLUMNS)
+    fp_12m = _side_fingerprints(df_12m, _columns_12m(df_12m))
+    ids = fp_24m.index.union(fp_12m.index)
+    return pd.DataFrame({
+        'fp_24m': fp_24m.reindex(ids, fill_value=0).astype('uint64'),
+        'fp_12m': fp_12m.reindex(ids, fill_value=0).astype('uint64'),
+    }, index=ids)
+
+
+def load_snapshot(snapshot_path, inr_to_usd, columns_12m):
+    """Return the stored snapshot, or None if missing or not reusable for this run"""
+    snapshot_path = Path(snapshot_path)
+    if not snapshot_path.exists():
+        return None
+    try:
+        snapshot = pd.read_pickle(snapshot_path)
+    except Exception as e:
+        print(f"[WARN] Ignoring unreadable snapshot {snapshot_path}: {e}")
+        return None
+
+    meta = snapshot.get('meta', {})
+    if (meta.get('version') != SNAPSHOT_VERSION
+            or meta.get('inr_to_usd') != inr_to_usd
+            or meta.get('columns_12m') != columns_12m):
+        print("[INFO] Snapshot was built with different settings - full recompute")
+        return None
+    return snapshot
+
+
+def save_snapshot(snapshot_path, fingerprints, merged_clean, exceptions, inr_to_usd, columns_12m):
+    """Persist per-client results and input fingerprints for the next run"""
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot = {
+        'meta': {
+            'version': SNAPSHOT_VERSION,
+            'inr_to_usd': inr_to_usd,
+            'columns_12m': columns_12m,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        },
+        'fingerprints': fingerprints,
+        'merged_clean': merged_clean,
+        'exceptions': exceptions,
+    }
+    # Pickle keeps object columns exactly as computed (mixed ID types, None vs NaN).
+    # Own temp file per process and thread: the CLI and the dashboard's report
+    # jobs can save the same snapshot at once
+    tmp = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    pd.to_pickle(snapshot, tmp)
+    tmp.replace(snapshot_path)
+
+
+def _rows_for(df, ids):
+    """Input rows for the given CorporateIDs (rows without an ID are always recomputed)"""
+    return df[df['CorporateID'].isin(ids) | df['CorporateID'].isna()]
+
+
+def _combine(stored, recomputed, unchanged_ids):
+    """Stored rows for unchanged clients + recomputed rows, in full-merge order"""
+    kept = stored[stored['CorporateID'].isin(unchanged_ids)]
+    # Skip empty pieces so they cannot widen column dtypes (e.g. int64 -> object)
+    combined = pd.concat([kept, recomputed]) if len(recomputed) else kept
+    # An outer merge sorts by key; a stable sort reproduces that order exactly
+    combined = combined.sort_values('CorporateID', kind='mergesort', na_position='last')
+    return combined.reset_index(drop=True)
+
+
+def _frames_match(left, right):
+    try:
+        pd.testing.assert_frame_equal(
+            left.reset_index(drop=True), right.reset_index(drop=True)
+        )
+        return True
+    except AssertionError as e:
+        print(f"[WARN] Incremental result differs from full recompute: {e}")
+        return False
+
+
+def incremental_growth_metrics(df_24m, df_12m, snapshot_path, inr_to_usd=INR_TO_USD, verify=False):
+    """
+    compute_growth_metrics, recomputing only clients whose inputs changed
+
+    Args:
+        df_24m: DataFrame with 24-month data
+        df_12m: DataFrame with 12-month data
+        snapshot_path: Snapshot file from the previous run (created if missing)
+        inr_to_usd: INR per USD exchange rate
+        verify: Also run a full recompute and compare; the full result wins on mismatch
+
+    Returns:
+        tuple: (merged_clean, exceptions, incremental stats dict)
+    """
+    columns_12m = _columns_12m(df_12m)
+    fingerprints = input_fingerprints(df_24m, df_12m)
+    snapshot = load_snapshot(snapshot_path, inr_to_usd, columns_12m)
+
+    if snapshot is None:
+        merged_clean, exceptions = compute_growth_metrics(df_24m, df_12m, inr_to_usd)
+        stats = {'mode': 'full', 'recomputed': len(fingerprints)}
+    else:
+        previous = snapshot['fingerprints']
+        common = fingerprints.index.intersection(previous.index)
+        same = (fingerprints.loc[common] == previous.loc[common]).all(axis=1)
+        unchanged_ids = common[same.to_numpy()]
+        dirty_ids = fingerprints.index.difference(unchanged_ids)
+        removed_ids = previous.index.difference(fingerprints.index)
+
+        try:
+            recomputed_clean, recomputed_exceptions = compute_growth_metrics(
+                _rows_for(df_24m, dirty_ids), _rows_for(df_12m, dirty_ids), inr_to_usd
+            )
+            merged_clean = _combine(snapshot['merged_clean'], recomputed_clean, unchanged_ids)
+            exceptions = _combine(snapshot['exceptions'], recomputed_exceptions, unchanged_ids)
+            stats = {
+                'mode': 'incremental',
+                'unchanged': len(unchanged_ids),
+                'changed': len(common) - len(unchanged_ids),
+                'added': len(fingerprints.index.difference(previous.index)),
+                'removed': len(removed_ids),
+                'recomputed': len(dirty_ids),
+            }
+        except TypeError as e:
+            # e.g. CorporateIDs of mixed types cannot be ordered - fall back safely
+            print(f"[WARN] Incremental merge failed ({e}) - full recompute")
+            merged_clean, exceptions = compute_growth_metrics(df_24m, df_12m, inr_to_usd)
+            stats = {'mode': 'full', 'recomputed': len(fingerprints)}
+
+        if verify and stats['mode'] == 'incremental':
+            full_clean, full_exceptions = compute_growth_metrics(df_24m, df_12m, inr_to_usd)
+            stats['verified'] = (_frames_match(merged_clean, full_clean)
+                                 and _frames_match(exceptions, full_exceptions))
+            if not stats['verified']:
+                merged_clean, exceptions = full_clean, full_exceptions
+
+    print(f"[INFO] Growth metrics ({stats['mode']}): {stats}")
+    save_snapshot(snapshot_path, fingerprints, merged_clean, exceptions, inr_to_usd, columns_12m)
+    return merged_clean, exceptions, stats
@@ -0,0 +1,89 @@
+"""
+Sorted index for what-if High Growth re-filtering
+Built once from a report's per-client INR revenue (GrowthResult.clients), it
+answers "which clients are High Growth at these cut-offs and this INR rate?"
+by binary search over the sorted revenue columns plus a mask over the smaller
+candidate side - no re-reading or re-merging of the RCB exports. Results match
+a full report regeneration with the same settings row for row.
+"""
+
+import bisect
+
+import numpy as np
+
+from process_report import high_growth_sheet
+
+
+def _usd(inr, inr_to_usd):
+    """INR -> whole USD exactly as derive_growth_metrics rounds it (half to even)"""
+    return np.round(inr / inr_to_usd)
+
+
+class HighGrowthIndex:
+    """
+    Previous/current 12M INR revenue sorted once, queried per threshold/FX setting
+
+    Args:
+        clients: GrowthResult.clients (per-client INR revenue, merged_clean order)
+    """
+
+    def __init__(self, clients):
+        self.clients = clients.reset_index(drop=True)
+        self.previous_inr = self.clients['Previous_12M_Revenue'].to_numpy(dtype='float64')
+        self.current_inr = self.clients['12_Month_Revenue'].to_numpy(dtype='float64')
+        self._previous_order = np.argsort(self.previous_inr, kind='stable')
+        self._current_order = np.argsort(self.current_inr, kind='stable')
+        self._previous_sorted = self.previous_inr[self._previous_order]
+        self._current_sorted = self.current_inr[self._current_order]
+
+    def __len__(self):
+        return len(self.clients)
+
+    def positions(self, max_previous_usd, min_current_usd, inr_to_usd):
+        """
+        Row positions (ascending) of the High Growth clients for these settings
+
+        Rounded USD is monotonic in INR, so each cut-off is one binary search
+        over its sorted column; the other condition is then checked only on
+        the smaller of the two candidate sets.
+        """
+        def usd(inr):
+            return round(inr / inr_to_usd)
+
+        previous_count = bisect.bisect_right(self._previous_sorted, max_previous_usd, key=usd)
+        current_start = bisect.bisect_left(self._current_sorted, min_current_usd, key=usd)
+
+        if previous_count <= len(self) - current_start:
+            candidates = self._previous_order[:previous_count]
+            keep = _usd(self.current_inr[candidates], inr_to_usd) >= min_current_usd
+        else:
+            candidates = self._current_order[current_start:]
+            keep = _usd(self.previous_inr[candidates], inr_to_usd) <= max_previous_usd
+        return np.sort(candidates[keep])
+
+    def count(self, max_previous_usd, min_current_usd, inr_to_usd):
+        return len(self.positions(max_previous_usd, min_current_usd, inr_to_usd))
+
+    def high_growth(self, max_previous_usd, min_current_usd, inr_to_usd):
+        """
+        High Growth sheet for these settings
+
+        Returns:
+            DataFrame: Same columns and order as GrowthResult.high_growth
+        """
+        positions = self.positions(max_previous_usd, min_current_usd, inr_to_usd)
+        rows = self.clients.iloc[positions].copy()
+
+        # Same arithmetic as derive_growth_metrics, for the selected rows only
+        previous_usd = rows['Previous_12M_Revenue'] / inr_to_usd
+        current_usd = rows['12_Month_Revenue'] / inr_to_usd
+        growth_usd = current_usd - previous_usd
+        growth_pct = np.divide(
+            growth_usd.to_numpy(dtype='float64'), previous_usd.to_numpy(dtype='float64'),
+            out=np.zeros(len(rows)), where=previous_usd.to_numpy() != 0,
+        )
+        rows['Previous_12M_USD'] = previous_usd.round(0).astype(int)
+        rows['Current_12M_USD'] = current_usd.round(0).astype(int)
+        rows['Growth_USD'] = growth_usd.round(0).astype(int)
+        rows['Growth_%'] = growth_pct * 100
+        return high_growth_sheet(rows)
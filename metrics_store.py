@@ -0,0 +1,307 @@
+"""
+Historical report metrics in an embedded SQLite database
+Every computed report is appended as one run (totals and settings) plus one
+row per client, keyed by (CorporateID, run). Trend, sparkline and per-client
+history queries then read a few indexed rows instead of opening old
+workbooks in generated_reports/. A run is recorded once per distinct
+inputs + settings, so regenerating the same report does not add duplicates.
+
+Usage:
+    python -m metrics_store --backfill generated_reports   # import existing reports
+    python -m metrics_store --client 100166                # print one client's history
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_METRICS_DB = Path(os.getenv('METRICS_DB_PATH', 'data/report_metrics.sqlite'))
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at TEXT NOT NULL,
+    input_key TEXT NOT NULL UNIQUE,
+    source TEXT,
+    report_file TEXT,
+    settings TEXT,
+    total_clients INTEGER,
+    high_growth_clients INTEGER,
+    exceptions INTEGER,
+    total_growth_usd REAL,
+    avg_growth_pct REAL
+);
+CREATE INDEX IF NOT EXISTS ix_runs_run_at ON runs (run_at);
+CREATE TABLE IF NOT EXISTS client_metrics (
+    corporate_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    company_name TEXT,
+    user_name TEXT,
+    previous_usd INTEGER,
+    current_usd INTEGER,
+    growth_usd INTEGER,
+    growth_pct REAL,
+    high_growth INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (corporate_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_client_metrics_run ON client_metrics (run_id);
+"""
+
+# Runs are ordered by run_at, not run_id: backfill() inserts old reports after newer
+# runs. run_id only breaks ties (ix_runs_run_at carries it, as the rowid)
+LATEST_RUN = "(SELECT run_id FROM runs ORDER BY run_at DESC, run_id DESC LIMIT 1)"
+
+# GrowthResult sheet column -> client_metrics column
+CLIENT_COLUMNS = {
+    'CorporateID': 'corporate_id',
+    'CompanyName': 'company_name',
+    'UserName': 'user_name',
+    'Previous_12M_USD': 'previous_usd',
+    'Current_12M_USD': 'current_usd',
+    'Growth_USD': 'growth_usd',
+    'Growth_%': 'growth_pct',
+}
+
+
+def _corporate_id(value):
+    """CorporateIDs are stored as text; whole floats (from Excel) lose their .0"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def run_input_key(sha_24m, sha_12m, settings):
+    """
+    input_key of a report run: both input SHA-256s plus the settings
+
+    The dashboard and the CLI both build keys here, so the same inputs and
+    settings map to one run whichever recorded it first. Settings are
+    normalised first (rate as float, cut-offs as int), because json.dumps
+    would tell 84 from 84.0 apart.
+    """
+    normalised = {
+        name: float(value) if name == 'inr_to_usd' else int(value)
+        for name, value in settings.items()
+    }
+    return f"{sha_24m}:{sha_12m}:{json.dumps(normalised, sort_keys=True)}"
+
+
+class MetricsStore:
+    """
+    Report runs and per-client metrics over time
+
+    Args:
+        path: SQLite database file (created on first use)
+    """
+
+    def __init__(self, path=DEFAULT_METRICS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self):
+        # One short-lived connection per call, so any thread can use the store
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def record_run(self, report, input_key, run_at=None, source=None, report_file=None):
+        """
+        Append a report run and its per-client metrics
+
+        Args:
+            report: GrowthResult
+            input_key: Identity of the inputs + settings (e.g. both SHA-256s and
+                the settings); a run with the same key is not recorded twice
+            run_at: Run time (default now)
+            source: 'auto', 'manual', 'cli', ...
+            report_file: Generated workbook, for reference
+
+        Returns:
+            int or None: New run_id, None if this input_key was already recorded
+        """
+        stats = report.stats
+        run_at = (run_at or datetime.now()).isoformat(timespec='seconds')
+        clients = report.growth_comparison[list(CLIENT_COLUMNS)].rename(columns=CLIENT_COLUMNS)
+        # Rows without an ID cannot be tracked across runs; keep the first of any duplicates
+        clients = clients[clients['corporate_id'].notna()]
+        clients['corporate_id'] = clients['corporate_id'].map(_corporate_id)
+        clients = clients.drop_duplicates('corporate_id').sort_values('corporate_id')  # B-tree order
+        high_growth_ids = set(report.high_growth['CorporateID'].dropna().map(_corporate_id))
+        clients['high_growth'] = clients['corporate_id'].isin(high_growth_ids).astype(int)
+
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO runs (run_at, input_key, source, report_file, settings, total_clients,"
+                " high_growth_clients, exceptions, total_growth_usd, avg_growth_pct)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_at, input_key, source, str(report_file) if report_file else None,
+                    json.dumps(stats.get('settings', {}), sort_keys=True),
+                    stats.get('total_clients'), stats.get('high_growth_clients'), stats.get('exceptions'),
+                    float(stats.get('total_growth_usd') or 0), float(stats.get('avg_growth_pct') or 0),
+                ),
+            )
+            if cursor.rowcount == 0:
+                return None
+            run_id = cursor.lastrowid
+            columns = ['corporate_id', *list(CLIENT_COLUMNS.values())[1:], 'high_growth']
+            # Series.tolist() yields Python scalars sqlite3 can bind (SQLite stores NaN as NULL)
+            conn.executemany(
+                f"INSERT INTO client_metrics (run_id, {', '.join(columns)})"
+                f" VALUES (?, {', '.join('?' * len(columns))})",
+                zip(repeat(run_id), *(clients[column].tolist() for column in columns)),
+            )
+        print(f"[INFO] Recorded run {run_id} ({len(clients)} clients) in {self.path}")
+        return run_id
+
+    def runs(self, limit=24):
+        """Latest runs with their totals, oldest first (for trend charts)"""
+        with closing(self._connect()) as conn:
+            frame = pd.read_sql_query(
+                "SELECT * FROM (SELECT * FROM runs ORDER BY run_at DESC, run_id DESC LIMIT ?)"
+                " ORDER BY run_at, run_id",
+                conn, params=(limit,),
+            )
+        frame['run_at'] = pd.to_datetime(frame['run_at'])
+        return frame
+
+    def client_history(self, corporate_id, limit=12):
+        """One client's metrics over its latest runs, oldest first"""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT * FROM ("
+                " SELECT r.run_at, m.* FROM client_metrics m JOIN runs r USING (run_id)"
+                " WHERE m.corporate_id = ? ORDER BY r.run_at DESC, m.run_id DESC LIMIT ?"
+                ") ORDER BY run_at, run_id",
+                conn, params=(_corporate_id(corporate_id), limit), parse_dates=['run_at'],
+            )
+
+    def sparklines(self, corporate_ids, column='current_usd', runs=12):
+        """
+        {CorporateID: [values over the last `runs` runs, oldest first]}
+
+        Clients absent from a run get None for it, so every line has the same length.
+        """
+        if column not in CLIENT_COLUMNS.values():
+            raise ValueError(f"Unknown metric column {column!r}")
+        ids = [_corporate_id(corporate_id) for corporate_id in corporate_ids]
+        with closing(self._connect()) as conn:
+            run_ids = [row[0] for row in conn.execute(
+                "SELECT run_id FROM runs ORDER BY run_at DESC, run_id DESC LIMIT ?", (runs,)
+            )][::-1]
+            values = {}
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                query = (
+                    f"SELECT corporate_id, run_id, {column} FROM client_metrics"
+                    f" WHERE corporate_id IN ({', '.join('?' * len(chunk))})"
+                    f" AND run_id IN ({', '.join('?' * len(run_ids))})"
+                )
+                for corporate_id, run_id, value in conn.execute(query, (*chunk, *run_ids)):
+                    values[(corporate_id, run_id)] = value
+        return {corporate_id: [values.get((corporate_id, run_id)) for run_id in run_ids] for corporate_id in ids}
+
+    def latest_run_id(self):
+        """Run with the latest run_at (None if no runs)"""
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT {LATEST_RUN}").fetchone()[0]
+
+    def last_recorded_run_id(self):
+        """Most recently inserted run, backfills included (a cache key for the history)"""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+
+    def top_clients(self, limit=25, high_growth_only=True):
+        """Clients of the latest run by Growth % (High Growth clients only by default)"""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT corporate_id, company_name, user_name, previous_usd, current_usd, growth_usd, growth_pct"
+                f" FROM client_metrics WHERE run_id = {LATEST_RUN}"
+                + (" AND high_growth = 1" if high_growth_only else "")
+                + " ORDER BY growth_pct DESC LIMIT ?",
+                conn, params=(limit,),
+            )
+
+    def find_clients(self, text, limit=20):
+        """Clients of the latest run whose name or ID contains text"""
+        pattern = f"%{text.strip()}%"
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT corporate_id, company_name, current_usd FROM client_metrics"
+                f" WHERE run_id = {LATEST_RUN}"
+                " AND (company_name LIKE ? OR corporate_id LIKE ?)"
+                " ORDER BY current_usd DESC LIMIT ?",
+                conn, params=(pattern, pattern, limit),
+            )
+
+
+def load_report_workbook(path):
+    """GrowthResult from a previously generated workbook (for backfilling history)"""
+    from process_report import SHEET_EXCEPTIONS, SHEET_GROWTH_COMPARISON, SHEET_HIGH_GROWTH, GrowthResult
+    from report_config import is_high_growth_sheet
+
+    sheets = pd.read_excel(path, sheet_name=None)
+    growth_comparison = sheets[SHEET_GROWTH_COMPARISON]
+    # Named after the cut-offs it was built with
+    high_growth_name = next((name for name in sheets if is_high_growth_sheet(name)), SHEET_HIGH_GROWTH)
+    high_growth = sheets.get(high_growth_name, growth_comparison.iloc[0:0])
+    exceptions = sheets.get(SHEET_EXCEPTIONS, pd.DataFrame())
+    stats = {
+        'total_clients': len(growth_comparison),
+        'high_growth_clients': len(high_growth),
+        'exceptions': len(exceptions),
+        'total_growth_usd': growth_comparison['Growth_USD'].sum(),
+        'avg_growth_pct': growth_comparison['Growth_%'].mean(),
+    }
+    return GrowthResult(growth_comparison, high_growth, pd.DataFrame(), exceptions, stats,
+                        high_growth_sheet=high_growth_name)
+
+
+def backfill(store, report_dir):
+    """Record every Client_Growth_Report_<YYYYmmdd_HHMMSS>.xlsx in report_dir, oldest first"""
+    recorded = 0
+    for path in sorted(Path(report_dir).glob('Client_Growth_Report_*.xlsx')):
+        match = re.search(r'(\d{8}_\d{6})', path.name)
+        run_at = datetime.strptime(match.group(1), '%Y%m%d_%H%M%S') if match else None
+        try:
+            report = load_report_workbook(path)
+        except Exception as e:
+            print(f"[WARN] Skipping {path.name}: {e}")
+            continue
+        if store.record_run(report, f"backfill:{path.name}", run_at=run_at, source='backfill', report_file=path):
+            recorded += 1
+    return recorded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report metrics history")
+    parser.add_argument('--db', type=Path, default=DEFAULT_METRICS_DB)
+    parser.add_argument('--backfill', type=Path, metavar='DIR', help="Import generated report workbooks")
+    parser.add_argument('--client', help="Print the history of one CorporateID")
+    args = parser.parse_args()
+
+    store = MetricsStore(args.db)
+    if args.backfill:
+        print(f"Recorded {backfill(store, args.backfill)} report(s) from {args.backfill}")
+    if args.client:
+        print(store.client_history(args.client).to_string(index=False))
+    if not args.backfill and not args.client:
+        print(store.runs().to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
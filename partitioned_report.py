@@ -0,0 +1,510 @@
+"""
+Out-of-core, partitioned Client Growth Report computation
+Both RCB inputs are hash-partitioned by CorporateID into chunk files on disk,
+so rows that merge_rcb_frames would join always
+land in the same partition. Groups of partitions sized to the memory budget
+are then merged and measured in a process pool; each returns mergeable
+partial aggregates (counts and sums, from which the means follow) plus its
+per-client rows. The parent combines the partials into the Summary and
+stats and restores the full outer merge's row order, so the four sheets are
+the same as compute_growth_report's (the Growth % average can differ in the
+last floating-point digit, below the Summary's one decimal).
+
+Parquet and CSV inputs are streamed in row batches, so they are never held
+whole. An .xlsx input (cached or not) is still loaded whole by
+load_rcb_workbook, one input at a time, before it is partitioned. The
+full merged frame is never built; only the report's own sheet columns are
+held.
+
+Usage:
+    python -m report_cli --partitioned --memory-mb 256 --workers 4
+"""
+
+import contextlib
+import math
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from process_report import (
+    CLIENT_COLUMNS,
+    HIGH_GROWTH_MAX_PREVIOUS_USD,
+    HIGH_GROWTH_MIN_CURRENT_USD,
+    INR_TO_USD,
+    GrowthResult,
+    compute_growth_metrics,
+    exceptions_sheet,
+    growth_comparison_sheet,
+    high_growth_mask,
+    high_growth_sheet,
+    high_growth_sheet_name,
+    report_stats,
+    summary_sheet,
+)
+from rcb_loader import COLUMN_DTYPES, DEFAULT_READER_ENGINE, OPTIONAL_COLUMNS, REQUIRED_COLUMNS, load_rcb_workbook
+from report_profiling import StageTimer
+
+DEFAULT_PARTITION_MEMORY_MB = float(os.getenv('PARTITION_MEMORY_MB', '512'))
+DEFAULT_PARTITIONS = int(os.getenv('PARTITION_COUNT', '64'))
+DEFAULT_PARTITION_WORKERS = int(os.getenv('PARTITION_WORKERS', '0')) or os.cpu_count() or 1
+DEFAULT_PARTITION_DIR = os.getenv('PARTITION_DIR')  # None: system temp directory
+DEFAULT_BATCH_ROWS = 100_000
+SIZE_SAMPLE_ROWS = 2_000
+
+# Peak memory of compute_growth_metrics relative to its input frames (merge,
+# .copy()s and derived columns; ~1.1x measured with tracemalloc, doubled for
+# the pickled chunks and interpreter overhead), used to size partition groups
+WORKING_SET_FACTOR = 2
+
+# merged_clean columns a partition hands back: the sheets' and GrowthResult.clients'
+RESULT_COLUMNS = list(dict.fromkeys(CLIENT_COLUMNS + [
+    'Previous_12M_USD', 'Current_12M_USD', 'Growth_USD', 'Growth_%'
+]))
+EXCEPTION_COLUMNS = ['CorporateID', 'CorporateName_curr', 'Previous_12M_USD', 'Current_12M_USD']
+
+INPUT_COLUMNS = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+
+
+def _is_whole_number(value):
+    return isinstance(value, (int, np.integer)) or (isinstance(value, float) and value.is_integer())
+
+
+def partition_numbers(corporate_ids, partitions):
+    """
+    Partition number (0..partitions-1) for each CorporateID
+
+    IDs that are equal in a merge get the same number: whole numbers hash by
+    integer value whatever their dtype (100, 100.0 and an object-column 100
+    alike), other IDs by their text, and all missing IDs - which pandas joins
+    with each other - go to partition 0.
+    """
+    ids = pd.Series(corporate_ids).reset_index(drop=True)
+    present = ids.notna().to_numpy()
+    if pd.api.types.is_integer_dtype(ids) and present.all():
+        whole = present
+        integers = ids.to_numpy(dtype='int64')
+    elif pd.api.types.is_float_dtype(ids):
+        values = ids.to_numpy(dtype='float64')
+        whole = present & (values % 1 == 0)
+        integers = values[whole].astype('int64')
+    else:
+        objects = ids.to_numpy(dtype=object)
+        whole = present & np.fromiter(map(_is_whole_number, objects), dtype=bool, count=len(objects))
+        integers = np.array([int(value) for value in objects[whole]], dtype='int64')
+    other = present & ~whole
+
+    hashes = np.zeros(len(ids), dtype=np.uint64)
+    hashes[whole] = pd.util.hash_array(integers)
+    if other.any():
+        hashes[other] = pd.util.hash_array(ids[other].astype(str).to_numpy(dtype=object))
+    return (hashes % np.uint64(partitions)).astype(np.intp)
+
+
+def iter_source_batches(source, batch_rows=DEFAULT_BATCH_ROWS, cache=None,
+                        engine=DEFAULT_READER_ENGINE, load_info=None):
+    """
+    Yield one RCB input in row batches of the report columns
+
+    Args:
+        source: DataFrame; .parquet path (streamed by row group, e.g. a parsed-
+            frame cache entry); .csv path (streamed in chunks); or a workbook
+            path / in-memory workbook, which is parsed whole by load_rcb_workbook
+            (Excel cannot be read by row range) and released after partitioning
+        batch_rows: Rows per batch
+        cache: ParsedFrameCache for workbook sources
+        engine: Excel reader engine for workbook sources
+        load_info: Optional list; the source's load info dict is appended
+    """
+    if isinstance(source, pd.DataFrame):
+        info = {'file': 'DataFrame', 'rows': len(source)}
+        frame = source
+    else:
+        suffix = Path(source).suffix.lower() if isinstance(source, (str, os.PathLike)) else ''
+        info = {'file': Path(source).name if suffix else None}
+        if suffix == '.parquet':
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(source)
+            columns = [name for name in parquet.schema_arrow.names if name in INPUT_COLUMNS]
+            info['rows'] = parquet.metadata.num_rows
+            if load_info is not None:
+                load_info.append(info)
+            for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns):
+                yield batch.to_pandas()
+            return
+        if suffix == '.csv':
+            info['rows'] = 0
+            if load_info is not None:
+                load_info.append(info)
+            for chunk in pd.read_csv(source, usecols=lambda name: name in INPUT_COLUMNS,
+                                     dtype=COLUMN_DTYPES, chunksize=batch_rows):
+                info['rows'] += len(chunk)
+                yield chunk
+            return
+        frame, info = load_rcb_workbook(source, cache, engine)
+
+    if load_info is not None:
+        load_info.append(info)
+    columns = [column for column in frame.columns if column in INPUT_COLUMNS]
+    for start in range(0, max(len(frame), 1), batch_rows):
+        yield frame.iloc[start:start + batch_rows][columns]
+
+
+class PartitionWriter:
+    """
+    Hash-partition the row batches of one input into chunk files
+
+    Slices are buffered per partition and written as <side>-<partition>-<chunk>.pkl
+    (pickle keeps object columns exactly, e.g. mixed numeric/text IDs) whenever
+    the buffer passes flush_bytes. Row order within a partition is preserved.
+
+    Args:
+        directory: Work directory
+        side: '24m' or '12m'
+        partitions: Number of partitions
+        flush_bytes: Buffered bytes that trigger writing the chunk files
+    """
+
+    def __init__(self, directory, side, partitions, flush_bytes):
+        self.directory = Path(directory)
+        self.side = side
+        self.partitions = partitions
+        self.flush_bytes = flush_bytes
+        self.rows = np.zeros(partitions, dtype=np.int64)
+        self.bytes = np.zeros(partitions, dtype=np.int64)
+        self.columns = None
+        self._buffers = {}
+        self._buffered_bytes = 0
+        self._chunks = 0
+
+    def add(self, batch):
+        if self.columns is None:
+            missing = [column for column in REQUIRED_COLUMNS if column not in batch.columns]
+            if missing:
+                raise ValueError(f"The {self.side} input is missing required column(s): {', '.join(missing)}")
+            self.columns = list(batch.columns)
+            # Schema for partitions that receive no rows of this side
+            pd.to_pickle(batch.iloc[0:0], self.directory / f"{self.side}-schema.pkl")
+        if len(batch) == 0:
+            return
+        numbers = partition_numbers(batch['CorporateID'], self.partitions)
+        order = np.argsort(numbers, kind='stable')
+        bounds = np.searchsorted(numbers[order], np.arange(self.partitions + 1))
+        # Deep size of a sample; measuring every string of every batch costs seconds at 1M rows
+        sample = batch.iloc[:SIZE_SAMPLE_ROWS]
+        row_bytes = sample.memory_usage(index=False, deep=True).sum() / len(sample)
+
+        for partition in np.flatnonzero(np.diff(bounds)):
+            rows = order[bounds[partition]:bounds[partition + 1]]
+            self._buffers.setdefault(partition, []).append(batch.iloc[rows])
+            self.rows[partition] += len(rows)
+            self.bytes[partition] += int(len(rows) * row_bytes)
+            self._buffered_bytes += int(len(rows) * row_bytes)
+        if self._buffered_bytes >= self.flush_bytes:
+            self.flush()
+
+    def flush(self):
+        for partition, pieces in self._buffers.items():
+            path = self.directory / f"{self.side}-{partition:04d}-{self._chunks:04d}.pkl"
+            pd.to_pickle(pd.concat(pieces) if len(pieces) > 1 else pieces[0], path)
+        self._buffers = {}
+        self._buffered_bytes = 0
+        self._chunks += 1
+
+
+def read_partitions(directory, side, partitions):
+    """One input's rows for the given partitions, in input order within each partition"""
+    directory = Path(directory)
+    pieces = [
+        pd.read_pickle(path)
+        for partition in partitions
+        for path in sorted(directory.glob(f"{side}-{partition:04d}-*.pkl"))
+    ]
+    if not pieces:
+        return pd.read_pickle(directory / f"{side}-schema.pkl")
+    return pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+
+
+def plan_tasks(partition_bytes, budget_bytes, workers):
+    """
+    Group partitions into tasks whose estimated working set fits one worker's share
+
+    Args:
+        partition_bytes: Estimated input bytes per partition (both sides)
+        budget_bytes: Memory budget for all workers together
+        workers: Concurrent worker processes
+
+    Returns:
+        list: Lists of partition numbers, one per task
+    """
+    per_worker = budget_bytes / workers
+    tasks, current, current_bytes = [], [], 0
+    for partition, size in enumerate(partition_bytes):
+        need = int(size) * WORKING_SET_FACTOR
+        if current and current_bytes + need > per_worker:
+            tasks.append(current)
+            current, current_bytes = [], 0
+        current.append(partition)
+        current_bytes += need
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+def partial_aggregates(merged_clean, exceptions, max_previous_usd, min_current_usd):
+    """
+    Mergeable aggregates of one partition's rows
+
+    Returns:
+        dict: Counts, exact integer USD sums and the Growth % sum
+    """
+    return {
+        'clients': len(merged_clean),
+        'high_growth': int(high_growth_mask(merged_clean, max_previous_usd, min_current_usd).sum()),
+        'exceptions': len(exceptions),
+        'previous_usd': int(merged_clean['Previous_12M_USD'].sum()),
+        'current_usd': int(merged_clean['Current_12M_USD'].sum()),
+        'growth_usd': int(merged_clean['Growth_USD'].sum()),
+        'growth_pct': float(merged_clean['Growth_%'].sum()),
+    }
+
+
+def combine_partials(partials):
+    """
+    Combine partial_aggregates of all partitions
+
+    Returns:
+        dict: Counts plus growth_totals()-shaped totals
+    """
+    clients = sum(partial['clients'] for partial in partials)
+    return {
+        'clients': clients,
+        'high_growth': sum(partial['high_growth'] for partial in partials),
+        'exceptions': sum(partial['exceptions'] for partial in partials),
+        'totals': {
+            # Integer sums are exact; means are sum / count like Series.mean()
+            'avg_previous_usd': sum(partial['previous_usd'] for partial in partials) / clients if clients else math.nan,
+            'avg_current_usd': sum(partial['current_usd'] for partial in partials) / clients if clients else math.nan,
+            'total_growth_usd': sum(partial['growth_usd'] for partial in partials),
+            'avg_growth_pct': math.fsum(partial['growth_pct'] for partial in partials) / clients if clients else math.nan,
+        },
+    }
+
+
+def compute_partition_task(task):
+    """
+    Merge and measure one group of partitions (runs in a worker process)
+
+    Args:
+        task: dict with directory, task number, partitions, inr_to_usd and the
+            High Growth cut-offs
+
+    Returns:
+        dict: partial_aggregates plus the path of the pickled (rows, exceptions)
+    """
+    directory = Path(task['directory'])
+    # Per-partition [INFO] lines from the shared pipeline would repeat once per task
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        merged_clean, exceptions = compute_growth_metrics(
+            read_partitions(directory, '24m', task['partitions']),
+            read_partitions(directory, '12m', task['partitions']),
+            task['inr_to_usd'],
+        )
+    partial = partial_aggregates(
+        merged_clean, exceptions, task['max_previous_usd'], task['min_current_usd']
+    )
+    partial['result'] = str(directory / f"result-{task['task']:04d}.pkl")
+    columns = [column for column in RESULT_COLUMNS if column in merged_clean.columns]
+    pd.to_pickle((merged_clean[columns], exceptions[EXCEPTION_COLUMNS]), partial['result'])
+    return partial
+
+
+def _assemble(frames, positions, labels):
+    """
+    Rows `positions` of the concatenated frames, built one column at a time
+
+    Each column is dropped from the pieces once copied, so at most one
+    column is held twice.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return None
+    columns = {}
+    for column in list(frames[0].columns):
+        values = pd.concat([frame.pop(column) for frame in frames], ignore_index=True)
+        columns[column] = values.take(positions).set_axis(labels)
+    return pd.DataFrame(columns)
+
+
+def merge_order(rows, exception_rows):
+    """
+    Reassemble per-task (merged_clean, exceptions) in the order of one full outer merge
+
+    The full merge sorts by CorporateID and keeps input order within an ID;
+    all of an ID's rows share a task, so a stable ID sort over (task, position
+    in the task's merged frame) restores it. Both frames get their row labels
+    in the full merged frame, as derive_growth_metrics leaves them.
+
+    Returns:
+        tuple: (merged_clean, exceptions); None for a frame without rows
+    """
+    keys = []
+    offsets = [0, 0]
+    for task, frames in enumerate(zip(rows, exception_rows)):
+        for kind, frame in enumerate(frames):
+            keys.append(pd.DataFrame({
+                'CorporateID': frame['CorporateID'].to_numpy(),
+                'task': task,
+                'local': frame.index.to_numpy(),
+                'kind': kind,
+                'position': np.arange(offsets[kind], offsets[kind] + len(frame)),
+            }))
+            offsets[kind] += len(frame)
+    keys = pd.concat(keys, ignore_index=True).sort_values(['task', 'local'], kind='mergesort')
+    keys = keys.sort_values('CorporateID', kind='mergesort', na_position='last')
+    labels = np.arange(len(keys))
+
+    ordered = []
+    for kind, frames in enumerate((rows, exception_rows)):
+        selected = (keys['kind'] == kind).to_numpy()
+        ordered.append(_assemble(frames, keys['position'].to_numpy()[selected], labels[selected]))
+    return tuple(ordered)
+
+
+def compute_growth_report_partitioned(source_24m, source_12m, memory_mb=DEFAULT_PARTITION_MEMORY_MB,
+                                      workers=DEFAULT_PARTITION_WORKERS, partitions=DEFAULT_PARTITIONS,
+                                      work_dir=DEFAULT_PARTITION_DIR, batch_rows=DEFAULT_BATCH_ROWS,
+                                      cache=None, engine=DEFAULT_READER_ENGINE, timer=None,
+                                      inr_to_usd=INR_TO_USD,
+                                      high_growth_max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                                      high_growth_min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """
+    compute_growth_report for inputs larger than memory
+
+    Args:
+        source_24m: 24-month input (see iter_source_batches)
+        source_12m: 12-month input (see iter_source_batches)
+        memory_mb: Memory budget for partitioning buffers and all workers together
+        workers: Worker processes (1 computes in this process)
+        partitions: Hash partitions per input; raise it when one partition
+            alone exceeds a worker's share of the budget
+        work_dir: Parent directory for the temporary chunk files
+        batch_rows: Rows read per input batch
+        cache: ParsedFrameCache for workbook sources
+        engine: Excel reader engine for workbook sources
+        timer: Optional StageTimer; stage timings are added to stats['performance']
+        inr_to_usd: INR per USD exchange rate
+        high_growth_max_previous_usd: High Growth cut-off, Previous_12M_USD <= this
+        high_growth_min_current_usd: High Growth cut-off, Current_12M_USD >= this
+
+    Returns:
+        GrowthResult: Same sheets as compute_growth_report; stats['partitioned']
+            has the plan and stats['partitioned']['inputs'] the load info
+    """
+    timer = timer or StageTimer()
+    budget_bytes = int(memory_mb * 1024 * 1024)
+    load_info = []
+
+    with tempfile.TemporaryDirectory(prefix='growth-partitions-', dir=work_dir) as directory:
+        with timer.stage('partition'):
+            writers = {}
+            for side, source in (('24m', source_24m), ('12m', source_12m)):
+                writer = PartitionWriter(directory, side, partitions, budget_bytes // 4)
+                for batch in iter_source_batches(source, batch_rows, cache, engine, load_info):
+                    writer.add(batch)
+                writer.flush()
+                if writer.columns is None:
+                    raise ValueError(f"The {side} input has no rows")
+                writers[side] = writer
+            if 'URL' in writers['12m'].columns:
+                print("[INFO] URL column found in source data")
+            else:
+                print("[INFO] URL column not found in source data - will generate URLs from CorporateID")
+
+        partition_bytes = writers['24m'].bytes + writers['12m'].bytes
+        workers = max(int(workers), 1)
+        tasks = plan_tasks(partition_bytes, budget_bytes, workers)
+        largest_mb = partition_bytes.max() * WORKING_SET_FACTOR / 1024 / 1024
+        if largest_mb > memory_mb / workers:
+            print(f"[WARN] Largest partition needs ~{largest_mb:.0f} MB, over the {memory_mb / workers:.0f} MB "
+                  f"per-worker budget - raise partitions (now {partitions})")
+        print(f"[INFO] {partitions} partitions in {len(tasks)} task(s) on {min(workers, len(tasks))} "
+              f"worker(s), {memory_mb:.0f} MB budget")
+
+        specs = [{
+            'directory': directory, 'task': number, 'partitions': task, 'inr_to_usd': inr_to_usd,
+            'max_previous_usd': high_growth_max_previous_usd, 'min_current_usd': high_growth_min_current_usd,
+        } for number, task in enumerate(tasks)]
+        with timer.stage('partition_metrics'):
+            if workers > 1 and len(specs) > 1:
+                # spawn: forking a threaded process (e.g. the Streamlit server) can deadlock
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(min(workers, len(specs)), mp_context=context) as pool:
+                    partials = list(pool.map(compute_partition_task, specs))
+            else:
+                partials = [compute_partition_task(spec) for spec in specs]
+
+        with timer.stage('combine'):
+            combined = combine_partials(partials)
+            rows, exception_rows = [], []
+            for partial in partials:
+                partition_rows, partition_exceptions = pd.read_pickle(partial['result'])
+                rows.append(partition_rows)
+                exception_rows.append(partition_exceptions)
+            try:
+                merged_clean, exceptions = merge_order(rows, exception_rows)
+            except TypeError as e:
+                # IDs of mixed types cannot be ordered like the merge does - rebuild in memory
+                print(f"[WARN] Partition results could not be ordered ({e}) - in-memory recompute")
+                all_partitions = range(partitions)
+                merged_clean, exceptions = compute_growth_metrics(
+                    read_partitions(directory, '24m', all_partitions),
+                    read_partitions(directory, '12m', all_partitions),
+                    inr_to_usd,
+                )
+            del rows, exception_rows
+            if merged_clean is None:
+                merged_clean = pd.DataFrame(columns=RESULT_COLUMNS)
+            if exceptions is None:
+                exceptions = pd.DataFrame(columns=EXCEPTION_COLUMNS)
+
+    with timer.stage('filter'):
+        growth_comparison = growth_comparison_sheet(merged_clean)
+        high_growth = high_growth_sheet(merged_clean[high_growth_mask(
+            merged_clean, high_growth_max_previous_usd, high_growth_min_current_usd
+        )])
+        # Biggest mover: first row, so Growth_USD ties resolve exactly as in build_growth_result
+        top_client = growth_comparison.iloc[0] if len(growth_comparison) > 0 else None
+
+        summary = summary_sheet(
+            top_client, combined['clients'], combined['high_growth'], combined['exceptions'],
+            combined['totals'], high_growth_max_previous_usd, high_growth_min_current_usd
+        )
+        stats = report_stats(
+            top_client, combined['clients'], combined['high_growth'], combined['exceptions'], combined['totals']
+        )
+        clients = merged_clean[[column for column in CLIENT_COLUMNS if column in merged_clean.columns]]
+        result = GrowthResult(growth_comparison, high_growth, summary, exceptions_sheet(exceptions), stats,
+                              clients.reset_index(drop=True),
+                              high_growth_sheet_name(high_growth_max_previous_usd, high_growth_min_current_usd))
+
+    result.stats['settings'] = {
+        'inr_to_usd': inr_to_usd,
+        'high_growth_max_previous_usd': high_growth_max_previous_usd,
+        'high_growth_min_current_usd': high_growth_min_current_usd,
+    }
+    result.stats['partitioned'] = {
+        'partitions': partitions,
+        'tasks': len(tasks),
+        'workers': min(workers, len(tasks)),
+        'memory_mb': memory_mb,
+        'largest_partition_mb': round(largest_mb, 1),
+        'inputs': load_info,
+    }
+    result.stats['performance'] = timer.report()
+    return result
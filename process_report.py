@@ -3,26 +3,82 @@ Report processing logic extracted for dashboard use
 FIXED: High Growth filter now correctly identifies clients with Previous <= $5K AND Current >= $50K
 """
 
-import pandas as pd
+from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from report_config import (  # noqa: F401 - re-exported for existing importers
+    HIGH_GROWTH_MAX_PREVIOUS_USD,
+    HIGH_GROWTH_MIN_CURRENT_USD,
+    INR_TO_USD,
+    SHEET_EXCEPTIONS,
+    SHEET_GROWTH_COMPARISON,
+    SHEET_HIGH_GROWTH,
+    SHEET_SUMMARY,
+    high_growth_sheet_name,
+    usd_label,
+)
+from report_profiling import StageTimer
+from report_writers import (
+    DEFAULT_XLSX_WRITER,
+    write_report_csv,
+    write_report_json,
+    write_report_parquet,
+    write_report_xlsx,
+)
+
+
+CORPORATE_URL_PREFIX = "https://rms2.koenig-solutions.com/corporate/"
+
+# merged_clean columns kept on GrowthResult.clients so High Growth can be
+# re-filtered at other thresholds/FX rates without re-merging the inputs
+CLIENT_COLUMNS = [
+    'CorporateID', 'CorporateName_curr', 'UserName', 'URL_curr',
+    'Previous_12M_Revenue', '12_Month_Revenue'
+]
+
 
-def process_growth_report(df_24m, df_12m, output_file):
+def _growth_percentage(growth_usd, previous_usd):
     """
-    Process growth report from 24-month and 12-month data
+    Division-by-zero-safe growth percentage (0 where previous revenue is 0)
+    """
+    growth = growth_usd.to_numpy(dtype='float64')
+    previous = previous_usd.to_numpy(dtype='float64')
+    ratio = np.divide(growth, previous, out=np.zeros_like(growth), where=previous != 0)
+    return pd.Series(ratio * 100, index=growth_usd.index)
+
+
+def _corporate_urls(corporate_ids, existing_urls=None):
+    """
+    Build client URLs column-wise: keep non-blank existing URLs, otherwise
+    generate one from CorporateID (blank when the ID itself is missing)
+    """
+    id_text = corporate_ids.astype(str)
+    has_id = corporate_ids.notna() & (id_text.str.strip() != '')
+    generated = (CORPORATE_URL_PREFIX + id_text).where(has_id, '')
+
+    if existing_urls is None:
+        return generated
+
+    has_url = existing_urls.notna() & (existing_urls.astype(str).str.strip() != '')
+    return existing_urls.where(has_url, generated)
+
+
+def merge_rcb_frames(df_24m, df_12m):
+    """
+    Outer-merge the 24-month and 12-month exports on CorporateID
     
     Args:
         df_24m: DataFrame with 24-month data
         df_12m: DataFrame with 12-month data
-        output_file: Path to output Excel file
     
     Returns:
-        dict: Report statistics
+        DataFrame: One row per CorporateID with *_prev / *_curr columns and
+        missing revenue filled with 0
     """
     
-    # Configuration
-    INR_TO_USD = 84
-    
     # Prepare 24-month data
     df_24m_prep = df_24m[[
         'CorporateID', 'CorporateName', 'UserName', 'TotalNR1'
@@ -52,36 +108,44 @@ def process_growth_report(df_24m, df_12m, output_file):
     merged = pd.merge(df_24m_prep, df_12m_prep, on='CorporateID', how='outer')
     
     # Fill missing values
-    merged['24_Month_Revenue'].fillna(0, inplace=True)
-    merged['12_Month_Revenue'].fillna(0, inplace=True)
+    merged['24_Month_Revenue'] = merged['24_Month_Revenue'].fillna(0)
+    merged['12_Month_Revenue'] = merged['12_Month_Revenue'].fillna(0)
+    
+    return merged
+
+
+def derive_growth_metrics(merged, inr_to_usd=INR_TO_USD):
+    """
+    Compute USD revenue, growth metrics and URLs on a merged frame
+    
+    Args:
+        merged: Output of merge_rcb_frames
+        inr_to_usd: INR per USD exchange rate
+    
+    Returns:
+        tuple: (merged_clean, exceptions) DataFrames
+    """
     
     # Calculate Previous 12M Revenue
     merged['Previous_12M_Revenue'] = merged['24_Month_Revenue'] - merged['12_Month_Revenue']
     
     # Convert to USD
-    merged['Previous_12M_USD'] = merged['Previous_12M_Revenue'] / INR_TO_USD
-    merged['Current_12M_USD'] = merged['12_Month_Revenue'] / INR_TO_USD
+    merged['Previous_12M_USD'] = merged['Previous_12M_Revenue'] / inr_to_usd
+    merged['Current_12M_USD'] = merged['12_Month_Revenue'] / inr_to_usd
     
-    # Identify exceptions (negative values)
-    exceptions = merged[
-        (merged['Previous_12M_USD'] < 0) | 
-        (merged['Current_12M_USD'] < 0)
-    ].copy()
+    # Identify exceptions (negative values) and clean data (remove exceptions)
+    exception_mask = (merged['Previous_12M_USD'] < 0) | (merged['Current_12M_USD'] < 0)
+    clean_mask = (merged['Previous_12M_USD'] >= 0) & (merged['Current_12M_USD'] >= 0)
     
-    # Clean data (remove exceptions)
-    merged_clean = merged[
-        (merged['Previous_12M_USD'] >= 0) & 
-        (merged['Current_12M_USD'] >= 0)
-    ].copy()
+    exceptions = merged[exception_mask].copy()
+    merged_clean = merged[clean_mask].copy()
     
     # Calculate growth metrics
     merged_clean['Growth_USD'] = merged_clean['Current_12M_USD'] - merged_clean['Previous_12M_USD']
     
     # Handle division by zero for growth percentage
-    merged_clean['Growth_%'] = merged_clean.apply(
-        lambda row: (row['Growth_USD'] / row['Previous_12M_USD'] * 100) 
-        if row['Previous_12M_USD'] != 0 else 0, 
-        axis=1
+    merged_clean['Growth_%'] = _growth_percentage(
+        merged_clean['Growth_USD'], merged_clean['Previous_12M_USD']
     )
     
     # Populate UserName (prioritize current, fallback to previous)
@@ -97,51 +161,154 @@ def process_growth_report(df_24m, df_12m, output_file):
     # Check if URL column exists, if not create one from CorporateID
     if 'URL_curr' not in merged_clean.columns:
         # Generate URL from CorporateID pattern: https://rms2.koenig-solutions.com/corporate/{CorporateID}
-        merged_clean['URL_curr'] = merged_clean['CorporateID'].apply(
-            lambda cid: f"https://rms2.koenig-solutions.com/corporate/{cid}" if pd.notna(cid) and str(cid).strip() != '' else ''
-        )
+        merged_clean['URL_curr'] = _corporate_urls(merged_clean['CorporateID'])
         print("[INFO] URL column not found in source data, generated URLs from CorporateID pattern")
     else:
         # URL exists, but fill any blanks with generated URLs
-        merged_clean['URL_curr'] = merged_clean.apply(
-            lambda row: row['URL_curr'] if pd.notna(row['URL_curr']) and str(row['URL_curr']).strip() != '' 
-            else f"https://rms2.koenig-solutions.com/corporate/{row['CorporateID']}" if pd.notna(row['CorporateID']) and str(row['CorporateID']).strip() != '' 
-            else '',
-            axis=1
+        merged_clean['URL_curr'] = _corporate_urls(
+            merged_clean['CorporateID'], merged_clean['URL_curr']
         )
         print("[INFO] URL column found, filled missing URLs with generated pattern")
     
-    # Select and rename columns for Growth Comparison sheet
-    growth_comparison = merged_clean[[
-        'CorporateID', 'CorporateName_curr', 'UserName', 'URL_curr',
-        'Previous_12M_USD', 'Current_12M_USD', 'Growth_USD', 'Growth_%'
-    ]].copy()
+    return merged_clean, exceptions
+
+
+def compute_growth_metrics(df_24m, df_12m, inr_to_usd=INR_TO_USD):
+    """
+    Merge 24-month and 12-month data and compute per-client growth metrics
     
-    growth_comparison.columns = [
-        'CorporateID', 'CompanyName', 'UserName', 'URL',
-        'Previous_12M_USD', 'Current_12M_USD', 'Growth_USD', 'Growth_%'
-    ]
+    Args:
+        df_24m: DataFrame with 24-month data
+        df_12m: DataFrame with 12-month data
+        inr_to_usd: INR per USD exchange rate
     
-    # Sort by Growth_USD descending
-    growth_comparison.sort_values('Growth_USD', ascending=False, inplace=True)
-    growth_comparison.reset_index(drop=True, inplace=True)
+    Returns:
+        tuple: (merged_clean, exceptions) DataFrames
+    """
+    return derive_growth_metrics(merge_rcb_frames(df_24m, df_12m), inr_to_usd)
+
+
+@dataclass
+class GrowthResult:
+    """
+    Computed Client Growth Report, independent of any output format
+    
+    Frames are the exact sheet contents; render with to_xlsx / to_csv /
+    to_parquet / to_json, optionally restricted to a subset of sheets.
+    `clients` holds the per-client INR revenue (CLIENT_COLUMNS) behind the
+    sheets, for what-if re-filtering (see high_growth_index).
+    `high_growth_sheet` names the High Growth sheet after its cut-offs;
+    SHEET_HIGH_GROWTH also selects it in sheets().
+    """
+    growth_comparison: pd.DataFrame
+    high_growth: pd.DataFrame
+    summary: pd.DataFrame
+    exceptions: pd.DataFrame
+    stats: dict = field(default_factory=dict)
+    clients: pd.DataFrame = None
+    high_growth_sheet: str = SHEET_HIGH_GROWTH
+    
+    def sheets(self, names=None):
+        """Sheet name -> DataFrame in workbook order, optionally only the given names"""
+        all_sheets = {
+            SHEET_GROWTH_COMPARISON: self.growth_comparison,
+            self.high_growth_sheet: self.high_growth,
+            SHEET_SUMMARY: self.summary,
+            SHEET_EXCEPTIONS: self.exceptions,
+        }
+        if names is None:
+            return all_sheets
+        names = [self.high_growth_sheet if name == SHEET_HIGH_GROWTH else name for name in names]
+        unknown = [name for name in names if name not in all_sheets]
+        if unknown:
+            raise ValueError(f"Unknown sheet(s): {', '.join(unknown)}")
+        return {name: frame for name, frame in all_sheets.items() if name in names}
+    
+    def to_xlsx(self, output_file, sheets=None, writer=DEFAULT_XLSX_WRITER):
+        write_report_xlsx(self.sheets(sheets), output_file, writer=writer)
+        return output_file
+    
+    def to_csv(self, output_dir, sheets=None):
+        return write_report_csv(self.sheets(sheets), output_dir)
+    
+    def to_parquet(self, output_dir, sheets=None):
+        return write_report_parquet(self.sheets(sheets), output_dir)
+    
+    def to_json(self, output_file=None, sheets=None):
+        return write_report_json(self.sheets(sheets), self.stats, output_file)
+
+
+def compute_growth_report(df_24m, df_12m, snapshot_path=None, verify_incremental=False,
+                          timer=None, inr_to_usd=INR_TO_USD,
+                          high_growth_max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                          high_growth_min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """
+    Compute all report sheets and statistics without writing any file
     
-    # FIXED: Create High Growth sheet BEFORE any sorting/formatting
-    # Filter on raw numeric values from merged_clean
-    print("\n[DEBUG] Creating High Growth filter...")
-    print(f"Total clean clients: {len(merged_clean)}")
+    Args:
+        df_24m: DataFrame with 24-month data
+        df_12m: DataFrame with 12-month data
+        snapshot_path: Optional previous-run snapshot; only changed/added
+            CorporateIDs are recomputed and the snapshot is updated
+        verify_incremental: Compare the incremental result with a full recompute
+        timer: Optional StageTimer; stage timings are added to stats['performance']
+        inr_to_usd: INR per USD exchange rate
+        high_growth_max_previous_usd: High Growth cut-off, Previous_12M_USD <= this
+        high_growth_min_current_usd: High Growth cut-off, Current_12M_USD >= this
     
-    # Apply filter on merged_clean with raw numeric values
-    high_growth_mask = (
-        (merged_clean['Previous_12M_USD'] <= 5000) & 
-        (merged_clean['Current_12M_USD'] >= 50000)
-    )
+    Returns:
+        GrowthResult: Sheet frames plus report statistics
+    """
     
-    high_growth_data = merged_clean[high_growth_mask].copy()
+    timer = timer or StageTimer()
     
-    print(f"[DEBUG] High Growth clients found: {len(high_growth_data)}")
+    incremental_stats = None
+    if snapshot_path is not None:
+        from growth_snapshot import incremental_growth_metrics
+        with timer.stage('incremental_metrics'):
+            merged_clean, exceptions, incremental_stats = incremental_growth_metrics(
+                df_24m, df_12m, snapshot_path, inr_to_usd, verify=verify_incremental
+            )
+    else:
+        with timer.stage('merge'):
+            merged = merge_rcb_frames(df_24m, df_12m)
+        with timer.stage('metrics'):
+            merged_clean, exceptions = derive_growth_metrics(merged, inr_to_usd)
+    
+    with timer.stage('filter'):
+        result = build_growth_result(
+            merged_clean, exceptions, high_growth_max_previous_usd, high_growth_min_current_usd
+        )
+    result.stats['settings'] = {
+        'inr_to_usd': inr_to_usd,
+        'high_growth_max_previous_usd': high_growth_max_previous_usd,
+        'high_growth_min_current_usd': high_growth_min_current_usd,
+    }
+    if incremental_stats is not None:
+        result.stats['incremental'] = incremental_stats
+    result.stats['performance'] = timer.report()
+    return result
+
+
+def high_growth_mask(merged_clean, max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                     min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """Clients with Previous_12M_USD <= max_previous_usd and Current_12M_USD >= min_current_usd"""
+    return (
+        (merged_clean['Previous_12M_USD'] <= max_previous_usd) & 
+        (merged_clean['Current_12M_USD'] >= min_current_usd)
+    )
+
+
+def high_growth_sheet(high_growth_data):
+    """
+    High Growth sheet from the merged_clean rows that passed the filter
     
-    # Create High Growth report from filtered data
+    Args:
+        high_growth_data: merged_clean rows (in merged_clean order)
+    
+    Returns:
+        DataFrame: Sheet columns, sorted by Growth_% descending
+    """
     high_growth = pd.DataFrame()
     high_growth['CorporateID'] = high_growth_data['CorporateID']
     high_growth['CompanyName'] = high_growth_data['CorporateName_curr']
@@ -155,17 +322,74 @@ def process_growth_report(df_24m, df_12m, output_file):
     # Sort High Growth by Growth_% descending
     high_growth.sort_values('Growth_%', ascending=False, inplace=True)
     high_growth.reset_index(drop=True, inplace=True)
+    return high_growth
+
+
+def growth_comparison_sheet(merged_clean):
+    """Growth Comparison sheet: sheet columns sorted by Growth_USD descending"""
+    growth_comparison = merged_clean[[
+        'CorporateID', 'CorporateName_curr', 'UserName', 'URL_curr',
+        'Previous_12M_USD', 'Current_12M_USD', 'Growth_USD', 'Growth_%'
+    ]].copy()
     
-    # Debug output - show first few high growth clients
-    if len(high_growth) > 0:
-        print("\n[DEBUG] First 5 High Growth clients:")
-        for idx, row in high_growth.head(5).iterrows():
-            print(f"  {row['CompanyName']:40s} Prev: ${row['Previous_12M_USD']:>10,.2f}  Curr: ${row['Current_12M_USD']:>10,.2f}")
+    growth_comparison.columns = [
+        'CorporateID', 'CompanyName', 'UserName', 'URL',
+        'Previous_12M_USD', 'Current_12M_USD', 'Growth_USD', 'Growth_%'
+    ]
     
-    # Create Summary sheet
-    # Get top client (biggest mover by Growth_USD) - FIRST row
-    top_client = growth_comparison.iloc[0] if len(growth_comparison) > 0 else None
+    # Sort by Growth_USD descending
+    growth_comparison.sort_values('Growth_USD', ascending=False, inplace=True)
+    growth_comparison.reset_index(drop=True, inplace=True)
+    return growth_comparison
+
+
+def exceptions_sheet(exceptions):
+    """Exceptions sheet from the exception rows of derive_growth_metrics"""
+    if len(exceptions) > 0:
+        exceptions_output = exceptions[[
+            'CorporateID', 'CorporateName_curr',
+            'Previous_12M_USD', 'Current_12M_USD'
+        ]].copy()
+        exceptions_output.columns = [
+            'CorporateID', 'CompanyName',
+            'Previous_12M_USD', 'Current_12M_USD'
+        ]
+    else:
+        exceptions_output = pd.DataFrame(columns=[
+            'CorporateID', 'CompanyName',
+            'Previous_12M_USD', 'Current_12M_USD'
+        ])
+    return exceptions_output
+
+
+def growth_totals(growth_comparison):
+    """Overall statistics of the Growth Comparison sheet shown in the Summary"""
+    return {
+        'avg_previous_usd': growth_comparison['Previous_12M_USD'].mean(),
+        'avg_current_usd': growth_comparison['Current_12M_USD'].mean(),
+        'total_growth_usd': growth_comparison['Growth_USD'].sum(),
+        'avg_growth_pct': growth_comparison['Growth_%'].mean(),
+    }
+
+
+def summary_sheet(top_client, total_clients, high_growth_clients, exceptions, totals,
+                  high_growth_max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                  high_growth_min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """
+    Summary sheet
     
+    Args:
+        top_client: First Growth Comparison row (biggest mover), or None
+        total_clients: Growth Comparison row count
+        high_growth_clients: High Growth row count
+        exceptions: Exception row count
+        totals: growth_totals() of the Growth Comparison sheet
+        high_growth_max_previous_usd: High Growth cut-off shown in the label
+        high_growth_min_current_usd: High Growth cut-off shown in the label
+    
+    Returns:
+        DataFrame: Metric / Value rows
+    """
     summary_data = {
         'Metric': [
             '🏆 TOP PERFORMER - BIGGEST MOVER',
@@ -180,7 +404,8 @@ def process_growth_report(df_24m, df_12m, output_file):
             '',  # Empty row for spacing
             '📊 OVERALL STATISTICS',
             'Total Clients Analyzed',
-            'High Growth Clients (Prev ≤$5K, Curr ≥$50K)',
+            f'High Growth Clients (Prev ≤{usd_label(high_growth_max_previous_usd)}, '
+            f'Curr ≥{usd_label(high_growth_min_current_usd)})',
             'Average Previous 12M Revenue (USD)',
             'Average Current 12M Revenue (USD)',
             'Total Growth (USD)',
@@ -201,99 +426,139 @@ def process_growth_report(df_24m, df_12m, output_file):
             top_client['URL'] if top_client is not None else 'N/A',
             '',  # Empty row
             '',  # Empty cell next to header
-            len(growth_comparison),
-            len(high_growth),
-            f"${int(growth_comparison['Previous_12M_USD'].mean()):,}",
-            f"${int(growth_comparison['Current_12M_USD'].mean()):,}",
-            f"${int(growth_comparison['Growth_USD'].sum()):,}",
-            f"{growth_comparison['Growth_%'].mean():.1f}%",
-            len(exceptions),
+            total_clients,
+            high_growth_clients,
+            f"${int(totals['avg_previous_usd']):,}",
+            f"${int(totals['avg_current_usd']):,}",
+            f"${int(totals['total_growth_usd']):,}",
+            f"{totals['avg_growth_pct']:.1f}%",
+            exceptions,
             '',  # Empty row
             datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         ]
     }
-    summary = pd.DataFrame(summary_data)
+    return pd.DataFrame(summary_data)
+
+
+def report_stats(top_client, total_clients, high_growth_clients, exceptions, totals):
+    """GrowthResult.stats for the same inputs as summary_sheet"""
+    return {
+        'total_clients': total_clients,
+        'high_growth_clients': high_growth_clients,
+        'exceptions': exceptions,
+        'total_growth_usd': totals['total_growth_usd'],
+        'avg_growth_pct': totals['avg_growth_pct'],
+        'top_performer': top_client['CompanyName'] if top_client is not None else 'N/A',
+        'top_performer_growth': top_client['Growth_USD'] if top_client is not None else 0
+    }
+
+
+def build_growth_result(merged_clean, exceptions,
+                        high_growth_max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                        high_growth_min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """
+    Build the report sheets (sorting, High Growth filter, Summary) and stats
     
-    # Prepare Exceptions sheet
-    if len(exceptions) > 0:
-        exceptions_output = exceptions[[
-            'CorporateID', 'CorporateName_curr',
-            'Previous_12M_USD', 'Current_12M_USD'
-        ]].copy()
-        exceptions_output.columns = [
-            'CorporateID', 'CompanyName',
-            'Previous_12M_USD', 'Current_12M_USD'
-        ]
-    else:
-        exceptions_output = pd.DataFrame(columns=[
-            'CorporateID', 'CompanyName',
-            'Previous_12M_USD', 'Current_12M_USD'
-        ])
+    Args:
+        merged_clean: Per-client metrics from compute_growth_metrics
+        exceptions: Exception rows from compute_growth_metrics
+        high_growth_max_previous_usd: High Growth cut-off, Previous_12M_USD <= this
+        high_growth_min_current_usd: High Growth cut-off, Current_12M_USD >= this
+    
+    Returns:
+        GrowthResult: Sheet frames plus report statistics
+    """
+    
+    growth_comparison = growth_comparison_sheet(merged_clean)
+    
+    # FIXED: Create High Growth sheet BEFORE any sorting/formatting
+    # Filter on raw numeric values from merged_clean
+    print("\n[DEBUG] Creating High Growth filter...")
+    print(f"Total clean clients: {len(merged_clean)}")
+    
+    # Apply filter on merged_clean with raw numeric values
+    mask = high_growth_mask(merged_clean, high_growth_max_previous_usd, high_growth_min_current_usd)
+    
+    high_growth_data = merged_clean[mask].copy()
+    
+    print(f"[DEBUG] High Growth clients found: {len(high_growth_data)}")
+    
+    # Create High Growth report from filtered data
+    high_growth = high_growth_sheet(high_growth_data)
+    
+    # Debug output - show first few high growth clients
+    if len(high_growth) > 0:
+        print("\n[DEBUG] First 5 High Growth clients:")
+        for idx, row in high_growth.head(5).iterrows():
+            print(f"  {row['CompanyName']:40s} Prev: ${row['Previous_12M_USD']:>10,.2f}  Curr: ${row['Current_12M_USD']:>10,.2f}")
+    
+    # Get top client (biggest mover by Growth_USD) - FIRST row
+    top_client = growth_comparison.iloc[0] if len(growth_comparison) > 0 else None
+    totals = growth_totals(growth_comparison)
+    
+    summary = summary_sheet(
+        top_client, len(growth_comparison), len(high_growth), len(exceptions), totals,
+        high_growth_max_previous_usd, high_growth_min_current_usd
+    )
+    exceptions_output = exceptions_sheet(exceptions)
+    stats = report_stats(top_client, len(growth_comparison), len(high_growth), len(exceptions), totals)
+    
+    clients = merged_clean[[column for column in CLIENT_COLUMNS if column in merged_clean.columns]]
+    return GrowthResult(growth_comparison, high_growth, summary, exceptions_output, stats,
+                        clients.reset_index(drop=True),
+                        high_growth_sheet_name(high_growth_max_previous_usd, high_growth_min_current_usd))
+
+
+def process_growth_report(df_24m, df_12m, output_file, writer=DEFAULT_XLSX_WRITER,
+                          snapshot_path=None, verify_incremental=False, timer=None,
+                          return_result=False, inr_to_usd=INR_TO_USD,
+                          high_growth_max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                          high_growth_min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """
+    Process growth report from 24-month and 12-month data
+    
+    Args:
+        df_24m: DataFrame with 24-month data
+        df_12m: DataFrame with 12-month data
+        output_file: Path to output Excel file
+        writer: Excel backend - 'openpyxl' or 'xlsxwriter' (streaming, constant memory)
+        snapshot_path: Optional previous-run snapshot for incremental recompute
+        verify_incremental: Compare the incremental result with a full recompute
+        timer: Optional StageTimer (pass one with profile/trace_memory enabled
+            to capture cProfile output and per-stage peak memory)
+        return_result: Return the GrowthResult (sheet frames plus stats)
+            instead of only the stats, e.g. for the dashboard's report explorer
+        inr_to_usd: INR per USD exchange rate
+        high_growth_max_previous_usd: High Growth cut-off, Previous_12M_USD <= this
+        high_growth_min_current_usd: High Growth cut-off, Current_12M_USD >= this
+    
+    Returns:
+        dict: Report statistics, including per-stage timings under 'performance'
+            (GrowthResult when return_result is set)
+    """
+    timer = timer or StageTimer()
+    result = compute_growth_report(
+        df_24m, df_12m, snapshot_path, verify_incremental, timer, inr_to_usd,
+        high_growth_max_previous_usd, high_growth_min_current_usd
+    )
     
     # Write to Excel with multiple sheets
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        growth_comparison.to_excel(writer, sheet_name='Growth Comparison', index=False)
-        high_growth.to_excel(writer, sheet_name='High Growth 5K-50K USD', index=False)
-        summary.to_excel(writer, sheet_name='Summary', index=False)
-        exceptions_output.to_excel(writer, sheet_name='Exceptions', index=False)
-        
-        # Format Summary sheet to highlight top performer
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        
-        workbook = writer.book
-        summary_sheet = workbook['Summary']
-        
-        # Make column A wider for metric names
-        summary_sheet.column_dimensions['A'].width = 40
-        summary_sheet.column_dimensions['B'].width = 50
-        
-        # TOP PERFORMER is now at row 2 (after header row 1)
-        # Row 1: Header (auto-generated by pandas)
-        # Row 2: TOP PERFORMER header
-        # Rows 3-10: Top performer details
-        
-        # Highlight TOP PERFORMER header (row 2)
-        for cell in summary_sheet[2]:
-            cell.fill = PatternFill(start_color='FFD700', end_color='FFD700', fill_type='solid')
-            cell.font = Font(bold=True, size=14, color='000000')
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Highlight top performer details (rows 3-10) with light blue
-        for row_idx in range(3, 11):  # Rows 3-10
-            for cell in summary_sheet[row_idx]:
-                cell.fill = PatternFill(start_color='E3F2FD', end_color='E3F2FD', fill_type='solid')
-                cell.font = Font(size=11)
-                # Make metric names in column A bold
-                if cell.column == 1:
-                    cell.font = Font(bold=True, size=11)
-        
-        # Find and highlight OVERALL STATISTICS header
-        for row_idx in range(1, summary_sheet.max_row + 1):
-            cell_value = str(summary_sheet.cell(row_idx, 1).value) if summary_sheet.cell(row_idx, 1).value else ''
-            if 'OVERALL STATISTICS' in cell_value or '📊' in cell_value:
-                # Highlight this header row with light green
-                for cell in summary_sheet[row_idx]:
-                    cell.fill = PatternFill(start_color='C8E6C9', end_color='C8E6C9', fill_type='solid')
-                    cell.font = Font(bold=True, size=12, color='000000')
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                break
+    with timer.stage('excel_write'):
+        result.to_xlsx(output_file, writer=writer)
+    result.stats['performance'] = timer.report()
+    
+    growth_comparison = result.growth_comparison
+    top_client = growth_comparison.iloc[0] if len(growth_comparison) > 0 else None
     
     print(f"\n[SUCCESS] Report saved to: {output_file}")
     print(f"  - Growth Comparison: {len(growth_comparison)} clients")
-    print(f"  - High Growth: {len(high_growth)} clients")
-    print(f"  - Exceptions: {len(exceptions)} clients")
+    print(f"  - High Growth: {len(result.high_growth)} clients")
+    print(f"  - Exceptions: {len(result.exceptions)} clients")
     if top_client is not None:
         print(f"\n[TOP PERFORMER] {top_client['CompanyName']}")
         print(f"  - Growth: ${top_client['Growth_USD']:,.0f} ({top_client['Growth_%']:.1f}%)")
         print(f"  - From: ${top_client['Previous_12M_USD']:,.0f} to ${top_client['Current_12M_USD']:,.0f}")
+    print(f"\n[TIMING] {timer.summary_line()}")
     
     # Return statistics
-    return {
-        'total_clients': len(growth_comparison),
-        'high_growth_clients': len(high_growth),
-        'exceptions': len(exceptions),
-        'total_growth_usd': growth_comparison['Growth_USD'].sum(),
-        'avg_growth_pct': growth_comparison['Growth_%'].mean(),
-        'top_performer': top_client['CompanyName'] if top_client is not None else 'N/A',
-        'top_performer_growth': top_client['Growth_USD'] if top_client is not None else 0
-    }
+    return result if return_result else result.stats
@@ -0,0 +1,338 @@
+"""
+RCB workbook loading with pluggable reader engines and a content-addressed cache
+Only the report columns are read, with declared dtypes, using the fastest
+installed engine (calamine > openpyxl read-only streaming > pandas/openpyxl).
+Parsed frames are stored as Parquet keyed by the SHA-256 of the source
+workbook bytes, so re-generating a report from an unchanged export skips
+Excel parsing entirely. Sources can be paths or in-memory workbooks
+(bytes, memoryview or a binary file object such as a Streamlit upload), which
+are hashed and parsed straight from memory.
+"""
+
+import hashlib
+import importlib.util
+import io
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Columns process_growth_report actually uses
+REQUIRED_COLUMNS = ['CorporateID', 'CorporateName', 'UserName', 'TotalNR1']
+OPTIONAL_COLUMNS = ['URL']
+
+# Declared dtypes (CorporateID is left to inference: numeric or text IDs both occur)
+COLUMN_DTYPES = {
+    'CorporateName': object,
+    'UserName': object,
+    'TotalNR1': 'float64',
+    'URL': object,
+}
+
+# Bump when the pruned column set or dtypes change so stale entries are ignored
+SCHEMA_VERSION = 'v1'
+
+DEFAULT_CACHE_DIR = os.getenv('RCB_CACHE_DIR', '.cache/rcb_frames')
+DEFAULT_CACHE_MAX_MB = float(os.getenv('RCB_CACHE_MAX_MB', '512'))
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """Stream a file through SHA-256 and return the hex digest"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_name(source):
+    """Display name of a workbook source (file name, upload name, or 'workbook')"""
+    if _is_path(source):
+        return Path(source).name
+    return Path(getattr(source, 'name', None) or 'workbook.xlsx').name
+
+
+def source_sha256(source):
+    """
+    SHA-256 of a workbook source without copying in-memory data
+
+    Args:
+        source: Path, bytes/bytearray/memoryview, or a seekable binary file
+            object, which is read in chunks (BytesIO.getbuffer() would force
+            a copy of a BytesIO that shares its initial bytes)
+    """
+    if _is_path(source):
+        return file_sha256(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+
+    digest = hashlib.sha256()
+    position = source.tell()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    source.seek(position)
+    return digest.hexdigest()
+
+
+def workbook_buffer(data, name='workbook.xlsx'):
+    """
+    Named, seekable in-memory workbook
+
+    For a bytes object CPython's BytesIO shares the buffer instead of copying
+    it, so each caller can get an independent file position over one upload.
+    """
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return buffer
+
+
+def _reader_input(source):
+    """Something every engine can open: the path, or a file object rewound to the start"""
+    if _is_path(source):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+class ParsedFrameCache:
+    """
+    Parquet cache of parsed RCB frames with size-based LRU eviction
+
+    Entry recency is tracked through file mtimes (refreshed on every hit), so
+    the cache needs no separate index file and survives app restarts.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb=DEFAULT_CACHE_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    @staticmethod
+    def available():
+        """Parquet support requires pyarrow"""
+        try:
+            import pyarrow  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}-{SCHEMA_VERSION}.parquet"
+
+    def get(self, key):
+        """Return the cached frame for key, or None on a miss"""
+        entry = self._entry_path(key)
+        if not entry.exists():
+            return None
+        try:
+            df = pd.read_parquet(entry)
+        except Exception:
+            # Corrupt or truncated entry - drop it and treat as a miss
+            entry.unlink(missing_ok=True)
+            return None
+        os.utime(entry)  # mark as most recently used
+        return df
+
+    def put(self, key, df):
+        """Store a frame under key, then evict least recently used entries"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(key)
+        # Own temp file per process and thread: report jobs share a process
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, entry)
+        self.evict()
+
+    def evict(self):
+        """Delete oldest entries until the cache fits within max_bytes"""
+        entries = sorted(self.cache_dir.glob('*.parquet'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            entry.unlink(missing_ok=True)
+
+
+def _wanted_column(name):
+    return name in REQUIRED_COLUMNS or name in OPTIONAL_COLUMNS
+
+
+def _module_available(name):
+    return importlib.util.find_spec(name) is not None
+
+
+def _read_pandas(path, engine):
+    return pd.read_excel(path, engine=engine, usecols=_wanted_column, dtype=COLUMN_DTYPES)
+
+
+def _read_openpyxl_stream(path):
+    """Stream the first sheet row by row, keeping only the wanted columns"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        positions = [(i, name) for i, name in enumerate(header) if _wanted_column(name)]
+        columns = {name: [] for _, name in positions}
+        for row in rows:
+            for i, name in positions:
+                columns[name].append(row[i] if i < len(row) else None)
+    finally:
+        workbook.close()
+
+    # Match pandas: integral float IDs become ints, blank rows are skipped
+    if 'CorporateID' in columns:
+        columns['CorporateID'] = [
+            int(v) if isinstance(v, float) and v.is_integer() else v
+            for v in columns['CorporateID']
+        ]
+    df = pd.DataFrame(columns).dropna(how='all').reset_index(drop=True)
+    for col, dtype in COLUMN_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype).where(df[col].notna(), np.nan)
+    return df
+
+
+# Reader engines in order of preference: (reader, availability check)
+READER_ENGINES = {
+    'calamine': (lambda path: _read_pandas(path, 'calamine'), lambda: _module_available('python_calamine')),
+    'openpyxl_stream': (_read_openpyxl_stream, lambda: _module_available('openpyxl')),
+    'openpyxl': (lambda path: _read_pandas(path, 'openpyxl'), lambda: _module_available('openpyxl')),
+}
+
+DEFAULT_READER_ENGINE = os.getenv('RCB_EXCEL_ENGINE', 'auto')
+
+
+def available_engines():
+    """Names of the reader engines installed on this host, fastest first"""
+    return [name for name, (_, is_available) in READER_ENGINES.items() if is_available()]
+
+
+def select_engine(engine=DEFAULT_READER_ENGINE):
+    """
+    Resolve an engine name ('auto' picks the fastest installed engine)
+    """
+    if engine == 'auto':
+        installed = available_engines()
+        if not installed:
+            raise RuntimeError("No Excel reader engine installed (need python-calamine or openpyxl)")
+        return installed[0]
+    if engine not in READER_ENGINES:
+        raise ValueError(f"Unknown Excel reader engine '{engine}'. Choose from: auto, {', '.join(READER_ENGINES)}")
+    return engine
+
+
+def read_rcb_excel(path, engine=DEFAULT_READER_ENGINE):
+    """
+    Read only the report columns of an RCB workbook with declared dtypes
+
+    Args:
+        path: Path to RCB_*.xlsx, or an in-memory workbook (bytes, memoryview
+            or binary file object)
+        engine: Reader engine name or 'auto'
+
+    Returns:
+        DataFrame with REQUIRED_COLUMNS (+ URL when present)
+    """
+    reader, _ = READER_ENGINES[select_engine(engine)]
+    df = reader(_reader_input(path))
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"{source_name(path)} is missing required column(s): {', '.join(missing)}")
+
+    return df
+
+
+def benchmark_readers(path, engines=None, repeat=1):
+    """
+    Time every installed reader engine on one workbook
+
+    Args:
+        path: Path to RCB_*.xlsx
+        engines: Engine names to time (default: all installed)
+        repeat: Runs per engine (best time is reported)
+
+    Returns:
+        list: One dict per engine with seconds, rows or error
+    """
+    results = []
+    for name in engines or available_engines():
+        entry = {'engine': name}
+        try:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                df = read_rcb_excel(path, engine=name)
+                best = min(best, time.perf_counter() - start)
+            entry['seconds'] = round(best, 4)
+            entry['rows'] = len(df)
+        except Exception as e:
+            entry['error'] = str(e)
+        results.append(entry)
+    return results
+
+
+def _timed_read(path, engine, info):
+    """Parse the workbook, recording the engine used and parse time in info"""
+    info['engine'] = select_engine(engine)
+    start = time.perf_counter()
+    df = read_rcb_excel(path, engine=info['engine'])
+    info['parse_seconds'] = round(time.perf_counter() - start, 4)
+    return df
+
+
+def load_rcb_workbook(path, cache=None, engine=DEFAULT_READER_ENGINE, sha256=None):
+    """
+    Load an RCB workbook, serving the parsed frame from cache when possible
+
+    Args:
+        path: Path to RCB_*.xlsx, or an in-memory workbook (see read_rcb_excel)
+        cache: ParsedFrameCache instance (None disables caching)
+        engine: Reader engine name or 'auto'
+        sha256: source_sha256(path) if the caller already has it (skips re-hashing)
+
+    Returns:
+        tuple: (DataFrame, load info dict with cache status and timings)
+    """
+    start = time.perf_counter()
+    info = {'file': source_name(path), 'cache': 'disabled'}
+
+    if cache is None or not cache.available():
+        df = _timed_read(path, engine, info)
+    else:
+        key = sha256 or source_sha256(path)
+        info['sha256'] = key
+        info['hash_seconds'] = round(time.perf_counter() - start, 4)
+
+        df = cache.get(key)
+        if df is not None:
+            info['cache'] = 'hit'
+        else:
+            info['cache'] = 'miss'
+            df = _timed_read(path, engine, info)
+            try:
+                cache.put(key, df)
+            except Exception as e:
+                # Caching is best-effort; a failed write must not fail the report
+                info['cache'] = 'miss (not stored)'
+                print(f"[WARN] Could not cache {info['file']}: {e}")
+
+    info['rows'] = len(df)
+    info['load_seconds'] = round(time.perf_counter() - start, 4)
+    engine_note = f", engine {info['engine']}" if 'engine' in info else ''
+    print(f"[INFO] Loaded {info['file']}: {info['rows']} rows, cache {info['cache']}{engine_note}, {info['load_seconds']:.3f}s")
+    return df, info
@@ -0,0 +1,233 @@
+"""
+Headless Client Growth Report generation
+Builds the report from the two RCB exports without Streamlit, for cron jobs
+and the download workflow. Progress logs go to stderr; stdout (or
+--stats-json) gets one JSON document with the output paths, input load info,
+settings and report statistics. Heavy modules (pandas, the Excel readers and
+writers) are imported only once the arguments are valid, so --help and
+argument errors return immediately.
+
+Usage:
+    python -m report_cli                                     # data/RCB_*.xlsx -> generated_reports/
+    python -m report_cli --output report.xlsx --min-current-usd 40000 --inr-to-usd 83.5
+    python -m report_cli --format csv --output out/ --sheets "High Growth 5K-50K USD" Summary
+    python -m report_cli --stats-json stats.json --quiet --record-history
+    python -m report_cli --partitioned --memory-mb 256 --workers 4 --input-24m 24m.parquet --input-12m 12m.parquet
+
+Exit codes: 0 report written, 1 report failed, 2 invalid arguments.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from report_config import HIGH_GROWTH_MAX_PREVIOUS_USD, HIGH_GROWTH_MIN_CURRENT_USD, INR_TO_USD
+
+FORMATS = ('xlsx', 'csv', 'parquet', 'json')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m report_cli',
+        description="Generate the Client Growth Report from RCB exports without the dashboard",
+    )
+    parser.add_argument('--input-24m', type=Path, default=Path('data/RCB_24months.xlsx'),
+                        help="24-month RCB export (default: %(default)s)")
+    parser.add_argument('--input-12m', type=Path, default=Path('data/RCB_12months.xlsx'),
+                        help="12-month RCB export (default: %(default)s)")
+    parser.add_argument('-o', '--output', type=Path,
+                        help="Output file (xlsx/json) or directory (csv/parquet); "
+                             "default generated_reports/Client_Growth_Report_<timestamp>")
+    parser.add_argument('-f', '--format', choices=FORMATS,
+                        help="Output format (default: from the --output suffix, else xlsx)")
+    parser.add_argument('--sheets', nargs='+', metavar='SHEET', help="Only write these sheets")
+    parser.add_argument('--writer', help="Excel writer backend: openpyxl or xlsxwriter")
+    parser.add_argument('--engine', help="Excel reader engine (see rcb_loader.available_engines)")
+    parser.add_argument('--inr-to-usd', type=float, default=INR_TO_USD,
+                        help="INR per USD (default: %(default)s)")
+    parser.add_argument('--max-previous-usd', type=int, default=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                        help="High Growth: previous 12M revenue at most (default: %(default)s)")
+    parser.add_argument('--min-current-usd', type=int, default=HIGH_GROWTH_MIN_CURRENT_USD,
+                        help="High Growth: current 12M revenue at least (default: %(default)s)")
+    parser.add_argument('--snapshot', type=Path,
+                        help="Growth snapshot for incremental recompute (e.g. .cache/growth_snapshot.pkl)")
+    parser.add_argument('--no-cache', action='store_true', help="Do not use the parsed-frame cache")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="Out-of-core mode: hash-partition the inputs on disk and compute the "
+                             "partitions in worker processes (inputs may also be .parquet or .csv)")
+    parser.add_argument('--memory-mb', type=float,
+                        help="--partitioned memory budget (default: PARTITION_MEMORY_MB or 512)")
+    parser.add_argument('--workers', type=int,
+                        help="--partitioned worker processes (default: PARTITION_WORKERS or CPU count)")
+    parser.add_argument('--partitions', type=int,
+                        help="--partitioned hash partitions per input (default: PARTITION_COUNT or 64)")
+    parser.add_argument('--record-history', action='store_true',
+                        help="Append the run to the metrics store (METRICS_DB_PATH)")
+    parser.add_argument('--stats-json', metavar='PATH',
+                        help="Write the stats document here instead of stdout ('-' for stdout)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="No progress logs on stderr")
+    return parser
+
+
+def resolve_output(output, output_format):
+    """
+    (output path, format) from the arguments
+
+    Without --format the output suffix decides (.csv / .parquet name the
+    directory the sheet files go into); an output without a suffix is a CSV
+    directory, and no output at all is a timestamped workbook.
+    """
+    if output_format is None:
+        suffix = output.suffix.lower().lstrip('.') if output else ''
+        output_format = suffix if suffix in FORMATS else ('csv' if output else 'xlsx')
+    if output is None:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        name = f"Client_Growth_Report_{timestamp}"
+        output = Path('generated_reports') / (f"{name}.{output_format}" if output_format in ('xlsx', 'json') else name)
+    return output, output_format
+
+
+def generate(args):
+    """
+    Run the report for parsed arguments
+
+    Returns:
+        dict: Machine-readable run document (see module docstring)
+    """
+    from process_report import compute_growth_report, process_growth_report
+    from rcb_loader import DEFAULT_READER_ENGINE, ParsedFrameCache, load_rcb_workbook
+    from report_profiling import StageTimer
+    from report_writers import DEFAULT_XLSX_WRITER
+
+    started = time.perf_counter()
+    output, output_format = resolve_output(args.output, args.format)
+    settings = {
+        'inr_to_usd': args.inr_to_usd,
+        'high_growth_max_previous_usd': args.max_previous_usd,
+        'high_growth_min_current_usd': args.min_current_usd,
+    }
+    cache = None if args.no_cache else ParsedFrameCache()
+    timer = StageTimer()
+
+    if args.partitioned:
+        from partitioned_report import (
+            DEFAULT_PARTITION_MEMORY_MB,
+            DEFAULT_PARTITION_WORKERS,
+            DEFAULT_PARTITIONS,
+            compute_growth_report_partitioned,
+        )
+
+        # Parquet/CSV inputs are streamed into partitions; an .xlsx input is parsed whole first
+        report = compute_growth_report_partitioned(
+            args.input_24m, args.input_12m,
+            memory_mb=args.memory_mb or DEFAULT_PARTITION_MEMORY_MB,
+            workers=args.workers or DEFAULT_PARTITION_WORKERS,
+            partitions=args.partitions or DEFAULT_PARTITIONS,
+            cache=cache, engine=args.engine or DEFAULT_READER_ENGINE, timer=timer, **settings,
+        )
+        load_24m, load_12m = report.stats['partitioned']['inputs']
+    else:
+        with timer.stage('excel_read'):
+            df_24m, load_24m = load_rcb_workbook(args.input_24m, cache, args.engine or DEFAULT_READER_ENGINE)
+            df_12m, load_12m = load_rcb_workbook(args.input_12m, cache, args.engine or DEFAULT_READER_ENGINE)
+
+    if output_format in ('xlsx', 'json'):
+        output.parent.mkdir(parents=True, exist_ok=True)
+    if output_format == 'xlsx' and not args.sheets and not args.partitioned:
+        report = process_growth_report(
+            df_24m, df_12m, str(output), writer=args.writer or DEFAULT_XLSX_WRITER,
+            snapshot_path=args.snapshot, timer=timer, return_result=True, **settings,
+        )
+        paths = [output]
+    else:
+        if not args.partitioned:
+            report = compute_growth_report(df_24m, df_12m, args.snapshot, timer=timer, **settings)
+        with timer.stage(f'{output_format}_write'):
+            if output_format == 'xlsx':
+                paths = [report.to_xlsx(output, args.sheets, writer=args.writer or DEFAULT_XLSX_WRITER)]
+            elif output_format == 'json':
+                report.to_json(output, args.sheets)
+                paths = [output]
+            elif output_format == 'csv':
+                paths = report.to_csv(output, args.sheets)
+            else:
+                paths = report.to_parquet(output, args.sheets)
+        report.stats['performance'] = timer.report()
+
+    history_run = None
+    if args.record_history:
+        from metrics_store import MetricsStore, run_input_key
+        from rcb_loader import source_sha256
+
+        # Same key as the dashboard, so a report already recorded there is not added again
+        sha_24m = load_24m.get('sha256') or source_sha256(args.input_24m)
+        sha_12m = load_12m.get('sha256') or source_sha256(args.input_12m)
+        input_key = run_input_key(sha_24m, sha_12m, settings)
+        history_run = MetricsStore().record_run(report, input_key, source='cli', report_file=paths[0])
+
+    return {
+        'ok': True,
+        'format': output_format,
+        'outputs': [str(path) for path in paths],
+        'inputs': [load_24m, load_12m],
+        'settings': settings,
+        'stats': report.stats,
+        'history_run_id': history_run,
+        'total_seconds': round(time.perf_counter() - started, 4),
+    }
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.partitioned and args.snapshot:
+        parser.error("--snapshot cannot be combined with --partitioned")
+    for name in ('memory_mb', 'workers', 'partitions'):
+        if getattr(args, name) is not None and getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+    suffix = args.output.suffix.lower().lstrip('.') if args.output else ''
+    if args.format is None and suffix and suffix not in FORMATS:
+        parser.error(f"Cannot tell the format from '.{suffix}': pass --format ({', '.join(FORMATS)})")
+
+    # Keep stdout for the JSON document: pipeline logs go to stderr (or nowhere)
+    log_stream = open(os.devnull, 'w') if args.quiet else sys.stderr
+    try:
+        with contextlib.redirect_stdout(log_stream):
+            for path in (args.input_24m, args.input_12m):
+                if not path.exists():
+                    raise FileNotFoundError(f"Input not found: {path}")
+            document = generate(args)
+        exit_code = 0
+    except Exception as e:
+        document = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        exit_code = 1
+    finally:
+        if args.quiet:
+            log_stream.close()
+
+    from report_writers import json_default
+
+    text = json.dumps(document, default=json_default, indent=2)
+    if args.stats_json and args.stats_json != '-':
+        # Also when the report failed before creating any output directory
+        stats_path = Path(args.stats_json)
+        try:
+            stats_path.parent.mkdir(parents=True, exist_ok=True)
+            stats_path.write_text(text, encoding='utf-8')
+        except OSError as e:
+            # Never lose the document: fall back to stdout
+            print(f"[ERROR] Could not write {stats_path}: {e}", file=sys.stderr)
+            print(text)
+            exit_code = exit_code or 1
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Report settings and sheet names
+Plain constants with no third-party imports, so the dashboard's first paint
+and the CLI's argument parsing can use them without loading pandas.
+process_report re-exports everything here.
+"""
+
+# Report settings (also part of the dashboard's report cache key)
+INR_TO_USD = 84
+HIGH_GROWTH_MAX_PREVIOUS_USD = 5000
+HIGH_GROWTH_MIN_CURRENT_USD = 50000
+
+SHEET_GROWTH_COMPARISON = 'Growth Comparison'
+# Released name, used at the default cut-offs (see high_growth_sheet_name).
+# Also accepted as an alias for the High Growth sheet at any cut-offs
+SHEET_HIGH_GROWTH = 'High Growth 5K-50K USD'
+SHEET_SUMMARY = 'Summary'
+SHEET_EXCEPTIONS = 'Exceptions'
+REPORT_SHEETS = [SHEET_GROWTH_COMPARISON, SHEET_HIGH_GROWTH, SHEET_SUMMARY, SHEET_EXCEPTIONS]
+
+
+def usd_label(amount):
+    """$5K for whole thousands, $7,500 otherwise"""
+    if amount and amount % 1000 == 0:
+        return f"${int(amount) // 1000:,}K"
+    return f"${amount:,.0f}"
+
+
+def high_growth_sheet_name(max_previous_usd=HIGH_GROWTH_MAX_PREVIOUS_USD,
+                           min_current_usd=HIGH_GROWTH_MIN_CURRENT_USD):
+    """
+    High Growth sheet name for these cut-offs
+
+    SHEET_HIGH_GROWTH ('High Growth 5K-50K USD') at the defaults, so existing
+    lookups and macros keep working; e.g. 'High Growth 7,500-40K USD' otherwise.
+    """
+    name = f"High Growth {usd_label(max_previous_usd)[1:]}-{usd_label(min_current_usd)[1:]} USD"
+    # Excel's sheet name limit
+    return name[:31]
+
+
+def is_high_growth_sheet(name):
+    """True for a High Growth sheet name at any cut-offs (e.g. in an older workbook)"""
+    return name.startswith('High Growth')
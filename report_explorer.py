@@ -0,0 +1,141 @@
+"""
+Server-side explorer for report sheets
+Sorting, filtering and pagination run on the GrowthResult frames in the
+server process and only the requested page is sent to the browser. Sort
+orders and the lower-cased search text are built once per sheet and reused
+by every later page, sort or filter change, so paging through a 100k+
+client report stays in the millisecond range.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from process_report import SHEET_EXCEPTIONS, SHEET_GROWTH_COMPARISON, SHEET_HIGH_GROWTH
+
+EXPLORER_SHEETS = (SHEET_GROWTH_COMPARISON, SHEET_HIGH_GROWTH, SHEET_EXCEPTIONS)
+SEARCH_COLUMNS = ('CorporateID', 'CompanyName', 'UserName')
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+@dataclass
+class ExplorerPage:
+    """One page of a sheet after search, range filters and sorting"""
+    rows: pd.DataFrame
+    total_rows: int
+    matching_rows: int
+    page: int
+    pages: int
+    page_size: int
+
+    @property
+    def first_row(self):
+        """1-based number of the first row on this page (0 when nothing matches)"""
+        return (self.page - 1) * self.page_size + 1 if self.matching_rows else 0
+
+    @property
+    def last_row(self):
+        return self.first_row + len(self.rows) - 1 if self.matching_rows else 0
+
+
+class SheetExplorer:
+    """
+    Sort/filter/paginate one report sheet without copying it
+
+    Args:
+        frame: Sheet DataFrame as produced by build_growth_result (kept by
+            reference; the explorer never modifies it)
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self._orders = {}
+        self._search_text = None
+        self._last_search = (None, None)
+
+    @property
+    def columns(self):
+        return list(self.frame.columns)
+
+    @property
+    def numeric_columns(self):
+        return [column for column in self.frame.columns if pd.api.types.is_numeric_dtype(self.frame[column])]
+
+    def sort_order(self, column, ascending=True):
+        """Row positions sorted by column (stable, blanks last), computed once per direction"""
+        key = (column, ascending)
+        if key not in self._orders:
+            values = self.frame[column]
+            try:
+                ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+            except TypeError:
+                # Mixed types (e.g. numeric and text CorporateIDs) sort as text
+                ordered = values.astype(str).sort_values(ascending=ascending, kind='stable')
+            self._orders[key] = ordered.index.to_numpy()
+        return self._orders[key]
+
+    def search_mask(self, term):
+        """Boolean array of rows whose ID, company or user name contains term (case-insensitive)"""
+        term = (term or '').strip().lower()
+        if not term:
+            return None
+        if self._last_search[0] == term:
+            return self._last_search[1]
+        if self._search_text is None:
+            columns = [column for column in SEARCH_COLUMNS if column in self.frame.columns]
+            text = pd.Series('', index=self.frame.index)
+            for column in columns:
+                text = text + ' ' + self.frame[column].fillna('').astype(str)
+            self._search_text = text.str.lower()
+        mask = self._search_text.str.contains(term, regex=False).to_numpy()
+        self._last_search = (term, mask)
+        return mask
+
+    def range_mask(self, ranges):
+        """Boolean array for {column: (low, high)} inclusive bounds; None bounds are open"""
+        mask = None
+        for column, (low, high) in (ranges or {}).items():
+            values = self.frame[column].to_numpy()
+            if low is not None:
+                mask = (values >= low) if mask is None else mask & (values >= low)
+            if high is not None:
+                mask = (values <= high) if mask is None else mask & (values <= high)
+        return mask
+
+    def query(self, search=None, ranges=None, sort_by=None, ascending=True, page=1, page_size=50):
+        """
+        Rows for one page
+
+        Args:
+            search: Text matched against CorporateID, CompanyName and UserName
+            ranges: {numeric column: (low, high)} filters
+            sort_by: Column to sort by; None keeps the report's own order
+            ascending: Sort direction
+            page: 1-based page number (clamped to the available pages)
+            page_size: Rows per page
+
+        Returns:
+            ExplorerPage: The page rows plus match and page counts
+        """
+        order = self.sort_order(sort_by, ascending) if sort_by else np.arange(len(self.frame))
+
+        mask = self.search_mask(search)
+        numeric = self.range_mask(ranges)
+        if numeric is not None:
+            mask = numeric if mask is None else mask & numeric
+        if mask is not None:
+            order = order[mask[order]]
+
+        pages = max(math.ceil(len(order) / page_size), 1)
+        page = min(max(int(page), 1), pages)
+        positions = order[(page - 1) * page_size:page * page_size]
+        return ExplorerPage(
+            rows=self.frame.iloc[positions],
+            total_rows=len(self.frame),
+            matching_rows=len(order),
+            page=page,
+            pages=pages,
+            page_size=page_size,
+        )
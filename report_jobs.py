@@ -0,0 +1,133 @@
+"""
+Background report jobs for the dashboard
+Report generation runs on a small thread pool instead of inside the Streamlit
+script, so the session stays responsive. Each job gets an ID that the page
+keeps in session state and the URL; any rerun (or a browser refresh) looks
+the job up again and shows its live stage progress or finished result.
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+@dataclass
+class ReportJob:
+    """State of one background job; the runner hands out copies"""
+    job_id: str
+    label: str
+    expected_stages: int = 4
+    status: str = JOB_QUEUED
+    current_stage: str = None
+    stages: dict = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+    result: object = None
+    error: str = None
+
+    @property
+    def finished_ok(self):
+        return self.status == JOB_DONE
+
+    @property
+    def active(self):
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    @property
+    def progress(self):
+        """0..1 - completed stages over the expected count (never 1 until done)"""
+        if self.status in (JOB_DONE, JOB_FAILED):
+            return 1.0
+        return min(len(self.stages) / max(self.expected_stages, 1), 0.95)
+
+    @property
+    def elapsed_seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class ReportJobRunner:
+    """
+    Runs report jobs on a thread pool and tracks their progress
+
+    Args:
+        max_workers: Jobs executed at once (1 keeps the growth snapshot and
+            output files free of concurrent writers; later jobs queue)
+        keep: Finished jobs remembered for lookup before the oldest are dropped
+    """
+
+    def __init__(self, max_workers=1, keep=20):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.keep = keep
+
+    def submit(self, func, *args, label='Report', expected_stages=4, **kwargs):
+        """
+        Queue func(*args, progress=callback, **kwargs) and return its job ID
+
+        The progress callback has the StageTimer listener signature
+        (stage, seconds), so it can be passed straight to a StageTimer.
+        """
+        job = ReportJob(job_id=uuid.uuid4().hex[:12], label=label, expected_stages=expected_stages)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._pool.submit(self._run, job.job_id, func, args, kwargs)
+        return job.job_id
+
+    def get(self, job_id):
+        """Snapshot of the job, or None if unknown/expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job, stages=dict(job.stages)) if job else None
+
+    def jobs(self):
+        """Snapshots of all remembered jobs, newest first"""
+        with self._lock:
+            ids = sorted(self._jobs, key=lambda job_id: self._jobs[job_id].created, reverse=True)
+        return [self.get(job_id) for job_id in ids]
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for name, value in changes.items():
+                    setattr(job, name, value)
+
+    def _progress(self, job_id, stage, seconds):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if seconds is None:
+                job.current_stage = stage
+            else:
+                # Repeated stage names accumulate, matching StageTimer
+                job.stages[stage] = round(job.stages.get(stage, 0) + seconds, 4)
+                job.current_stage = None
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, status=JOB_RUNNING, started=time.time())
+        try:
+            result = func(*args, progress=lambda stage, seconds: self._progress(job_id, stage, seconds), **kwargs)
+            self._update(job_id, status=JOB_DONE, result=result, finished=time.time(), current_stage=None)
+        except Exception as e:
+            print(f"[ERROR] Report job {job_id} failed:\n{traceback.format_exc()}")
+            self._update(job_id, status=JOB_FAILED, error=str(e), finished=time.time(), current_stage=None)
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if not job.active]
+        finished.sort(key=lambda job: job.created)
+        for job in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job.job_id]
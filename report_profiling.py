@@ -0,0 +1,87 @@
+"""
+Per-stage timing and optional profiling for report generation
+Wrap each stage in `with timer.stage('name'):`; timer.report() returns a
+plain dict that is stored in the report stats and shown in the dashboard's
+Performance panel. An optional listener receives stage start/end events
+(used for live progress of background report jobs).
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    Collects wall time per stage, plus optional cProfile and tracemalloc data
+
+    Args:
+        profile: Run cProfile across all stages (adds noticeable overhead)
+        trace_memory: Record peak Python memory per stage with tracemalloc
+        listener: Optional callable(stage, seconds) - called with seconds=None
+            when a stage starts and with its wall time when it ends
+    """
+
+    def __init__(self, profile=False, trace_memory=False, listener=None):
+        self.timings = {}
+        self.listener = listener
+        self.peak_memory_mb = {}
+        self.trace_memory = trace_memory
+        self._profiler = cProfile.Profile() if profile else None
+
+    @contextmanager
+    def stage(self, name):
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        if self.listener is not None:
+            self.listener(name, None)
+        if self._profiler is not None:
+            self._profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self._profiler is not None:
+                self._profiler.disable()
+            # Repeated stage names (e.g. two workbook reads) accumulate
+            self.timings[name] = round(self.timings.get(name, 0) + elapsed, 4)
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak_memory_mb[name] = round(max(self.peak_memory_mb.get(name, 0), peak / 1024 / 1024), 2)
+                if started_tracing:
+                    tracemalloc.stop()
+            if self.listener is not None:
+                self.listener(name, elapsed)
+
+    def profile_text(self, limit=25):
+        """Top functions by cumulative time, or '' when profiling is off"""
+        if self._profiler is None:
+            return ''
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=buffer)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(limit)
+        return buffer.getvalue()
+
+    def report(self):
+        """Timings (and memory/profile when enabled) as a plain dict"""
+        report = {
+            'stages': dict(self.timings),
+            'total_seconds': round(sum(self.timings.values()), 4),
+        }
+        if self.trace_memory:
+            report['peak_memory_mb'] = dict(self.peak_memory_mb)
+        if self._profiler is not None:
+            report['profile'] = self.profile_text()
+        return report
+
+    def summary_line(self):
+        return ' | '.join(f"{name} {seconds:.3f}s" for name, seconds in self.timings.items())
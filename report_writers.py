@@ -0,0 +1,277 @@
+"""
+Output renderers for the Client Growth Report sheets
+Excel backends:
+- openpyxl: pandas ExcelWriter, Summary styled cell by cell (original behaviour)
+- xlsxwriter: rows streamed to disk in constant memory, Summary styled with
+  precomputed formats while each row is written
+Both produce the same sheets, cell values and Summary highlighting.
+CSV and Parquet write one file per sheet; JSON writes one document with the
+report statistics and every sheet as a list of records.
+"""
+
+import json
+import math
+import os
+import re
+from pathlib import Path
+
+from report_config import SHEET_SUMMARY as SUMMARY_SHEET
+
+# Summary highlight colours
+GOLD = 'FFD700'
+LIGHT_BLUE = 'E3F2FD'
+LIGHT_GREEN = 'C8E6C9'
+
+SUMMARY_COLUMN_WIDTHS = {'A': 40, 'B': 50}
+
+# Summary layout: row 1 is the header, row 2 the TOP PERFORMER banner,
+# rows 3-10 the top performer details
+TOP_PERFORMER_ROW = 2
+TOP_PERFORMER_DETAIL_ROWS = range(3, 11)
+
+DEFAULT_XLSX_WRITER = os.getenv('REPORT_XLSX_WRITER', 'openpyxl')
+
+
+def _is_statistics_header(value):
+    text = str(value) if value else ''
+    return 'OVERALL STATISTICS' in text or '📊' in text
+
+
+def write_xlsx_openpyxl(sheets, output_file):
+    """
+    Write report sheets with pandas/openpyxl and style the Summary sheet
+
+    Args:
+        sheets: dict of sheet name -> DataFrame, in workbook order
+        output_file: Path to output Excel file
+    """
+    import pandas as pd
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        for sheet_name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        if SUMMARY_SHEET not in writer.book.sheetnames:
+            return
+        summary_sheet = writer.book[SUMMARY_SHEET]
+
+        # Make column A wider for metric names
+        for column, width in SUMMARY_COLUMN_WIDTHS.items():
+            summary_sheet.column_dimensions[column].width = width
+
+        # Highlight TOP PERFORMER header (row 2)
+        for cell in summary_sheet[TOP_PERFORMER_ROW]:
+            cell.fill = PatternFill(start_color=GOLD, end_color=GOLD, fill_type='solid')
+            cell.font = Font(bold=True, size=14, color='000000')
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+
+        # Highlight top performer details (rows 3-10) with light blue
+        for row_idx in TOP_PERFORMER_DETAIL_ROWS:
+            for cell in summary_sheet[row_idx]:
+                cell.fill = PatternFill(start_color=LIGHT_BLUE, end_color=LIGHT_BLUE, fill_type='solid')
+                cell.font = Font(size=11)
+                # Make metric names in column A bold
+                if cell.column == 1:
+                    cell.font = Font(bold=True, size=11)
+
+        # Find and highlight OVERALL STATISTICS header
+        for row_idx in range(1, summary_sheet.max_row + 1):
+            if _is_statistics_header(summary_sheet.cell(row_idx, 1).value):
+                # Highlight this header row with light green
+                for cell in summary_sheet[row_idx]:
+                    cell.fill = PatternFill(start_color=LIGHT_GREEN, end_color=LIGHT_GREEN, fill_type='solid')
+                    cell.font = Font(bold=True, size=12, color='000000')
+                    cell.alignment = Alignment(horizontal='center', vertical='center')
+                break
+
+
+def _write_cell(worksheet, row, col, value, cell_format=None):
+    """Write one value with an explicit type so nothing is reinterpreted"""
+    # openpyxl leaves None / NaN / '' cells empty; only formatted cells need a blank
+    if value is None or value == '' or (isinstance(value, float) and math.isnan(value)):
+        if cell_format is not None:
+            worksheet.write_blank(row, col, None, cell_format)
+    elif isinstance(value, str):
+        worksheet.write_string(row, col, value, cell_format)
+    elif isinstance(value, bool):
+        worksheet.write_boolean(row, col, value, cell_format)
+    elif isinstance(value, (int, float)):
+        worksheet.write_number(row, col, value, cell_format)
+    else:
+        worksheet.write_string(row, col, str(value), cell_format)
+
+
+def write_xlsx_streaming(sheets, output_file):
+    """
+    Stream report sheets to disk with xlsxwriter in constant_memory mode
+
+    Rows are flushed as soon as the next row starts, so memory stays flat
+    regardless of client count. Summary formats are built once up front.
+
+    Args:
+        sheets: dict of sheet name -> DataFrame, in workbook order
+        output_file: Path to output Excel file
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(str(output_file), {
+        'constant_memory': True,
+        # Keep cell content identical to the openpyxl writer
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+        'strings_to_numbers': False,
+    })
+    try:
+        # Same look as the pandas header row
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        gold_format = workbook.add_format({
+            'bg_color': f'#{GOLD}', 'pattern': 1, 'bold': True, 'font_size': 14,
+            'font_color': '#000000', 'align': 'center', 'valign': 'vcenter',
+        })
+        blue_format = workbook.add_format({'bg_color': f'#{LIGHT_BLUE}', 'pattern': 1, 'font_size': 11})
+        blue_bold_format = workbook.add_format({'bg_color': f'#{LIGHT_BLUE}', 'pattern': 1, 'bold': True, 'font_size': 11})
+        green_format = workbook.add_format({
+            'bg_color': f'#{LIGHT_GREEN}', 'pattern': 1, 'bold': True, 'font_size': 12,
+            'font_color': '#000000', 'align': 'center', 'valign': 'vcenter',
+        })
+
+        for sheet_name, frame in sheets.items():
+            worksheet = workbook.add_worksheet(sheet_name)
+            is_summary = sheet_name == SUMMARY_SHEET
+            statistics_found = False
+
+            if is_summary:
+                for column, width in SUMMARY_COLUMN_WIDTHS.items():
+                    worksheet.set_column(f'{column}:{column}', width)
+
+            for col, name in enumerate(frame.columns):
+                _write_cell(worksheet, 0, col, str(name), header_format)
+
+            for row, values in enumerate(frame.itertuples(index=False, name=None), start=1):
+                row_formats = [None] * len(values)
+                if is_summary:
+                    excel_row = row + 1
+                    if excel_row == TOP_PERFORMER_ROW:
+                        row_formats = [gold_format] * len(values)
+                    elif excel_row in TOP_PERFORMER_DETAIL_ROWS:
+                        row_formats = [blue_bold_format] + [blue_format] * (len(values) - 1)
+                    elif not statistics_found and _is_statistics_header(values[0]):
+                        row_formats = [green_format] * len(values)
+                        statistics_found = True
+
+                for col, value in enumerate(values):
+                    if hasattr(value, 'item'):
+                        value = value.item()  # numpy scalar -> Python scalar
+                    _write_cell(worksheet, row, col, value, row_formats[col])
+    finally:
+        workbook.close()
+
+
+XLSX_WRITERS = {
+    'openpyxl': write_xlsx_openpyxl,
+    'xlsxwriter': write_xlsx_streaming,
+}
+
+
+def write_report_xlsx(sheets, output_file, writer=DEFAULT_XLSX_WRITER):
+    """
+    Write report sheets with the selected backend
+
+    Args:
+        sheets: dict of sheet name -> DataFrame, in workbook order
+        output_file: Path to output Excel file
+        writer: 'openpyxl' (default) or 'xlsxwriter' (streaming, constant memory)
+    """
+    if writer not in XLSX_WRITERS:
+        raise ValueError(f"Unknown Excel writer '{writer}'. Choose from: {', '.join(XLSX_WRITERS)}")
+
+    if writer == 'xlsxwriter':
+        try:
+            import xlsxwriter  # noqa: F401
+        except ImportError:
+            print("[WARN] xlsxwriter not installed - falling back to openpyxl writer")
+            writer = 'openpyxl'
+
+    XLSX_WRITERS[writer](sheets, output_file)
+
+
+def sheet_file_stem(sheet_name):
+    """'High Growth 5K-50K USD' -> 'high_growth_5k_50k_usd'"""
+    return re.sub(r'[^a-z0-9]+', '_', sheet_name.lower()).strip('_')
+
+
+def write_report_csv(sheets, output_dir):
+    """
+    Write each sheet to <output_dir>/<sheet_file_stem>.csv
+
+    Returns:
+        list: Paths written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for sheet_name, frame in sheets.items():
+        path = output_dir / f"{sheet_file_stem(sheet_name)}.csv"
+        frame.to_csv(path, index=False, encoding='utf-8-sig')  # BOM so Excel shows ≤ / emoji correctly
+        paths.append(path)
+    return paths
+
+
+def _arrow_safe(frame):
+    """Cast mixed-type object columns (e.g. Summary values) to text for Parquet"""
+    import pandas as pd
+
+    frame = frame.copy()
+    for col in frame.columns:
+        if frame[col].dtype == object and pd.api.types.infer_dtype(frame[col], skipna=True).startswith('mixed'):
+            frame[col] = frame[col].map(lambda v: v if v is None or (isinstance(v, float) and math.isnan(v)) else str(v))
+    return frame
+
+
+def write_report_parquet(sheets, output_dir):
+    """
+    Write each sheet to <output_dir>/<sheet_file_stem>.parquet (requires pyarrow)
+
+    Returns:
+        list: Paths written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for sheet_name, frame in sheets.items():
+        path = output_dir / f"{sheet_file_stem(sheet_name)}.parquet"
+        _arrow_safe(frame).to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def json_default(value):
+    """json.dumps default for numpy scalars and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()  # numpy scalar
+    return str(value)
+
+
+def write_report_json(sheets, stats, output_file=None):
+    """
+    Render stats and sheets as one JSON document
+
+    Args:
+        sheets: dict of sheet name -> DataFrame
+        stats: Report statistics dict
+        output_file: Optional path; when omitted only the string is returned
+
+    Returns:
+        str: JSON document
+    """
+    document = {
+        'stats': stats,
+        # to_json handles NaN -> null and numpy types
+        'sheets': {name: json.loads(frame.to_json(orient='records', force_ascii=False))
+                   for name, frame in sheets.items()},
+    }
+    text = json.dumps(document, default=json_default, ensure_ascii=False, indent=2)
+    if output_file is not None:
+        Path(output_file).write_text(text, encoding='utf-8')
+    return text
@@ -4,19 +4,11 @@ Combines manual upload, auto-downloaded data, GitHub Actions trigger, and email
 """
 
 import streamlit as st
-import pandas as pd
 import os
 from pathlib import Path
 from datetime import datetime
 import time
-import requests
-import smtplib
-import ssl
 import random
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 
 # ----------------- PAGE CONFIG -----------------
 st.set_page_config(
@@ -113,75 +105,135 @@ if "reset_otp" not in st.session_state:
 
 # ----------------- HELPER FUNCTIONS -----------------
 
+GROWTH_SNAPSHOT_PATH = Path(".cache/growth_snapshot.pkl")
 
-def trigger_github_workflow():
-    """Trigger GitHub Actions workflow via API"""
-    try:
-        url = "https://api.github.com/repos/KoenigSalary/client_growth_report/actions/workflows/download-rms2-data.yml/dispatches"
-        token = st.secrets.get("GITHUB_TOKEN", "")
+# In-memory result caches (per server process); evicted after the TTL or
+# when more than max_entries distinct inputs/settings have been seen
+REPORT_CACHE_TTL_SECONDS = int(os.getenv("REPORT_CACHE_TTL_SECONDS", "3600"))
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "4"))
 
-        if not token:
-            return False, "GitHub token not configured"
+# Background report jobs run one at a time by default (later ones queue)
+REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "1"))
+# Finished jobs kept for lookup; each holds its report frames for the explorer
+REPORT_JOBS_KEPT = int(os.getenv("REPORT_JOBS_KEPT", "10"))
 
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "Authorization": f"Bearer {token}",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
-        data = {"ref": "main"}
+# Full Automation gives up waiting for the download workflow after this long
+WORKFLOW_TIMEOUT_SECONDS = int(os.getenv("WORKFLOW_TIMEOUT_SECONDS", "180"))
 
-        response = requests.post(url, headers=headers, json=data)
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-        if response.status_code == 204:
-            return True, "Workflow triggered successfully"
-        else:
-            return False, f"API returned status {response.status_code}"
 
-    except Exception as e:
-        return False, str(e)
+AUTO_DATA_FILES = {"24m": Path("data/RCB_24months.xlsx"), "12m": Path("data/RCB_12months.xlsx")}
+LOGO_PATH = Path("assets/koenig_logo.png")
 
 
-def check_workflow_status():
-    """Check latest workflow run status"""
-    try:
-        url = "https://api.github.com/repos/KoenigSalary/client_growth_report/actions/runs"
-        token = st.secrets.get("GITHUB_TOKEN", "")
+@st.cache_resource
+def logo_image():
+    """Logo bytes read once per server process (None when the file is missing)"""
+    return LOGO_PATH.read_bytes() if LOGO_PATH.exists() else None
+
+
+def data_file_status():
+    """
+    Availability, age and size of the auto-downloaded exports from one stat() per
+    file; computed once per rerun and shared by the sidebar and the main page
 
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "Authorization": f"Bearer {token}",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+    Returns:
+        dict: available, last_update (datetime or None), hours_ago, size_mb per export
+    """
+    stats = {}
+    for key, path in AUTO_DATA_FILES.items():
+        try:
+            stats[key] = path.stat()
+        except OSError:
+            stats[key] = None
+    available = all(stats.values())
+    last_update = datetime.fromtimestamp(max(s.st_mtime for s in stats.values())) if available else None
+    return {
+        "available": available,
+        "last_update": last_update,
+        "hours_ago": (datetime.now() - last_update).total_seconds() / 3600 if available else None,
+        "size_mb": {key: s.st_size / 1024 / 1024 if s else None for key, s in stats.items()},
+    }
 
-        response = requests.get(url, headers=headers, params={"per_page": 1})
 
-        if response.status_code == 200:
-            runs = response.json().get("workflow_runs", [])
-            if runs:
-                return runs[0].get("status"), runs[0].get("conclusion")
+@st.cache_resource
+def get_actions_client(token):
+    """Pooled GitHub Actions client (keeps connections and ETags across reruns)"""
+    from github_actions import ActionsClient
 
-        return None, None
+    return ActionsClient(token)
 
-    except Exception:
+
+WORKFLOW_STATUS_ICONS = {"queued": "⏸️", "waiting": "⏸️", "in_progress": "⏳"}
+WORKFLOW_CONCLUSION_ICONS = {"success": "✅", "failure": "❌", "cancelled": "🚫", "skipped": "⏭️"}
+
+
+def format_workflow_jobs(jobs):
+    """Markdown list of jobs and their steps with status icons"""
+    def icon(item):
+        if item.get("status") == "completed":
+            return WORKFLOW_CONCLUSION_ICONS.get(item.get("conclusion"), "✔️")
+        return WORKFLOW_STATUS_ICONS.get(item.get("status"), "•")
+
+    lines = []
+    for job in jobs:
+        lines.append(f"{icon(job)} **{job.get('name')}**")
+        for step in job.get("steps", []):
+            lines.append(f"    - {icon(step)} {step.get('name')}")
+    return "\n".join(lines)
+
+
+@st.cache_resource
+def get_email_outbox(host, port, username, password, starttls=True):
+    """Background outbox reusing one SMTP connection (one per relay/account)"""
+    from email_outbox import EmailOutbox, SmtpSettings
+
+    return EmailOutbox(SmtpSettings(host, port, username, password, starttls))
+
+
+def smtp_outbox():
+    """(sender address, outbox), or (None, None) when SMTP is not configured"""
+    sender_email = st.secrets.get("SMTP_EMAIL", "")
+    sender_password = st.secrets.get("SMTP_PASSWORD", "")
+    if not sender_email or not sender_password:
         return None, None
+    smtp_server = st.secrets.get("SMTP_SERVER", "smtp.office365.com")
+    smtp_port = int(st.secrets.get("SMTP_PORT", 587))
+    starttls = str(st.secrets.get("SMTP_STARTTLS", "true")).lower() in ("1", "true", "yes")
+    return sender_email, get_email_outbox(smtp_server, smtp_port, sender_email, sender_password, starttls)
+
 
+def send_email_report(report_file_path, recipient_emails, attachment_format="xlsx", sheets=None, mailer=None,
+                      settings=None):
+    """
+    Send email with report attachment via Outlook365 (queued on the outbox, waits for delivery)
 
-def send_email_report(report_file_path, recipient_emails):
-    """Send email with report attachment via Outlook365"""
+    mailer is smtp_outbox() resolved on the script thread; background jobs pass
+    it because secrets are read in the script's context. settings are the report
+    settings the workbook was built with (for the summary lines).
+    """
     try:
-        sender_email = st.secrets.get("SMTP_EMAIL", "")
-        sender_password = st.secrets.get("SMTP_PASSWORD", "")
-        smtp_server = st.secrets.get("SMTP_SERVER", "smtp.office365.com")
-        smtp_port = int(st.secrets.get("SMTP_PORT", 587))
+        from email_outbox import build_message, workbook_attachment
 
-        if not sender_email or not sender_password:
+        sender_email, outbox = mailer or smtp_outbox()
+        if outbox is None:
             return False, "Email credentials not configured"
 
-        msg = MIMEMultipart()
-        msg["From"] = sender_email
-        msg["To"] = ", ".join(recipient_emails)
-        msg["Subject"] = f"Client Growth Report - {datetime.now().strftime('%Y-%m-%d')}"
+        from report_config import SHEET_HIGH_GROWTH, high_growth_sheet_name, usd_label
 
+        settings = settings or default_report_settings()
+        subject = f"Client Growth Report - {datetime.now().strftime('%Y-%m-%d')}"
+        # The workbook names the High Growth sheet after the cut-offs it was built with
+        high_growth_name = high_growth_sheet_name(
+            settings['high_growth_max_previous_usd'], settings['high_growth_min_current_usd']
+        )
+        if sheets:
+            sheet_names = [high_growth_name if name == SHEET_HIGH_GROWTH else name for name in sheets]
+        else:
+            sheet_names = ["Growth Comparison (all clients)", f"{high_growth_name} (filtered)",
+                           "Summary (statistics)", "Exceptions (if any)"]
+        sheet_lines = "\n".join(f"{number}. {name}" for number, name in enumerate(sheet_names, start=1))
         body = f"""
 Hi Team,
 
@@ -189,79 +241,589 @@ Please find attached the Client Growth Report generated on {datetime.now().strft
 
 Report Summary:
 - Data Period: Previous 12M vs Current 12M
-- Exchange Rate: 1 USD = 84 INR
-- High Growth Filter: Previous ≤$5K, Current ≥$50K
+- Exchange Rate: 1 USD = {settings['inr_to_usd']:g} INR
+- High Growth Filter: Previous ≤{usd_label(settings['high_growth_max_previous_usd'])}, Current ≥{usd_label(settings['high_growth_min_current_usd'])}
 
-Report includes 4 sheets:
-1. Growth Comparison (all clients)
-2. High Growth 5K-50K (filtered)
-3. Summary (statistics)
-4. Exceptions (if any)
+Report includes {len(sheets) if sheets else 4} sheets:
+{sheet_lines}
 
 Best regards,
 Koenig Solutions Automated Report System
         """
 
-        msg.attach(MIMEText(body, "plain"))
+        # Attachment is read (and zipped/trimmed) on the outbox thread
+        delivery_id = outbox.send(None, build=lambda: build_message(
+            sender_email, recipient_emails, subject, body,
+            workbook_attachment(report_file_path, attachment_format, sheets),
+        ))
+        status = outbox.wait(delivery_id, timeout=300)
+
+        if status is None:
+            return True, "Email queued - still sending in the background"
+        if status["status"] == "sent":
+            return True, (
+                f"Email sent to {len(recipient_emails)} recipient(s) "
+                f"in {status['latency_seconds']:.1f}s"
+            )
+        return False, status["error"]
+
+    except Exception as e:
+        return False, str(e)
 
-        # Attach Excel file
-        with open(report_file_path, "rb") as attachment:
-            part = MIMEBase("application", "octet-stream")
-            part.set_payload(attachment.read())
 
-        encoders.encode_base64(part)
-        part.add_header(
-            "Content-Disposition",
-            f"attachment; filename= {Path(report_file_path).name}",
-        )
-        msg.attach(part)
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_file_sha256(path, mtime_ns, size):
+    """SHA-256 of a file; mtime/size in the key make any rewrite invalidate it"""
+    from rcb_loader import file_sha256
+
+    return file_sha256(path)
+
+
+def file_fingerprint(source):
+    """SHA-256 of a workbook path (memoized by stat) or in-memory upload (hashed directly)"""
+    if not isinstance(source, (str, Path)):
+        from rcb_loader import source_sha256
+
+        return source_sha256(source)
+    stat = Path(source).stat()
+    return cached_file_sha256(str(source), stat.st_mtime_ns, stat.st_size)
+
+
+def default_report_settings():
+    from report_config import (
+        HIGH_GROWTH_MAX_PREVIOUS_USD,
+        HIGH_GROWTH_MIN_CURRENT_USD,
+        INR_TO_USD,
+    )
+
+    return {
+        "inr_to_usd": float(INR_TO_USD),
+        "high_growth_max_previous_usd": HIGH_GROWTH_MAX_PREVIOUS_USD,
+        "high_growth_min_current_usd": HIGH_GROWTH_MIN_CURRENT_USD,
+    }
+
+
+def report_settings():
+    """
+    Settings that change the report output (sidebar ⚙️ Report Settings, else the
+    process_report defaults); part of every report cache key. Call on the script
+    thread - background jobs get the resolved dict.
+    """
+    return {
+        name: st.session_state.get(f"setting_{name}", default)
+        for name, default in default_report_settings().items()
+    }
 
-        # Send email
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient_emails, text)
-        server.quit()
 
-        return True, f"Email sent to {len(recipient_emails)} recipient(s)"
+@st.cache_data(show_spinner=False, ttl=REPORT_CACHE_TTL_SECONDS, max_entries=2 * REPORT_CACHE_MAX_ENTRIES)
+def cached_rcb_frame(sha256, _source):
+    """Parsed RCB export keyed by content hash (the underscore path/upload is not hashed)"""
+    from rcb_loader import ParsedFrameCache, load_rcb_workbook
+
+    return load_rcb_workbook(_source, ParsedFrameCache(), sha256=sha256)
+
+
+@st.cache_data(show_spinner=False, ttl=REPORT_CACHE_TTL_SECONDS, max_entries=REPORT_CACHE_MAX_ENTRIES)
+def cached_growth_report(sha_24m, sha_12m, settings, profile, _source_24m, _source_12m, _progress=None):
+    """
+    Build the report once per (input hashes, settings); raises so failures are never cached
+
+    Returns the GrowthResult so the report explorer can page through its frames.
+    """
+    from process_report import process_growth_report
+    from report_profiling import StageTimer
+
+    timer = StageTimer(profile=profile, trace_memory=profile, listener=_progress)
+
+    with timer.stage("excel_read"):
+        df_24m, load_24m = cached_rcb_frame(sha_24m, _source_24m)
+        df_12m, load_12m = cached_rcb_frame(sha_12m, _source_12m)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path("generated_reports")
+    output_dir.mkdir(exist_ok=True)
+    output_file = output_dir / f"Client_Growth_Report_{timestamp}.xlsx"
+
+    # Only clients whose rows changed since the last run are recomputed
+    report = process_growth_report(
+        df_24m, df_12m, str(output_file), snapshot_path=GROWTH_SNAPSHOT_PATH, timer=timer,
+        return_result=True, **settings,
+    )
+    if not output_file.exists():
+        raise RuntimeError("Report file not created")
+
+    report.stats["data_load"] = [load_24m, load_12m]
+    report.stats["computed_at"] = time.time()
+    return output_file, report
+
+
+def clear_report_caches():
+    """Drop memoized hashes, frames and reports (the on-disk parsed-frame cache is content-keyed and kept)"""
+    cached_file_sha256.clear()
+    cached_rcb_frame.clear()
+    cached_growth_report.clear()
+
+
+def generate_report_with_email(file_24m_path, file_12m_path, source="manual", profile=False, progress=None,
+                               settings=None):
+    """
+    Generate report (served from the result cache when inputs and settings are unchanged)
+
+    Inputs are workbook paths or in-memory uploads (see rcb_loader.workbook_buffer);
+    settings defaults to the process_report defaults (see report_settings).
+
+    Returns:
+        tuple: (success, report file, stats dict, GrowthResult or None)
+    """
+    try:
+        requested_at = time.time()
+        settings = settings or default_report_settings()
+        key = (file_fingerprint(file_24m_path), file_fingerprint(file_12m_path), settings, profile)
+        output_file, report = cached_growth_report(*key, file_24m_path, file_12m_path, progress)
+
+        if not output_file.exists():
+            # Report file was cleaned up since it was cached - build it again
+            cached_growth_report.clear()
+            output_file, report = cached_growth_report(*key, file_24m_path, file_12m_path, progress)
+
+        result = report.stats
+        result["served_from_cache"] = result["computed_at"] < requested_at
+        if not result["served_from_cache"]:
+            record_report_history(report, key, source, output_file, progress)
+        return True, output_file, result, report
 
     except Exception as e:
-        return False, str(e)
+        return False, None, {"error": str(e)}, None
+
+
+@st.cache_resource
+def get_metrics_store():
+    """Report history database (METRICS_DB_PATH, default data/report_metrics.sqlite)"""
+    from metrics_store import MetricsStore
+
+    return MetricsStore()
 
 
-def generate_report_with_email(file_24m_path, file_12m_path, source="manual"):
-    """Generate report and optionally send email"""
+def record_report_history(report, key, source, output_file, progress=None):
+    """Append a newly computed report to the metrics store; history problems never fail the report"""
+    from metrics_store import run_input_key
+
+    sha_24m, sha_12m, settings, _ = key
+    input_key = run_input_key(sha_24m, sha_12m, settings)
+    if progress:
+        progress("history", None)
+    started = time.perf_counter()
     try:
-        from process_report import process_growth_report
+        get_metrics_store().record_run(report, input_key, source=source, report_file=output_file)
+    except Exception as e:
+        print(f"[WARN] Could not record report history: {e}")
+    if progress:
+        progress("history", time.perf_counter() - started)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def cached_history_overview(last_recorded_run_id, runs=24, top=25):
+    """Run totals plus the latest High Growth clients with sparklines (keyed by last recorded run)"""
+    store = get_metrics_store()
+    history = store.runs(runs)
+    top_clients = store.top_clients(top)
+    sparklines = store.sparklines(top_clients["corporate_id"], runs=12)
+    top_clients.insert(2, "Current 12M trend", top_clients["corporate_id"].map(sparklines))
+    return history, top_clients
+
+
+@st.fragment
+def render_report_history():
+    """Trends across recorded runs and one client's history, answered from the metrics store"""
+    store = get_metrics_store()
+    # Not latest_run_id: a backfill adds older runs without changing the latest one
+    last_recorded_run_id = store.last_recorded_run_id()
+    if last_recorded_run_id is None:
+        st.info("ℹ️ No report history yet - every generated report is recorded here.")
+        return
+
+    history, top_clients = cached_history_overview(last_recorded_run_id)
+    trend = history.set_index("run_at")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("High Growth clients per run")
+        st.line_chart(trend["high_growth_clients"], height=200)
+    with col2:
+        st.caption("Total growth (USD) per run")
+        st.line_chart(trend["total_growth_usd"], height=200)
+
+    st.caption(f"Latest High Growth clients - current 12M revenue over the last {min(len(history), 12)} runs")
+    st.dataframe(
+        top_clients,
+        hide_index=True,
+        use_container_width=True,
+        column_config={"Current 12M trend": st.column_config.LineChartColumn("Current 12M trend")},
+    )
+
+    search = st.text_input("Client history", placeholder="Company name or Corporate ID", key="history_search")
+    if search.strip():
+        matches = store.find_clients(search)
+        if matches.empty:
+            st.caption("No client in the latest run matches.")
+            return
+        corporate_id = st.selectbox(
+            "Client",
+            matches["corporate_id"],
+            format_func=lambda cid: f"{matches.set_index('corporate_id').at[cid, 'company_name']} ({cid})",
+            key="history_client",
+        )
+        client = store.client_history(corporate_id)
+        st.line_chart(client.set_index("run_at")[["previous_usd", "current_usd"]], height=220)
+        st.dataframe(
+            client[["run_at", "previous_usd", "current_usd", "growth_usd", "growth_pct", "high_growth"]],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def email_options():
+    """send_email_report options: sidebar attachment choices plus the SMTP outbox"""
+    sheets = st.session_state.get("email_sheets")
+    all_sheets = st.session_state.get("email_all_sheets", [])
+    return {
+        "attachment_format": st.session_state.get("email_format", "xlsx"),
+        # All sheets selected -> send the workbook as written
+        "sheets": None if not sheets or set(sheets) == set(all_sheets) else list(sheets),
+        "mailer": smtp_outbox(),
+    }
+
 
-        df_24m = pd.read_excel(file_24m_path)
-        df_12m = pd.read_excel(file_12m_path)
+def report_recipients():
+    recipient_emails = st.secrets.get("REPORT_RECIPIENTS", "").split(",")
+    return [email.strip() for email in recipient_emails if email.strip()]
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = Path("generated_reports")
-        output_dir.mkdir(exist_ok=True)
-        output_file = output_dir / f"Client_Growth_Report_{timestamp}.xlsx"
 
-        result = process_growth_report(df_24m, df_12m, str(output_file))
+def run_report_job(file_24m_path, file_12m_path, source, profile, settings, recipients, email_options, progress):
+    """Background job body: build (or reuse) the report, then email it"""
+    success, report_file, result, report = generate_report_with_email(
+        file_24m_path, file_12m_path, source, profile=profile, progress=progress, settings=settings
+    )
+    if not success:
+        raise RuntimeError(result.get("error", "Unknown error"))
+
+    email = None
+    if recipients:
+        progress("email", None)
+        started = time.perf_counter()
+        email = send_email_report(report_file, recipients, settings=settings, **email_options)
+        progress("email", time.perf_counter() - started)
+
+    return {"report_file": report_file, "result": result, "email": email, "report": report}
+
+
+@st.cache_resource
+def get_report_job_runner():
+    """One job runner per server process, shared by all sessions and reruns"""
+    from report_jobs import ReportJobRunner
+
+    return ReportJobRunner(max_workers=REPORT_JOB_WORKERS, keep=REPORT_JOBS_KEPT)
+
+
+def start_report_job(file_24m_path, file_12m_path, source, profile=False):
+    """Queue report generation + email and remember the job across reruns and refreshes"""
+    # Import the report modules here: worker threads run outside the script
+    # context and must not depend on the script's import path
+    import growth_snapshot  # noqa: F401
+    import process_report  # noqa: F401
+    import rcb_loader  # noqa: F401
+
+    recipients = report_recipients()
+    job_id = get_report_job_runner().submit(
+        run_report_job,
+        file_24m_path,
+        file_12m_path,
+        source,
+        profile,
+        report_settings(),
+        recipients,
+        email_options(),
+        label=f"{source.capitalize()} report",
+        expected_stages=5 + bool(recipients),
+    )
+    st.session_state.report_job_id = job_id
+    st.query_params["job"] = job_id
+    return job_id
+
+
+@st.fragment(run_every=1)
+def render_job_progress(job_id):
+    """Live stage progress; refreshes itself every second without rerunning the page"""
+    job = get_report_job_runner().get(job_id)
+    if job is None or not job.active:
+        st.rerun()  # full rerun renders the finished result
+
+    if job.current_stage:
+        activity = f"running {job.current_stage}"
+    elif job.status == "queued":
+        activity = "waiting for a free worker"
+    else:
+        activity = "working"
+    st.progress(job.progress, text=f"⏳ {job.label}: {activity} ({job.elapsed_seconds:.0f}s)")
+    if job.stages:
+        st.caption(" | ".join(f"✓ {stage} {seconds:.2f}s" for stage, seconds in job.stages.items()))
+
+
+def render_report_job(job_id):
+    """Progress while the job runs; result, email status and download once it is done"""
+    job = get_report_job_runner().get(job_id)
+    if job is None:
+        st.info("ℹ️ The previous report job is no longer available. Generate the report again.")
+        st.session_state.pop("report_job_id", None)
+        st.query_params.pop("job", None)
+        return
+
+    if job.active:
+        render_job_progress(job_id)
+        return
+
+    if not job.finished_ok:
+        st.error(f"❌ Report generation failed: {job.error}")
+        return
+
+    report_file, result, email = job.result["report_file"], job.result["result"], job.result["email"]
+    st.success(
+        f"✅ Report generated: {result.get('total_clients', 0)} clients analyzed "
+        f"({job.elapsed_seconds:.1f}s)"
+    )
 
-        if output_file.exists():
-            return True, output_file, result
+    if email is not None:
+        email_success, email_message = email
+        if email_success:
+            st.success(f"📧 {email_message}")
         else:
-            return False, None, {"error": "Report file not created"}
+            st.warning(f"⚠️ Email failed: {email_message}")
+
+    if report_file.exists():
+        with open(report_file, "rb") as f:
+            st.download_button(
+                label="📥 Download Excel Report",
+                data=f,
+                file_name=report_file.name,
+                mime=XLSX_MIME,
+                key=f"download_{job_id}",
+            )
+    else:
+        st.warning("⚠️ Report file was removed from the server. Generate the report again.")
+
+    if job.result.get("report") is not None:
+        render_report_explorer(job_id, job.result["report"])
+        render_high_growth_whatif(job_id, job.result["report"])
+
+    render_performance_panel(result, email_seconds=job.stages.get("email"))
 
-    except Exception as e:
-        return False, None, {"error": str(e)}
+
+@st.cache_resource(max_entries=3 * REPORT_CACHE_MAX_ENTRIES)
+def get_sheet_explorer(job_id, sheet_name, _frame):
+    """Sort orders and search index for one sheet of one job, built on first view"""
+    from report_explorer import SheetExplorer
+
+    return SheetExplorer(_frame)
+
+
+@st.fragment
+def render_report_explorer(job_id, report):
+    """
+    Browse a report's sheets in the page; sorting, filtering and paging run on the
+    server and only the visible page is sent to the browser. Runs as a fragment so
+    paging does not rerun the rest of the page.
+    """
+    from report_config import SHEET_HIGH_GROWTH
+    from report_explorer import EXPLORER_SHEETS, PAGE_SIZES
+
+    with st.expander("🔎 Explore Report", expanded=False):
+        sheet_name = st.radio(
+            "Sheet", EXPLORER_SHEETS, horizontal=True, key=f"explore_sheet_{job_id}",
+            # The High Growth sheet is named after the report's cut-offs
+            format_func=lambda name: report.high_growth_sheet if name == SHEET_HIGH_GROWTH else name,
+        )
+        (sheet,) = report.sheets([sheet_name]).values()
+        explorer = get_sheet_explorer(job_id, sheet_name, sheet)
+        prefix = f"explore_{job_id}_{sheet_name}"
+
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        search = col1.text_input("Search", placeholder="Company, user or Corporate ID", key=f"{prefix}_search")
+        sort_by = col2.selectbox(
+            "Sort by", [None] + explorer.columns, key=f"{prefix}_sort",
+            format_func=lambda column: "Report order" if column is None else column,
+        )
+        ascending = col3.toggle("Ascending", key=f"{prefix}_ascending", disabled=sort_by is None)
+        page_size = col4.selectbox("Rows", PAGE_SIZES, index=1, key=f"{prefix}_page_size")
+
+        ranges = {}
+        numeric_columns = explorer.numeric_columns
+        if numeric_columns:
+            col1, col2, col3 = st.columns([2, 1, 1])
+            range_column = col1.selectbox("Filter column", numeric_columns, key=f"{prefix}_range_column")
+            low = col2.number_input("Min", value=None, key=f"{prefix}_range_min")
+            high = col3.number_input("Max", value=None, key=f"{prefix}_range_max")
+            if low is not None or high is not None:
+                ranges[range_column] = (low, high)
+
+        # Any change to the query starts again from page 1
+        signature = (search, sort_by, ascending, page_size, tuple(ranges.items()))
+        if st.session_state.get(f"{prefix}_signature") != signature:
+            st.session_state[f"{prefix}_signature"] = signature
+            st.session_state[f"{prefix}_page"] = 1
+
+        started = time.perf_counter()
+        page = explorer.query(
+            search, ranges, sort_by, ascending, st.session_state[f"{prefix}_page"], page_size
+        )
+        query_ms = (time.perf_counter() - started) * 1000
+
+        column_config = {"URL": st.column_config.LinkColumn("URL")} if "URL" in page.rows.columns else None
+        st.dataframe(page.rows, hide_index=True, use_container_width=True, column_config=column_config)
+
+        def turn_page(number):
+            st.session_state[f"{prefix}_page"] = number
+
+        col1, col2, col3 = st.columns([1, 1, 4])
+        col1.button("◀ Previous", key=f"{prefix}_prev", disabled=page.page <= 1,
+                    on_click=turn_page, args=(page.page - 1,))
+        col2.button("Next ▶", key=f"{prefix}_next", disabled=page.page >= page.pages,
+                    on_click=turn_page, args=(page.page + 1,))
+        filtered = f" (filtered from {page.total_rows:,})" if page.matching_rows != page.total_rows else ""
+        col3.caption(
+            f"Rows {page.first_row:,}–{page.last_row:,} of {page.matching_rows:,}{filtered} · "
+            f"page {page.page} of {page.pages} · {query_ms:.1f} ms"
+        )
+
+
+def render_settings_controls(prefix="setting"):
+    """FX rate and High Growth cut-off sliders; st.session_state[f"{prefix}_<name>"] holds the values"""
+    defaults = default_report_settings()
+    for name, default in defaults.items():
+        # Same type as the default so the sliders accept it (INR rate is a float)
+        st.session_state[f"{prefix}_{name}"] = type(default)(st.session_state.get(f"{prefix}_{name}", default))
+    st.slider("INR per USD", 60.0, 110.0, step=0.5, key=f"{prefix}_inr_to_usd")
+    st.slider(
+        "High Growth: previous 12M at most (USD)", 0, 50_000, step=500,
+        key=f"{prefix}_high_growth_max_previous_usd",
+    )
+    st.slider(
+        "High Growth: current 12M at least (USD)", 0, 500_000, step=5_000,
+        key=f"{prefix}_high_growth_min_current_usd",
+    )
+
+
+@st.cache_resource(max_entries=REPORT_CACHE_MAX_ENTRIES)
+def get_high_growth_index(job_id, _clients):
+    """Sorted INR revenue index for one job's report, built on first use"""
+    from high_growth_index import HighGrowthIndex
+
+    return HighGrowthIndex(_clients)
+
+
+@st.fragment
+def render_high_growth_whatif(job_id, report):
+    """
+    Re-filter High Growth at other cut-offs / INR rates from the finished report's
+    sorted index (milliseconds, no regeneration); runs as a fragment so slider
+    moves only rerun this section.
+    """
+    if report.clients is None:
+        return
+
+    prefix = f"whatif_{job_id}"
+    with st.expander("🎯 High Growth What-If", expanded=False):
+        report_values = report.stats.get("settings", default_report_settings())
+        for name, value in report_values.items():
+            st.session_state.setdefault(f"{prefix}_{name}", value)
+        render_settings_controls(prefix)
+        values = {name: st.session_state[f"{prefix}_{name}"] for name in report_values}
+
+        index = get_high_growth_index(job_id, report.clients)
+        started = time.perf_counter()
+        high_growth = index.high_growth(
+            values["high_growth_max_previous_usd"],
+            values["high_growth_min_current_usd"],
+            values["inr_to_usd"],
+        )
+        query_ms = (time.perf_counter() - started) * 1000
+
+        st.metric(
+            "High Growth clients",
+            f"{len(high_growth):,}",
+            delta=len(high_growth) - len(report.high_growth),
+            help="Change against the generated report",
+        )
+        st.dataframe(
+            high_growth.head(100),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"URL": st.column_config.LinkColumn("URL")},
+        )
+        shown = f"top 100 of {len(high_growth):,}" if len(high_growth) > 100 else f"{len(high_growth):,} clients"
+        st.caption(f"Showing {shown} by Growth % · {query_ms:.1f} ms from {len(index):,} indexed clients")
+
+        def apply_to_report_settings():
+            for name, value in values.items():
+                st.session_state[f"setting_{name}"] = value
+            st.toast("⚙️ Report Settings updated - they apply to the next generated report")
+
+        st.button(
+            "Use these settings for the next report",
+            key=f"{prefix}_apply",
+            on_click=apply_to_report_settings,
+            help="Copies the values into ⚙️ Report Settings; generate the report again to get the workbook",
+        )
+
+
+def render_performance_panel(result, email_seconds=None):
+    """Collapsible per-stage timing breakdown for the last report run"""
+    performance = result.get("performance")
+    if not performance:
+        return
+
+    with st.expander("⚡ Performance", expanded=False):
+        if result.get("served_from_cache"):
+            computed = datetime.fromtimestamp(result["computed_at"]).strftime("%H:%M:%S")
+            st.caption(f"♻️ Served from cache - timings below are from the run at {computed}")
+
+        total = performance["total_seconds"] or 1
+        peaks = performance.get("peak_memory_mb", {})
+        rows = []
+        for stage, seconds in performance["stages"].items():
+            row = {"Stage": stage, "Seconds": round(seconds, 3), "Share": f"{seconds / total:.0%}"}
+            if peaks:
+                row["Peak memory (MB)"] = peaks.get(stage)
+            rows.append(row)
+        import pandas as pd
+
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        st.caption(f"Total: {performance['total_seconds']:.2f}s")
+        if email_seconds is not None:
+            st.caption(f"📧 Email delivery: {email_seconds:.2f}s")
+
+        for info in result.get("data_load", []):
+            engine = f", engine {info['engine']}" if "engine" in info else ""
+            st.caption(
+                f"📄 {info['file']}: cache {info['cache']}{engine}, {info['load_seconds']:.2f}s"
+            )
+
+        incremental = result.get("incremental")
+        if incremental:
+            st.caption(
+                f"♻️ Metrics mode: {incremental['mode']} "
+                f"({incremental.get('recomputed', 0)} clients recomputed)"
+            )
+
+        if performance.get("profile"):
+            st.markdown("**cProfile (top functions by cumulative time)**")
+            st.code(performance["profile"], language="text")
 
 
 def send_reset_code_email(receiver_email, otp_code):
     """Send a password reset code using Outlook SMTP."""
-    sender_email = st.secrets.get("SMTP_EMAIL", "")
-    sender_password = st.secrets.get("SMTP_PASSWORD", "")
-    smtp_server = st.secrets.get("SMTP_SERVER", "smtp.office365.com")
-    smtp_port = int(st.secrets.get("SMTP_PORT", 587))
+    from email_outbox import build_message
 
-    if not sender_email or not sender_password:
+    sender_email, outbox = smtp_outbox()
+    if outbox is None:
         return False, "SMTP credentials not configured"
 
     subject = "Client Growth Report - Password Reset Code"
@@ -278,18 +840,14 @@ Regards,
 Koenig Solutions Automated Report System
 """
 
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = sender_email
-    msg["To"] = receiver_email
-
-    context = ssl.create_default_context()
     try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls(context=context)
-            server.login(sender_email, sender_password)
-            server.sendmail(sender_email, [receiver_email], msg.as_string())
-        return True, "Reset code sent successfully"
+        delivery_id = outbox.send(build_message(sender_email, [receiver_email], subject, body))
+        status = outbox.wait(delivery_id, timeout=60)
+        if status is None:
+            return True, "Reset code queued - it should arrive shortly"
+        if status["status"] == "sent":
+            return True, "Reset code sent successfully"
+        return False, status["error"]
     except Exception as e:
         return False, str(e)
 
@@ -298,9 +856,9 @@ Koenig Solutions Automated Report System
 if not st.session_state.authenticated:
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        logo_path = "assets/koenig_logo.png"
-        if os.path.exists(logo_path):
-            st.image(logo_path, width=300)
+        logo = logo_image()
+        if logo is not None:
+            st.image(logo, width=300)
 
         # 1️⃣ NORMAL LOGIN
         if st.session_state.reset_stage is None:
@@ -438,6 +996,10 @@ if not st.session_state.authenticated:
 
 # ----------------- MAIN APPLICATION -----------------
 
+# A browser refresh starts a new session; the job ID survives in the URL
+if "report_job_id" not in st.session_state and st.query_params.get("job"):
+    st.session_state.report_job_id = st.query_params["job"]
+
 # Header
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -450,17 +1012,15 @@ st.markdown("---")
 
 # Sidebar
 with st.sidebar:
-    logo_path = "assets/koenig_logo.png"
-    if os.path.exists(logo_path):
-        st.image(logo_path, width=200)
+    logo = logo_image()
+    if logo is not None:
+        st.image(logo, width=200)
 
     st.markdown("### Options")
 
-    # Check if auto-downloaded files exist
-    auto_files_exist = (
-        Path("data/RCB_24months.xlsx").exists()
-        and Path("data/RCB_12months.xlsx").exists()
-    )
+    # Stat the auto-downloaded exports once; the rest of this run reuses it
+    data_status = data_file_status()
+    auto_files_exist = data_status["available"]
 
     if auto_files_exist:
         options = ["🤖 Use Auto-Downloaded Data", "📥 Manual Upload"]
@@ -471,20 +1031,47 @@ with st.sidebar:
 
     option = st.radio("Select Mode:", options, index=default_option)
 
+    profile_run = st.checkbox(
+        "🔬 Capture profiling data",
+        help="Record cProfile output and peak memory per stage (slower run)",
+    )
+
+    with st.expander("📧 Email Options"):
+        from report_config import REPORT_SHEETS as report_sheets
+
+        st.session_state.email_all_sheets = report_sheets
+        st.radio(
+            "Attachment",
+            ["xlsx", "zip"],
+            format_func=lambda fmt: {"xlsx": "Excel workbook", "zip": "Zipped workbook"}[fmt],
+            key="email_format",
+            horizontal=True,
+        )
+        st.multiselect(
+            "Sheets to send",
+            report_sheets,
+            default=report_sheets,
+            key="email_sheets",
+            help="Send only these sheets (smaller attachment)",
+        )
+
+    with st.expander("⚙️ Report Settings"):
+        render_settings_controls()
+
+    if st.button(
+        "♻️ Force refresh",
+        help="Forget cached file hashes, parsed data and reports so the next report is rebuilt",
+        use_container_width=True,
+    ):
+        clear_report_caches()
+        st.toast("Report caches cleared")
+
     # Data freshness indicator
     if auto_files_exist:
         st.markdown("---")
         st.markdown("### 📊 Data Status")
 
-        last_update_24m = datetime.fromtimestamp(
-            Path("data/RCB_24months.xlsx").stat().st_mtime
-        )
-        last_update_12m = datetime.fromtimestamp(
-            Path("data/RCB_12months.xlsx").stat().st_mtime
-        )
-        last_update = max(last_update_24m, last_update_12m)
-
-        hours_ago = (datetime.now() - last_update).total_seconds() / 3600
+        hours_ago = data_status["hours_ago"]
 
         if hours_ago < 24:
             st.success(f"✅ Fresh: {hours_ago:.1f}h ago")
@@ -504,15 +1091,19 @@ with st.sidebar:
 
     st.markdown("---")
     st.markdown("### About")
+    from report_config import high_growth_sheet_name
+
+    about_settings = report_settings()
     st.info(
-        """
+        f"""
 **High Growth Filter:**
-- Previous ≤ $5,000
-- Current ≥ $50,000
+- Previous ≤ \\${about_settings['high_growth_max_previous_usd']:,}
+- Current ≥ \\${about_settings['high_growth_min_current_usd']:,}
+- 1 USD = {about_settings['inr_to_usd']:g} INR
 
 **Report Sheets:**
 1. Growth Comparison
-2. High Growth 5K-50K
+2. {high_growth_sheet_name(about_settings['high_growth_max_previous_usd'], about_settings['high_growth_min_current_usd'])}
 3. Summary
 4. Exceptions
 """
@@ -530,121 +1121,82 @@ if st.session_state.get("run_full_automation", False):
     progress_bar = st.progress(0)
     status_text = st.empty()
 
-    # Step 1: Trigger workflow
+    # Step 1: Trigger workflow and find the run it started
     status_text.info("📡 Step 1/5: Triggering GitHub Actions workflow...")
     progress_bar.progress(10)
-    time.sleep(1)
 
-    success, message = trigger_github_workflow()
+    run = None
+    try:
+        token = st.secrets.get("GITHUB_TOKEN", "")
+        if not token:
+            raise RuntimeError("GitHub token not configured")
+        client = get_actions_client(token)
+        correlation_id, dispatched_at = client.dispatch()
+        run = client.find_run(correlation_id, dispatched_at)
+        if run is None:
+            raise RuntimeError("the workflow run did not appear within 60s")
+    except Exception as e:
+        message = str(e)
 
-    if success:
+    if run is not None:
         status_text.success("✅ Step 1/5: Workflow triggered successfully!")
-        time.sleep(2)
+        st.markdown(f"[View workflow run #{run['id']} →]({run['html_url']})")
+
+        # Step 2: Wait for download, showing job/step status as it changes
+        from github_actions import step_progress
 
-        # Step 2: Wait for download
         status_text.info("⬇️ Step 2/5: Downloading data from RMS2... (2-3 minutes)")
         progress_bar.progress(30)
+        steps_box = st.empty()
+
+        for run, jobs, changed in client.poll_run(run["id"], timeout=WORKFLOW_TIMEOUT_SECONDS):
+            if changed:
+                done, total = step_progress(jobs)
+                progress_bar.progress(30 + (30 * done // total if total else 0))
+                steps_box.markdown(format_workflow_jobs(jobs))
 
-        max_wait = 180  # 3 minutes
-        waited = 0
-
-        while waited < max_wait:
-            workflow_status, conclusion = check_workflow_status()
-
-            if workflow_status == "completed":
-                if conclusion == "success":
-                    status_text.success("✅ Step 2/5: Data downloaded successfully!")
-                    break
-                else:
-                    status_text.error(
-                        "❌ Step 2/5: Download failed. Check GitHub Actions logs."
-                    )
-                    st.markdown(
-                        "[View GitHub Actions →](https://github.com/KoenigSalary/client_growth_report/actions)"
-                    )
-                    st.session_state.run_full_automation = False
-                    st.stop()
-
-            time.sleep(10)
-            waited += 10
-            progress_bar.progress(30 + int((waited / max_wait) * 30))
+        if run.get("status") == "completed":
+            if run.get("conclusion") == "success":
+                status_text.success("✅ Step 2/5: Data downloaded successfully!")
+            else:
+                status_text.error(
+                    "❌ Step 2/5: Download failed. Check GitHub Actions logs."
+                )
+                st.markdown(f"[View GitHub Actions →]({run['html_url']})")
+                st.session_state.run_full_automation = False
+                st.stop()
+        else:
+            status_text.warning(
+                f"⚠️ Step 2/5: Workflow still running after {WORKFLOW_TIMEOUT_SECONDS}s - "
+                "continuing with the current data"
+            )
 
         progress_bar.progress(60)
-        time.sleep(2)
 
         # Step 3: Validate data
         status_text.info("✅ Step 3/5: Validating downloaded data...")
         progress_bar.progress(70)
-        time.sleep(1)
 
-        if Path("data/RCB_24months.xlsx").exists() and Path("data/RCB_12months.xlsx").exists():
+        # Re-stat: the workflow may have just replaced the files
+        if data_file_status()["available"]:
             status_text.success("✅ Step 3/5: Data validation passed!")
         else:
             status_text.error("❌ Step 3/5: Data files not found")
             st.session_state.run_full_automation = False
             st.stop()
 
-        time.sleep(1)
-
-        # Step 4: Generate report
-        status_text.info("📊 Step 4/5: Generating growth report...")
-        progress_bar.progress(80)
-
-        success, report_file, result = generate_report_with_email(
-            Path("data/RCB_24months.xlsx"),
-            Path("data/RCB_12months.xlsx"),
+        # Steps 4-5: Generate report and send email in the background
+        start_report_job(
+            AUTO_DATA_FILES["24m"],
+            AUTO_DATA_FILES["12m"],
             "auto",
+            profile=profile_run,
+        )
+        progress_bar.progress(100)
+        status_text.success(
+            "✅ Steps 4-5/5: Report generation and email started in the background - "
+            "progress is shown below"
         )
-
-        if success:
-            status_text.success("✅ Step 4/5: Report generated successfully!")
-            progress_bar.progress(90)
-            time.sleep(1)
-
-            # Step 5: Send email
-            status_text.info("📧 Step 5/5: Sending email notification...")
-
-            recipient_emails = st.secrets.get("REPORT_RECIPIENTS", "").split(",")
-            recipient_emails = [email.strip() for email in recipient_emails if email.strip()]
-
-            if recipient_emails:
-                email_success, email_message = send_email_report(report_file, recipient_emails)
-
-                if email_success:
-                    status_text.success(f"✅ Step 5/5: {email_message}")
-                else:
-                    status_text.warning(f"⚠️ Step 5/5: Email failed - {email_message}")
-            else:
-                status_text.info("ℹ️ Step 5/5: No email recipients configured")
-
-            progress_bar.progress(100)
-            time.sleep(1)
-
-            st.balloons()
-            st.markdown(
-                f"""
-🎉 Automation Completed Successfully!
-
-- ✅ Data downloaded from RMS2  
-- ✅ Data validated  
-- ✅ Report generated (**{result.get('total_clients', 0)}** clients)  
-- ✅ Email sent to {len(recipient_emails)} recipient(s)
-""",
-                unsafe_allow_html=True,
-            )
-
-            with open(report_file, "rb") as f:
-                st.download_button(
-                    label="📥 Download Excel Report",
-                    data=f,
-                    file_name=report_file.name,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key="download_auto",
-                )
-        else:
-            status_text.error(
-                f"❌ Step 4/5: Report generation failed - {result.get('error', 'Unknown error')}"
-            )
     else:
         status_text.error(f"❌ Step 1/5: Failed to trigger workflow - {message}")
 
@@ -653,21 +1205,17 @@ if st.session_state.get("run_full_automation", False):
 elif option == "🤖 Use Auto-Downloaded Data":
     st.header("🤖 Use Auto-Downloaded Data")
 
-    file_24m_path = Path("data/RCB_24months.xlsx")
-    file_12m_path = Path("data/RCB_12months.xlsx")
-
-    if file_24m_path.exists() and file_12m_path.exists():
-        last_update_24m = datetime.fromtimestamp(file_24m_path.stat().st_mtime)
-        last_update_12m = datetime.fromtimestamp(file_12m_path.stat().st_mtime)
-        last_update = max(last_update_24m, last_update_12m)
+    file_24m_path = AUTO_DATA_FILES["24m"]
+    file_12m_path = AUTO_DATA_FILES["12m"]
 
+    if data_status["available"]:
         st.markdown(
             f"""
 ✅ Data files available  
-Last updated: {last_update.strftime('%Y-%m-%d %H:%M:%S')}
+Last updated: {data_status['last_update'].strftime('%Y-%m-%d %H:%M:%S')}
 
-- RCB_24months.xlsx ({file_24m_path.stat().st_size / 1024 / 1024:.1f} MB)  
-- RCB_12months.xlsx ({file_12m_path.stat().st_size / 1024 / 1024:.1f} MB)
+- RCB_24months.xlsx ({data_status['size_mb']['24m']:.1f} MB)  
+- RCB_12months.xlsx ({data_status['size_mb']['12m']:.1f} MB)
 """,
             unsafe_allow_html=True,
         )
@@ -675,41 +1223,7 @@ Last updated: {last_update.strftime('%Y-%m-%d %H:%M:%S')}
         st.markdown("---")
 
         if st.button("📊 Generate Report & Send Email", key="generate_auto"):
-            with st.spinner("Generating report..."):
-                success, report_file, result = generate_report_with_email(
-                    file_24m_path, file_12m_path, "auto"
-                )
-
-                if success:
-                    st.success(
-                        f"✅ Report generated: {result.get('total_clients', 0)} clients analyzed"
-                    )
-
-                    recipient_emails = st.secrets.get("REPORT_RECIPIENTS", "").split(",")
-                    recipient_emails = [
-                        email.strip() for email in recipient_emails if email.strip()
-                    ]
-
-                    if recipient_emails:
-                        email_success, email_message = send_email_report(
-                            report_file, recipient_emails
-                        )
-                        if email_success:
-                            st.success(f"📧 {email_message}")
-                        else:
-                            st.warning(f"⚠️ Email failed: {email_message}")
-
-                    with open(report_file, "rb") as f:
-                        st.download_button(
-                            label="📥 Download Excel Report",
-                            data=f,
-                            file_name=report_file.name,
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        )
-                else:
-                    st.error(
-                        f"❌ Report generation failed: {result.get('error', 'Unknown error')}"
-                    )
+            start_report_job(file_24m_path, file_12m_path, "auto", profile=profile_run)
     else:
         st.warning(
             "⚠️ Auto-downloaded data files not found. Please use Manual Upload mode or trigger auto-download from sidebar."
@@ -747,6 +1261,11 @@ Instructions:
         if file_12m:
             st.success(f"✅ {file_12m.name} ({file_12m.size / 1024 / 1024:.1f} MB)")
 
+    keep_upload_copies = st.checkbox(
+        "💾 Save a copy of the uploads in data/",
+        help="Uploads are processed in memory; tick to also keep them as data/temp_RCB_*.xlsx",
+    )
+
     st.markdown("---")
 
     if st.button(
@@ -754,52 +1273,33 @@ Instructions:
         key="generate_manual",
         disabled=not (file_24m and file_12m),
     ):
-        data_dir = Path("data")
-        data_dir.mkdir(exist_ok=True)
+        from rcb_loader import workbook_buffer
 
-        temp_24m = data_dir / "temp_RCB_24months.xlsx"
-        with open(temp_24m, "wb") as f:
-            f.write(file_24m.getbuffer())
+        # Parsed straight from the upload bytes: each buffer shares the uploaded
+        # data (no copy) and has its own position, so the job can read it safely
+        upload_24m = workbook_buffer(file_24m.getvalue(), file_24m.name)
+        upload_12m = workbook_buffer(file_12m.getvalue(), file_12m.name)
 
-        temp_12m = data_dir / "temp_RCB_12months.xlsx"
-        with open(temp_12m, "wb") as f:
-            f.write(file_12m.getbuffer())
+        if keep_upload_copies:
+            data_dir = Path("data")
+            data_dir.mkdir(exist_ok=True)
+            (data_dir / "temp_RCB_24months.xlsx").write_bytes(file_24m.getvalue())
+            (data_dir / "temp_RCB_12months.xlsx").write_bytes(file_12m.getvalue())
 
-        with st.spinner("Generating report..."):
-            success, report_file, result = generate_report_with_email(
-                temp_24m, temp_12m, "manual"
-            )
+        start_report_job(upload_24m, upload_12m, "manual", profile=profile_run)
 
-            if success:
-                st.success(
-                    f"✅ Report generated: {result.get('total_clients', 0)} clients analyzed"
-                )
+# Latest background report job (kept across reruns and browser refreshes)
+if st.session_state.get("report_job_id"):
+    st.markdown("---")
+    st.subheader("📄 Latest Report")
+    render_report_job(st.session_state.report_job_id)
 
-                recipient_emails = st.secrets.get("REPORT_RECIPIENTS", "").split(",")
-                recipient_emails = [
-                    email.strip() for email in recipient_emails if email.strip()
-                ]
-
-                if recipient_emails:
-                    email_success, email_message = send_email_report(
-                        report_file, recipient_emails
-                    )
-                    if email_success:
-                        st.success(f"📧 {email_message}")
-                    else:
-                        st.warning(f"⚠️ Email failed: {email_message}")
-
-                with open(report_file, "rb") as f:
-                    st.download_button(
-                        label="📥 Download Excel Report",
-                        data=f,
-                        file_name=report_file.name,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    )
-            else:
-                st.error(
-                    f"❌ Report generation failed: {result.get('error', 'Unknown error')}"
-                )
+# Trends across recorded report runs
+st.markdown("---")
+with st.expander("📈 Report History", expanded=False):
+    # Charts are built only on request so they do not slow down every rerun
+    if st.toggle("Show report history", key="show_report_history"):
+        render_report_history()
 
 # ----------------- FOOTER -----------------
 st.markdown("---")
@@ -0,0 +1,94 @@
+"""
+download_manifest: unchanged re-downloads and rejected downloads
+"""
+
+import pytest
+from openpyxl import Workbook
+
+from download_manifest import (
+    commit_download,
+    is_current,
+    load_manifest,
+    local_state_path,
+    save_manifest,
+)
+
+HEADER = ['CorporateID', 'CorporateName', 'UserName', 'TotalNR1', 'URL']
+
+
+def write_export(path, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def download(manifest, manifest_path, tmp_path, rows):
+    """One downloader run: stage the export, commit it, save the manifest"""
+    staged = write_export(tmp_path / '.RCB_12months.download.xlsx', rows)
+    entry, replaced = commit_download(manifest, staged, tmp_path / 'RCB_12months.xlsx', 12)
+    save_manifest(manifest, manifest_path)
+    return entry, replaced
+
+
+ROWS = [[101, 'Acme', 'alice', 42000.0, 'acme.example'], [102, 'Globex', 'bob', 1000.0, None]]
+
+
+def test_identical_redownloads_leave_manifest_byte_identical(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    _, replaced = download(load_manifest(manifest_path), manifest_path, tmp_path, ROWS)
+    assert replaced
+    committed = manifest_path.read_bytes()
+    export = (tmp_path / 'RCB_12months.xlsx').read_bytes()
+
+    for _ in range(2):
+        manifest = load_manifest(manifest_path)
+        _, replaced = download(manifest, manifest_path, tmp_path, ROWS)
+        assert not replaced
+        assert manifest_path.read_bytes() == committed
+        assert (tmp_path / 'RCB_12months.xlsx').read_bytes() == export
+        assert is_current(load_manifest(manifest_path), tmp_path / 'RCB_12months.xlsx', max_age_hours=1)
+
+    assert 'checked_at' not in manifest_path.read_text()
+    assert local_state_path(manifest_path).exists()
+
+
+def test_changed_download_updates_manifest(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    download(load_manifest(manifest_path), manifest_path, tmp_path, ROWS)
+    committed = manifest_path.read_bytes()
+
+    _, replaced = download(load_manifest(manifest_path), manifest_path, tmp_path, ROWS + [[103, 'Initech', 'eve', 5.0, None]])
+    assert replaced
+    assert manifest_path.read_bytes() != committed
+    assert load_manifest(manifest_path)['files']['RCB_12months.xlsx']['rows'] == 3
+
+
+@pytest.mark.parametrize('content', [b'<html><body>Session expired</body></html>', None])
+def test_invalid_download_keeps_existing_export(tmp_path, content):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest = load_manifest(manifest_path)
+    download(manifest, manifest_path, tmp_path, ROWS)
+    export = (tmp_path / 'RCB_12months.xlsx').read_bytes()
+
+    staged = tmp_path / '.RCB_12months.download.xlsx'
+    if content is None:
+        # Truncated download of a real workbook
+        content = write_export(tmp_path / 'full.xlsx', ROWS).read_bytes()[:500]
+    staged.write_bytes(content)
+    with pytest.raises(ValueError):
+        commit_download(manifest, staged, tmp_path / 'RCB_12months.xlsx', 12)
+    assert (tmp_path / 'RCB_12months.xlsx').read_bytes() == export
+
+
+def test_download_without_export_header_is_rejected(tmp_path):
+    staged = tmp_path / 'staged.xlsx'
+    workbook = Workbook()
+    workbook.active.append(['Error', 'No data for this period'])
+    workbook.save(staged)
+    with pytest.raises(ValueError, match='CorporateID'):
+        commit_download(load_manifest(tmp_path / 'manifest.json'), staged, tmp_path / 'RCB_12months.xlsx', 12)
+    assert not (tmp_path / 'RCB_12months.xlsx').exists()
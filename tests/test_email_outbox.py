@@ -0,0 +1,92 @@
+"""
+email_outbox: which failures are retried, and finished deliveries are not kept
+"""
+
+import smtplib
+import time
+from email.message import EmailMessage
+
+import pytest
+
+from email_outbox import DELIVERY_FAILED, DELIVERY_SENT, EmailOutbox, SmtpSettings, _is_transient
+
+
+@pytest.mark.parametrize('error, transient', [
+    (smtplib.SMTPServerDisconnected('gone'), True),
+    (ConnectionRefusedError(), True),
+    (TimeoutError(), True),
+    (smtplib.SMTPResponseException(421, b'try again later'), True),
+    (smtplib.SMTPDataError(451, b'local error'), True),
+    (smtplib.SMTPDataError(554, b'rejected'), False),
+    (smtplib.SMTPAuthenticationError(535, b'bad credentials'), False),
+    (smtplib.SMTPRecipientsRefused({'a@example.com': (550, b'no such user')}), False),
+    (smtplib.SMTPNotSupportedError('SMTPUTF8 not supported'), False),
+])
+def test_only_connection_errors_and_4xx_are_transient(error, transient):
+    assert _is_transient(error) is transient
+
+
+class FakeServer:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.sent = 0
+
+    def noop(self):
+        return 250, b'OK'
+
+    def send_message(self, message):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent += 1
+
+    def quit(self):
+        pass
+
+
+def outbox_with(server, **kwargs):
+    outbox = EmailOutbox(SmtpSettings('localhost', 25, '', ''), backoff_seconds=0, **kwargs)
+    outbox._connect = lambda: server
+    return outbox
+
+
+def message():
+    message = EmailMessage()
+    message['Subject'] = 'Client Growth Report'
+    message.set_content('body')
+    return message
+
+
+def test_permanent_failure_is_not_retried():
+    server = FakeServer([smtplib.SMTPNotSupportedError('SMTPUTF8 not supported')])
+    outbox = outbox_with(server)
+    try:
+        status = outbox.wait(outbox.send(message()), timeout=10)
+    finally:
+        outbox.close()
+    assert status['status'] == DELIVERY_FAILED
+    assert status['attempts'] == 1
+    assert outbox.stats['retries'] == 0
+
+
+def test_finished_deliveries_are_forgotten():
+    server = FakeServer([smtplib.SMTPServerDisconnected('dropped')])
+    outbox = outbox_with(server)
+    try:
+        delivery_ids = [outbox.send(message()) for _ in range(20)]
+        statuses = [outbox.wait(delivery_id, timeout=10) for delivery_id in delivery_ids]
+        assert outbox.wait(delivery_ids[0], timeout=10) is None
+
+        # Nobody waits for this one; once it is older than keep_seconds the
+        # next finished delivery expires it
+        unwaited = outbox.send(message())
+        while outbox.status(unwaited)['status'] != DELIVERY_SENT:
+            time.sleep(0.01)
+        time.sleep(0.01)
+        outbox.keep_seconds = 0
+        outbox.wait(outbox.send(message()), timeout=10)
+        assert outbox.status(unwaited) is None
+    finally:
+        outbox.close()
+    assert [status['status'] for status in statuses] == [DELIVERY_SENT] * 20
+    assert outbox.stats['retries'] == 1
+    assert outbox._deliveries == {}
@@ -0,0 +1,71 @@
+"""
+metrics_store: run order when older reports are backfilled after live runs
+"""
+
+import contextlib
+import io
+from datetime import datetime
+
+import pandas as pd
+
+from metrics_store import MetricsStore, backfill
+from process_report import compute_growth_report
+
+
+def growth_report(revenue_12m):
+    """GrowthResult for two clients; revenue_12m is their current 12M revenue in INR"""
+    df_24m = pd.DataFrame({
+        'CorporateID': [101, 102, 101, 102],
+        'CorporateName': ['Acme', 'Globex', 'Acme', 'Globex'],
+        'UserName': ['alice', 'bob', 'alice', 'bob'],
+        'TotalNR1': [200_000.0, 1_000_000.0, *revenue_12m],
+    })
+    df_12m = pd.DataFrame({
+        'CorporateID': [101, 102],
+        'CorporateName': ['Acme', 'Globex'],
+        'UserName': ['alice', 'bob'],
+        'TotalNR1': revenue_12m,
+        'URL': [None, None],
+    })
+    with contextlib.redirect_stdout(io.StringIO()):
+        return compute_growth_report(df_24m, df_12m)
+
+
+def test_backfill_after_live_run_keeps_time_order(tmp_path):
+    store = MetricsStore(tmp_path / 'metrics.sqlite')
+    live = growth_report([5_000_000.0, 2_000_000.0])
+    live_run = store.record_run(live, 'live', run_at=datetime(2026, 3, 1), source='cli')
+
+    # Two months-old reports, imported after the live run
+    report_dir = tmp_path / 'reports'
+    report_dir.mkdir()
+    growth_report([1_000_000.0, 1_500_000.0]).to_xlsx(report_dir / 'Client_Growth_Report_20260101_060000.xlsx')
+    growth_report([3_000_000.0, 1_800_000.0]).to_xlsx(report_dir / 'Client_Growth_Report_20260201_060000.xlsx')
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert backfill(store, report_dir) == 2
+
+    assert store.latest_run_id() == live_run
+    assert store.last_recorded_run_id() != live_run
+
+    runs = store.runs()
+    assert runs['run_at'].is_monotonic_increasing
+    assert runs['run_id'].iloc[-1] == live_run
+
+    history = store.client_history(101)
+    assert history['run_at'].is_monotonic_increasing
+    assert history['run_id'].iloc[-1] == live_run
+
+    # 84 INR per USD, rounded to whole dollars
+    assert store.sparklines([101])['101'] == [11905, 35714, 59524]
+    assert store.top_clients(high_growth_only=False)['current_usd'].max() == 59524
+    assert store.find_clients('Acme')['current_usd'].tolist() == [59524]
+
+
+def test_runs_at_the_same_time_fall_back_to_insert_order(tmp_path):
+    store = MetricsStore(tmp_path / 'metrics.sqlite')
+    run_at = datetime(2026, 3, 1)
+    first = store.record_run(growth_report([1_000_000.0, 1_500_000.0]), 'a', run_at=run_at)
+    second = store.record_run(growth_report([3_000_000.0, 1_800_000.0]), 'b', run_at=run_at)
+
+    assert store.latest_run_id() == second
+    assert store.runs()['run_id'].tolist() == [first, second]